@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import timedelta
+from typing import TYPE_CHECKING
 
 from aiohttp.client_exceptions import ClientError
 from homeassistant.config_entries import ConfigEntry
@@ -15,7 +16,7 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_VERIFY_SSL,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import aiohttp_client, device_registry
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
@@ -28,16 +29,45 @@ from sagemcom_api.exceptions import (
     MaximumSessionCountException,
     UnauthorizedException,
 )
-from sagemcom_api.models import DeviceInfo as GatewayDeviceInfo
 
+from .capabilities import async_get_capability_store, capabilities_key
 from .const import (
+    CONF_ADAPTIVE_SCAN_INTERVAL,
     CONF_ENCRYPTION_METHOD,
+    CONF_FULL_SCAN_INTERVAL,
+    CONF_HOST_ALLOWLIST,
+    CONF_HOST_MAX_AGE,
+    CONF_KEEP_SESSION,
+    CONF_MAX_HOSTS,
+    CONF_MESH_EXTENDER,
+    CONF_PRESENCE_WATCH,
+    CONF_TRACK_WIRED_CLIENTS,
+    CONF_TRACK_WIRELESS_CLIENTS,
+    DATA_ENCRYPTION_METHODS,
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
+    DEFAULT_FULL_SCAN_INTERVAL,
+    DEFAULT_HOST_ALLOWLIST,
+    DEFAULT_HOST_MAX_AGE,
+    DEFAULT_KEEP_SESSION,
+    DEFAULT_MAX_HOSTS,
+    DEFAULT_MESH_EXTENDER,
+    DEFAULT_PRESENCE_WATCH,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TRACK_WIRED_CLIENTS,
+    DEFAULT_TRACK_WIRELESS_CLIENTS,
     DOMAIN,
     LOGGER,
     PLATFORMS,
 )
 from .coordinator import SagemcomDataUpdateCoordinator
+from .history import HistoryStore
+from .host_table import HostFilter
+from .scheduler import async_get_scheduler
+
+if TYPE_CHECKING:
+    from sagemcom_api.models import DeviceInfo as GatewayDeviceInfo
+
+    from .presence_watch import PresenceWatcher
 
 
 @dataclass
@@ -46,10 +76,18 @@ class HomeAssistantSagemcomFastData:
 
     coordinator: SagemcomDataUpdateCoordinator
     gateway: GatewayDeviceInfo
+    watcher: PresenceWatcher
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Sagemcom F@st from a config entry."""
+    # Only needed once an entry is set up, importing the integration stays cheap
+    # pylint: disable=import-outside-toplevel
+    from .host_index import async_get_host_index
+    from .presence_watch import PresenceWatcher
+    from .services import async_setup_services
+    from .snapshot import HostSnapshot
+
     host = entry.data[CONF_HOST]
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
@@ -67,33 +105,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         ssl=ssl,
     )
 
-    try:
-        await client.login()
-    except AccessRestrictionException as exception:
-        LOGGER.error("Access restricted")
-        raise ConfigEntryAuthFailed("Access restricted") from exception
-    except (AuthenticationException, UnauthorizedException) as exception:
-        LOGGER.error("Invalid_auth")
-        raise ConfigEntryAuthFailed("Invalid credentials") from exception
-    except (TimeoutError, ClientError, ConnectionError) as exception:
-        LOGGER.error("Failed to connect")
-        raise ConfigEntryNotReady("Failed to connect") from exception
-    except MaximumSessionCountException as exception:
-        LOGGER.error("Maximum session count reached")
-        raise ConfigEntryNotReady("Maximum session count reached") from exception
-    except LoginRetryErrorException as exception:
-        LOGGER.error("Too many login attempts. Retry later.")
-        raise ConfigEntryNotReady(
-            "Too many login attempts. Retry later."
-        ) from exception
-    except Exception as exception:  # pylint: disable=broad-except
-        LOGGER.exception(exception)
-        return False
+    # Lets the config flow skip detecting the method, e.g. when re-adding the entry
+    hass.data.setdefault(DATA_ENCRYPTION_METHODS, {})[host] = EncryptionMethod(
+        encryption_method
+    )
 
-    try:
-        gateway = await client.get_device_info()
-    finally:
-        await client.logout()
+    snapshot = HostSnapshot(hass, entry.entry_id)
+    gateway, hosts = await snapshot.async_load()
+    warm_start = gateway is not None
+
+    if gateway is None:
+        try:
+            await client.login()
+        except AccessRestrictionException as exception:
+            LOGGER.error("Access restricted")
+            raise ConfigEntryAuthFailed("Access restricted") from exception
+        except (AuthenticationException, UnauthorizedException) as exception:
+            LOGGER.error("Invalid_auth")
+            raise ConfigEntryAuthFailed("Invalid credentials") from exception
+        except (TimeoutError, ClientError, ConnectionError) as exception:
+            LOGGER.error("Failed to connect")
+            raise ConfigEntryNotReady("Failed to connect") from exception
+        except MaximumSessionCountException as exception:
+            LOGGER.error("Maximum session count reached")
+            raise ConfigEntryNotReady("Maximum session count reached") from exception
+        except LoginRetryErrorException as exception:
+            LOGGER.error("Too many login attempts. Retry later.")
+            raise ConfigEntryNotReady(
+                "Too many login attempts. Retry later."
+            ) from exception
+        except Exception as exception:  # pylint: disable=broad-except
+            LOGGER.exception(exception)
+            return False
+
+        try:
+            gateway = await client.get_device_info()
+        finally:
+            await client.logout()
 
     update_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
@@ -103,13 +151,112 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         name="sagemcom_hosts",
         client=client,
         update_interval=timedelta(seconds=update_interval),
+        keep_session=entry.options.get(CONF_KEEP_SESSION, DEFAULT_KEEP_SESSION),
+        host_max_age=_host_max_age(entry),
+        max_hosts=entry.options.get(CONF_MAX_HOSTS, DEFAULT_MAX_HOSTS) or None,
+        full_scan_interval=timedelta(
+            seconds=entry.options.get(
+                CONF_FULL_SCAN_INTERVAL, DEFAULT_FULL_SCAN_INTERVAL
+            )
+        ),
+        scheduler=async_get_scheduler(hass),
+        adaptive_scan_interval=entry.options.get(
+            CONF_ADAPTIVE_SCAN_INTERVAL, DEFAULT_ADAPTIVE_SCAN_INTERVAL
+        ),
+        host_filter=_host_filter(entry),
     )
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = HomeAssistantSagemcomFastData(
-        coordinator=coordinator, gateway=gateway
+    if hosts:
+        coordinator.restore_hosts(hosts)
+
+    entry.async_on_unload(
+        coordinator.async_join_mesh(
+            async_get_host_index(hass),
+            entry.entry_id,
+            entry.options.get(CONF_MESH_EXTENDER, DEFAULT_MESH_EXTENDER),
+        )
     )
 
-    # Create gateway device in Home Assistant
+    history_store = HistoryStore(hass, entry.entry_id)
+    coordinator.history.restore(await history_store.async_load())
+
+    data = HomeAssistantSagemcomFastData(
+        coordinator=coordinator, gateway=gateway, watcher=PresenceWatcher(coordinator)
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = data
+
+    _async_register_gateway(hass, entry, gateway)
+
+    if warm_start:
+        # Entities are created from the snapshot, the gateway is read later
+        entry.async_create_background_task(
+            hass, _async_warm_start(hass, entry, data), f"{DOMAIN}_warm_start_{host}"
+        )
+    else:
+        await coordinator.async_load_capabilities(
+            async_get_capability_store(hass), gateway
+        )
+        await coordinator.async_config_entry_first_refresh()
+        # Probed apart from the first refresh, so a slow gateway sets up in time
+        entry.async_create_background_task(
+            hass, coordinator.async_probe_capabilities(), f"{DOMAIN}_probe_{host}"
+        )
+
+    @callback
+    def _async_save_snapshot() -> None:
+        """Persist the gateway, hosts and history after an update that changed them."""
+        if coordinator.last_update_success and (
+            coordinator.changes is None or coordinator.changes
+        ):
+            snapshot.async_schedule_save(data.gateway, coordinator.hosts)
+            history_store.async_schedule_save(coordinator.history)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_save_snapshot))
+    if not warm_start:
+        # The first refresh ran before the listener was added
+        _async_save_snapshot()
+
+    data.watcher.set_enabled(_presence_watch(entry))
+    entry.async_create_background_task(
+        hass, data.watcher.async_run(), f"{DOMAIN}_presence_watch_{host}"
+    )
+
+    async_setup_services(hass)
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(update_listener))
+
+    return True
+
+
+async def _async_warm_start(
+    hass: HomeAssistant, entry: ConfigEntry, data: HomeAssistantSagemcomFastData
+) -> None:
+    """Refresh the hosts and gateway info of an entry set up from its snapshot."""
+    store = async_get_capability_store(hass)
+    await data.coordinator.async_load_capabilities(store, data.gateway)
+    await data.coordinator.async_refresh()
+
+    try:
+        gateway = await data.coordinator.async_get_device_info()
+    except Exception as exception:  # pylint: disable=broad-except
+        LOGGER.debug("Failed to refresh gateway info: %s", exception)
+    else:
+        # The firmware may have been updated since the snapshot
+        if capabilities_key(gateway) != capabilities_key(data.gateway):
+            await data.coordinator.async_load_capabilities(store, gateway)
+
+        data.gateway = gateway
+        _async_register_gateway(hass, entry, data.gateway)
+
+    await data.coordinator.async_probe_capabilities()
+
+
+@callback
+def _async_register_gateway(
+    hass: HomeAssistant, entry: ConfigEntry, gateway: GatewayDeviceInfo
+) -> None:
+    """Create or update the gateway device in Home Assistant."""
     dev_registry = device_registry.async_get(hass)
 
     dev_registry.async_get_or_create(
@@ -120,31 +267,83 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         name=f"{gateway.manufacturer} {gateway.model_number}",
         model=gateway.model_name,
         sw_version=gateway.software_version,
-        configuration_url=f"{'https' if ssl else 'http'}://{host}",
+        configuration_url=f"{'https' if entry.data[CONF_SSL] else 'http'}://{entry.data[CONF_HOST]}",
     )
 
-    await coordinator.async_config_entry_first_refresh()
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(update_listener))
-
-    return True
-
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data: HomeAssistantSagemcomFastData = hass.data[DOMAIN].pop(entry.entry_id)
+        await data.coordinator.broker.async_close_session()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the snapshot and history of a removed config entry."""
+    from .snapshot import HostSnapshot  # pylint: disable=import-outside-toplevel
+
+    await HostSnapshot(hass, entry.entry_id).async_remove()
+    await HistoryStore(hass, entry.entry_id).async_remove()
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update when entry options update."""
+    data: HomeAssistantSagemcomFastData = hass.data[DOMAIN][entry.entry_id]
+
+    # Hosts move between the gateways of the mesh, start over with the new role
+    if (
+        entry.options.get(CONF_MESH_EXTENDER, DEFAULT_MESH_EXTENDER)
+        != data.coordinator.mesh_extender
+    ):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+
+    keep_session = entry.options.get(CONF_KEEP_SESSION, DEFAULT_KEEP_SESSION)
+    data.coordinator.broker.keep_session = keep_session
+    data.watcher.set_enabled(_presence_watch(entry))
+    if not keep_session:
+        await data.coordinator.broker.async_close_session()
+    data.coordinator.full_scan_interval = timedelta(
+        seconds=entry.options.get(CONF_FULL_SCAN_INTERVAL, DEFAULT_FULL_SCAN_INTERVAL)
+    )
+    if (host_filter := _host_filter(entry)) != data.coordinator.host_filter:
+        data.coordinator.set_host_filter(host_filter)
+    data.coordinator.hosts.max_age = _host_max_age(entry)
+    data.coordinator.hosts.max_size = (
+        entry.options.get(CONF_MAX_HOSTS, DEFAULT_MAX_HOSTS) or None
+    )
+
     if entry.options[CONF_SCAN_INTERVAL]:
-        data: HomeAssistantSagemcomFastData = hass.data[DOMAIN][entry.entry_id]
-        data.coordinator.update_interval = timedelta(
-            seconds=entry.options[CONF_SCAN_INTERVAL]
+        data.coordinator.set_scan_interval(
+            timedelta(seconds=entry.options[CONF_SCAN_INTERVAL]),
+            entry.options.get(
+                CONF_ADAPTIVE_SCAN_INTERVAL, DEFAULT_ADAPTIVE_SCAN_INTERVAL
+            ),
         )
 
         await data.coordinator.async_refresh()
+
+
+def _host_max_age(entry: ConfigEntry) -> float | None:
+    """Return the configured host eviction age in seconds."""
+    if hours := entry.options.get(CONF_HOST_MAX_AGE, DEFAULT_HOST_MAX_AGE):
+        return timedelta(hours=hours).total_seconds()
+    return None
+
+
+def _presence_watch(entry: ConfigEntry) -> bool:
+    """Return True if host changes should be watched, only within a kept session."""
+    return entry.options.get(
+        CONF_KEEP_SESSION, DEFAULT_KEEP_SESSION
+    ) and entry.options.get(CONF_PRESENCE_WATCH, DEFAULT_PRESENCE_WATCH)
+
+
+def _host_filter(entry: ConfigEntry) -> HostFilter:
+    """Return the filter for the hosts to track."""
+    return HostFilter.from_allowlist(
+        entry.options.get(CONF_TRACK_WIRELESS_CLIENTS, DEFAULT_TRACK_WIRELESS_CLIENTS),
+        entry.options.get(CONF_TRACK_WIRED_CLIENTS, DEFAULT_TRACK_WIRED_CLIENTS),
+        entry.options.get(CONF_HOST_ALLOWLIST, DEFAULT_HOST_ALLOWLIST),
+    )
@@ -0,0 +1,101 @@
+"""Adaptive scan interval for Sagemcom F@st gateways."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    ADAPTIVE_CHURN_HIGH,
+    ADAPTIVE_CHURN_LOW,
+    ADAPTIVE_ERROR_STREAK,
+    ADAPTIVE_RESPONSE_TIME_FACTOR,
+    ADAPTIVE_SMOOTHING,
+)
+
+
+class AdaptiveInterval:
+    """Derive the scan interval from response time, failed polls and host churn.
+
+    Response time and churn are smoothed with an exponential moving average.
+    The interval backs off when the gateway is slow or keeps failing, and
+    otherwise moves gradually toward half the configured interval while hosts
+    come and go, or twice the configured interval while the network is quiet.
+    """
+
+    def __init__(self, base: float, minimum: float, maximum: float) -> None:
+        """Initialize the adaptive interval around the configured interval."""
+        self.base = base
+        self.minimum = min(minimum, base)
+        self.maximum = max(maximum, base)
+        self.interval = base
+        self.reason = "configured interval"
+        self.response_time: float | None = None
+        self.errors = 0
+        self.churn = 0.0
+
+    def record(
+        self, response_time: float | None, changed: int | None, total: int
+    ) -> float:
+        """Record a poll, where changed is None for a failed poll.
+
+        Returns the interval in seconds to use until the next poll.
+        """
+        if response_time is not None:
+            self.response_time = (
+                response_time
+                if self.response_time is None
+                else _smooth(self.response_time, response_time)
+            )
+        if changed is None:
+            self.errors += 1
+        else:
+            self.errors = 0
+            self.churn = _smooth(self.churn, changed / total if total else 0.0)
+
+        # A single failed poll does not back off, only failures in a row do
+        if self.errors >= ADAPTIVE_ERROR_STREAK:
+            interval = self.base * 2 ** (self.errors - ADAPTIVE_ERROR_STREAK + 1)
+            self.reason = f"backing off, {self.errors} failed polls in a row"
+        elif self.errors:
+            interval = self.interval
+        else:
+            if self.churn > ADAPTIVE_CHURN_HIGH:
+                target = self.base / 2
+                self.reason = f"speeding up, host churn {self.churn:.1%}"
+            elif self.churn < ADAPTIVE_CHURN_LOW:
+                target = self.base * 2
+                self.reason = f"slowing down, host churn {self.churn:.1%}"
+            else:
+                target = self.base
+                self.reason = "configured interval"
+            interval = _smooth(self.interval, target)
+
+        interval = max(interval, self.minimum)
+
+        # Never poll more often than a few times the time a poll takes
+        floor = (self.response_time or 0) * ADAPTIVE_RESPONSE_TIME_FACTOR
+        if interval < floor:
+            interval = floor
+            self.reason = f"backing off, gateway responds in {self.response_time:.1f}s"
+
+        self.interval = min(interval, self.maximum)
+
+        return self.interval
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current state for diagnostics."""
+        return {
+            "interval": self.interval,
+            "reason": self.reason,
+            "base": self.base,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "response_time": self.response_time,
+            "errors": self.errors,
+            "churn": self.churn,
+        }
+
+
+def _smooth(average: float, value: float) -> float:
+    """Return the exponential moving average including value."""
+    return average + ADAPTIVE_SMOOTHING * (value - average)
@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from homeassistant.components.button import ButtonDeviceClass, ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from sagemcom_api.client import SagemcomClient
-from sagemcom_api.models import DeviceInfo as GatewayDeviceInfo
 
-from . import HomeAssistantSagemcomFastData
 from .const import DOMAIN, LOGGER
 
+if TYPE_CHECKING:
+    from sagemcom_api.models import DeviceInfo as GatewayDeviceInfo
+
+    from . import HomeAssistantSagemcomFastData
+    from .session import SessionBroker
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -23,7 +28,7 @@ async def async_setup_entry(
     """Set up the Sagemcom F@st button from a config entry."""
     data: HomeAssistantSagemcomFastData = hass.data[DOMAIN][entry.entry_id]
     entities: list[ButtonEntity] = []
-    entities.append(SagemcomFastRebootButton(data.gateway, data.coordinator.client))
+    entities.append(SagemcomFastRebootButton(data.gateway, data.coordinator.broker))
 
     async_add_entities(entities)
 
@@ -36,17 +41,16 @@ class SagemcomFastRebootButton(ButtonEntity):
     _attr_device_class = ButtonDeviceClass.RESTART
     _attr_entity_category = EntityCategory.CONFIG
 
-    def __init__(self, gateway: GatewayDeviceInfo, client: SagemcomClient) -> None:
+    def __init__(self, gateway: GatewayDeviceInfo, broker: SessionBroker) -> None:
         """Initialize the button."""
         self.gateway = gateway
-        self.client = client
+        self.broker = broker
         self._attr_unique_id = f"{self.gateway.serial_number}_reboot"
 
     async def async_press(self) -> None:
         """Handle the button press."""
         try:
-            await self.client.login()
-            await self.client.reboot()
+            await self.broker.async_write(self.broker.client.reboot, ends_session=True)
         except Exception as exception:  # pylint: disable=broad-except
             LOGGER.exception(exception)
 
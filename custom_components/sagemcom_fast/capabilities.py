@@ -0,0 +1,133 @@
+"""Capabilities of a Sagemcom F@st gateway model and firmware."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from sagemcom_api.exceptions import UnknownPathException
+
+from .const import (
+    DATA_CAPABILITIES,
+    DOMAIN,
+    GATEWAY_STATS_XPATHS,
+    PRESENCE_XPATHS,
+    STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from sagemcom_api.client import SagemcomClient
+    from sagemcom_api.models import DeviceInfo as GatewayDeviceInfo
+
+
+@dataclass
+class GatewayCapabilities:
+    """XPaths a gateway answers, with their response time in milliseconds."""
+
+    # None for XPaths the gateway does not know
+    xpaths: dict[str, float | None] = field(default_factory=dict)
+    stats_batch: bool = True
+
+    def supports(self, xpath: str) -> bool:
+        """Return True if the XPath is supported, or was never probed."""
+        return self.xpaths.get(xpath, 0.0) is not None
+
+    def supports_all(self, xpaths: Iterable[str]) -> bool:
+        """Return True if all XPaths are supported."""
+        return all(self.supports(xpath) for xpath in xpaths)
+
+
+def capabilities_key(gateway: GatewayDeviceInfo) -> str:
+    """Return the key gateways with the same capabilities share."""
+    return f"{gateway.model_name}/{gateway.software_version}"
+
+
+async def async_probe_capabilities(
+    client: SagemcomClient, capabilities: GatewayCapabilities
+) -> GatewayCapabilities:
+    """Find out which XPaths the gateway supports, within an existing session.
+
+    Results are added to the capabilities as they come in, so they are kept
+    when the probe is interrupted. Only an unknown path marks an XPath
+    unsupported, other errors abort the probe so that a flaky gateway does
+    not disable anything for good.
+    """
+    xpaths = {*PRESENCE_XPATHS.values(), *GATEWAY_STATS_XPATHS.values()}
+
+    for xpath in sorted(xpaths):
+        started = time.monotonic()
+        try:
+            await client.get_value_by_xpath(xpath)
+        except UnknownPathException:
+            capabilities.xpaths[xpath] = None
+        else:
+            capabilities.xpaths[xpath] = round((time.monotonic() - started) * 1000, 1)
+
+    # Presence needs both lists, of the same length
+    if capabilities.supports_all(PRESENCE_XPATHS.values()):
+        presence = await client.get_values_by_xpaths(PRESENCE_XPATHS)
+        addresses, active = presence.get("phys_address"), presence.get("active")
+        if not (
+            isinstance(addresses, list)
+            and isinstance(active, list)
+            and len(addresses) == len(active)
+        ):
+            for xpath in PRESENCE_XPATHS.values():
+                capabilities.xpaths[xpath] = None
+
+    stats_xpaths = {
+        key: xpath
+        for key, xpath in GATEWAY_STATS_XPATHS.items()
+        if capabilities.supports(xpath)
+    }
+    if len(stats_xpaths) > 1:
+        try:
+            await client.get_values_by_xpaths(stats_xpaths)
+        except UnknownPathException:
+            capabilities.stats_batch = False
+
+    return capabilities
+
+
+class CapabilityStore:
+    """Capabilities of all probed gateway models, shared by the config entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.capabilities"
+        )
+        self._models: dict[str, dict[str, Any]] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_get(self, key: str) -> GatewayCapabilities | None:
+        """Return the stored capabilities of a gateway model."""
+        async with self._lock:
+            if self._models is None:
+                self._models = (await self._store.async_load() or {}).get("models", {})
+
+        if (data := self._models.get(key)) is None:
+            return None
+        return GatewayCapabilities(**data)
+
+    @callback
+    def async_set(self, key: str, capabilities: GatewayCapabilities) -> None:
+        """Store the capabilities of a gateway model."""
+        if self._models is None:
+            self._models = {}
+        self._models[key] = asdict(capabilities)
+        self._store.async_delay_save(lambda: {"models": self._models}, 1)
+
+
+@callback
+def async_get_capability_store(hass: HomeAssistant) -> CapabilityStore:
+    """Return the capability store shared by all config entries."""
+    if (store := hass.data.get(DATA_CAPABILITIES)) is None:
+        store = hass.data[DATA_CAPABILITIES] = CapabilityStore(hass)
+
+    return store
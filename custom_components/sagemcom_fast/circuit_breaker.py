@@ -0,0 +1,81 @@
+"""Circuit breaker for the requests to a Sagemcom F@st gateway."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+import random
+from typing import Any
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop calling a failing gateway, with exponential backoff and jitter.
+
+    The circuit opens after a number of consecutive failures, or at once
+    for failures that only get worse when retried such as a login lockout.
+    Once the backoff delay has passed, a single trial call is let through:
+    it closes the circuit when it succeeds and doubles the delay otherwise.
+    """
+
+    def __init__(
+        self, failure_threshold: int, base_delay: float, max_delay: float
+    ) -> None:
+        """Initialize a closed circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at: float | None = None
+
+    def allow(self, now: float) -> bool:
+        """Return True if a call may be made at the given monotonic time."""
+        if self.state is CircuitState.OPEN:
+            if self.retry_at is not None and now < self.retry_at:
+                return False
+            self.state = CircuitState.HALF_OPEN
+
+        return True
+
+    def retry_in(self, now: float) -> float:
+        """Return the seconds until the next trial call."""
+        return max(0.0, self.retry_at - now) if self.retry_at is not None else 0.0
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+
+    def record_failure(self, now: float, trip: bool = False) -> None:
+        """Register a failed call, opening the circuit when needed."""
+        self.failures += 1
+        if not (
+            trip
+            or self.state is CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            return
+
+        delay = min(self.max_delay, self.base_delay * 2**self.trips)
+        self.state = CircuitState.OPEN
+        self.trips += 1
+        self.retry_at = now + random.uniform(delay / 2, delay)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the state of the circuit breaker."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": self.retry_in(now),
+        }
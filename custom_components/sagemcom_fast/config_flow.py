@@ -1,6 +1,13 @@
 """Config flow for Sagemcom integration."""
 
-from aiohttp import ClientError
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+from aiohttp import ClientError, ClientSession
 from homeassistant import config_entries
 from homeassistant.const import (
     CONF_HOST,
@@ -10,8 +17,10 @@ from homeassistant.const import (
     CONF_VERIFY_SSL,
 )
 from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from sagemcom_api.client import SagemcomClient
+from sagemcom_api.enums import EncryptionMethod
 from sagemcom_api.exceptions import (
     AccessRestrictionException,
     AuthenticationException,
@@ -22,9 +31,61 @@ from sagemcom_api.exceptions import (
 )
 import voluptuous as vol
 
-from .const import CONF_ENCRYPTION_METHOD, DOMAIN, LOGGER
+from .const import (
+    CONF_ENCRYPTION_METHOD,
+    DATA_ENCRYPTION_METHODS,
+    DOMAIN,
+    LOGGER,
+    VALIDATION_TIMEOUT,
+)
 from .options_flow import OptionsFlow
 
+if TYPE_CHECKING:
+    from homeassistant.components.ssdp import SsdpServiceInfo
+
+# Key of the friendly name in the UPnP description of a discovered gateway
+ATTR_UPNP_FRIENDLY_NAME = "friendlyName"
+
+# Errors a login with the wrong encryption method fails with. A lockout is
+# not one of them, trying further methods would only extend it.
+WRONG_METHOD_ERRORS = (AuthenticationException, LoginTimeoutException)
+
+
+async def async_detect_encryption_method(
+    session: ClientSession,
+    host: str,
+    username: str,
+    password: str,
+    ssl: bool,
+    hint: EncryptionMethod | None = None,
+) -> EncryptionMethod:
+    """Login with one encryption method after the other and return the one that works.
+
+    The hinted method, e.g. the one last detected for this host, is tried first.
+    """
+    methods = sorted(EncryptionMethod, key=lambda method: method != hint)
+
+    for method in methods:
+        client = SagemcomClient(
+            host=host,
+            username=username,
+            password=password,
+            authentication_method=method,
+            session=session,
+            ssl=ssl,
+        )
+        try:
+            await client.login()
+        except WRONG_METHOD_ERRORS as exception:
+            LOGGER.debug("Login with %s failed: %s", method, exception)
+            continue
+
+        await client.logout()
+        return method
+
+    # Every method was refused, so the credentials are wrong
+    raise AuthenticationException("Invalid credentials")
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Sagemcom."""
@@ -34,36 +95,67 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     _host: str | None = None
     _username: str | None = None
+    _reauth_entry: config_entries.ConfigEntry | None = None
 
-    async def async_validate_input(self, user_input):
-        """Validate user credentials."""
-        self._username = user_input.get(CONF_USERNAME) or ""
+    async def async_validate_input(self, user_input: dict[str, Any]) -> None:
+        """Validate user credentials and set the encryption method."""
+        host = user_input[CONF_HOST]
+        username = user_input.get(CONF_USERNAME) or ""
         password = user_input.get(CONF_PASSWORD) or ""
-        self._host = user_input[CONF_HOST]
         ssl = user_input[CONF_SSL]
 
         session = async_get_clientsession(self.hass, user_input[CONF_VERIFY_SSL])
-
-        client = SagemcomClient(
-            host=self._host,
-            username=self._username,
-            password=password,
-            session=session,
-            ssl=ssl,
+        # Detected methods are remembered per host, e.g. for a retry or reauth
+        methods: dict[str, EncryptionMethod] = self.hass.data.setdefault(
+            DATA_ENCRYPTION_METHODS, {}
         )
+        method = user_input.get(CONF_ENCRYPTION_METHOD)
 
-        user_input[CONF_ENCRYPTION_METHOD] = await client.get_encryption_method()
-        LOGGER.debug(
-            "Detected encryption method: %s", user_input[CONF_ENCRYPTION_METHOD]
-        )
+        async with asyncio.timeout(VALIDATION_TIMEOUT):
+            if method is None:
+                method = await async_detect_encryption_method(
+                    session, host, username, password, ssl, methods.get(host)
+                )
+                LOGGER.debug("Detected encryption method: %s", method)
+            else:
+                client = SagemcomClient(
+                    host=host,
+                    username=username,
+                    password=password,
+                    authentication_method=EncryptionMethod(method),
+                    session=session,
+                    ssl=ssl,
+                )
+                await client.login()
+                await client.logout()
 
-        await client.login()
-        await client.logout()
+        methods[host] = user_input[CONF_ENCRYPTION_METHOD] = method
 
-        return self.async_create_entry(
-            title=self._host,
-            data=user_input,
-        )
+    async def _async_validate(self, user_input: dict[str, Any]) -> dict[str, str]:
+        """Validate the input and return the errors to show."""
+        errors: dict[str, str] = {}
+
+        try:
+            await self.async_validate_input(user_input)
+        except AccessRestrictionException:
+            errors["base"] = "access_restricted"
+        except AuthenticationException:
+            errors["base"] = "invalid_auth"
+        except (TimeoutError, ClientError, ConnectionError):
+            errors["base"] = "cannot_connect"
+        except LoginTimeoutException:
+            errors["base"] = "login_timeout"
+        except MaximumSessionCountException:
+            errors["base"] = "maximum_session_count"
+        except LoginRetryErrorException:
+            errors["base"] = "login_retry_error"
+        except UnsupportedHostException:
+            errors["base"] = "unsupported_host"
+        except Exception as exception:  # pylint: disable=broad-except
+            errors["base"] = "unknown"
+            LOGGER.exception(exception)
+
+        return errors
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
@@ -74,25 +166,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(user_input.get(CONF_HOST))
             self._abort_if_unique_id_configured()
 
-            try:
-                return await self.async_validate_input(user_input)
-            except AccessRestrictionException:
-                errors["base"] = "access_restricted"
-            except AuthenticationException:
-                errors["base"] = "invalid_auth"
-            except (TimeoutError, ClientError, ConnectionError):
-                errors["base"] = "cannot_connect"
-            except LoginTimeoutException:
-                errors["base"] = "login_timeout"
-            except MaximumSessionCountException:
-                errors["base"] = "maximum_session_count"
-            except LoginRetryErrorException:
-                errors["base"] = "login_retry_error"
-            except UnsupportedHostException:
-                errors["base"] = "unsupported_host"
-            except Exception as exception:  # pylint: disable=broad-except
-                errors["base"] = "unknown"
-                LOGGER.exception(exception)
+            self._host = user_input[CONF_HOST]
+            self._username = user_input.get(CONF_USERNAME) or ""
+
+            if not (errors := await self._async_validate(user_input)):
+                return self.async_create_entry(
+                    title=self._host,
+                    data=user_input,
+                )
 
         return self.async_show_form(
             step_id="user",
@@ -111,6 +192,94 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_ssdp(self, discovery_info: SsdpServiceInfo) -> FlowResult:
+        """Handle a gateway discovered through SSDP."""
+        host = urlparse(discovery_info.ssdp_location).hostname
+        await self.async_set_unique_id(host)
+        self._abort_if_unique_id_configured()
+
+        self._host = host
+        self.context["title_placeholders"] = {
+            "name": discovery_info.upnp.get(ATTR_UPNP_FRIENDLY_NAME, host)
+        }
+
+        return await self.async_step_user()
+
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Handle rejected credentials."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None) -> FlowResult:
+        """Ask for new credentials, keeping the known encryption method."""
+        assert self._reauth_entry
+        errors = {}
+
+        if user_input is not None:
+            data = {**self._reauth_entry.data, **user_input}
+            if not (errors := await self._async_validate(data)):
+                return self.async_update_reload_and_abort(self._reauth_entry, data=data)
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_USERNAME, default=self._reauth_entry.data[CONF_USERNAME]
+                    ): str,
+                    vol.Optional(CONF_PASSWORD): str,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_reconfigure(self, user_input=None) -> FlowResult:
+        """Change the host or credentials of a configured gateway."""
+        entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        assert entry
+        errors = {}
+
+        if user_input is not None:
+            data = {**entry.data, **user_input}
+            if data[CONF_HOST] != entry.data[CONF_HOST]:
+                await self.async_set_unique_id(data[CONF_HOST])
+                self._abort_if_unique_id_configured()
+            # Detected again, starting with the method known to work
+            self.hass.data.setdefault(DATA_ENCRYPTION_METHODS, {}).setdefault(
+                data[CONF_HOST], EncryptionMethod(data.pop(CONF_ENCRYPTION_METHOD))
+            )
+            if not (errors := await self._async_validate(data)):
+                return self.async_update_reload_and_abort(
+                    entry,
+                    unique_id=data[CONF_HOST],
+                    # Unless renamed, the title is the host
+                    title=(
+                        data[CONF_HOST]
+                        if entry.title == entry.data[CONF_HOST]
+                        else entry.title
+                    ),
+                    data=data,
+                    reason="reconfigure_successful",
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST, default=entry.data[CONF_HOST]): str,
+                    vol.Optional(CONF_USERNAME, default=entry.data[CONF_USERNAME]): str,
+                    vol.Optional(CONF_PASSWORD): str,
+                    vol.Required(CONF_SSL, default=entry.data[CONF_SSL]): bool,
+                    vol.Required(
+                        CONF_VERIFY_SSL, default=entry.data[CONF_VERIFY_SSL]
+                    ): bool,
+                }
+            ),
+            errors=errors,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -10,17 +10,145 @@ from homeassistant.const import Platform
 LOGGER: logging.Logger = logging.getLogger(__package__)
 
 DOMAIN: Final = "sagemcom_fast"
+DATA_SCHEDULER: Final = f"{DOMAIN}_scheduler"
+DATA_CAPABILITIES: Final = f"{DOMAIN}_capabilities"
+DATA_ENCRYPTION_METHODS: Final = f"{DOMAIN}_encryption_methods"
+DATA_HOST_INDEX: Final = f"{DOMAIN}_host_index"
 
 CONF_ENCRYPTION_METHOD: Final = "encryption_method"
 CONF_TRACK_WIRELESS_CLIENTS: Final = "track_wireless_clients"
 CONF_TRACK_WIRED_CLIENTS: Final = "track_wired_clients"
+CONF_HOST_ALLOWLIST: Final = "host_allowlist"
+CONF_KEEP_SESSION: Final = "keep_session"
+CONF_HOST_MAX_AGE: Final = "host_max_age"
+CONF_MAX_HOSTS: Final = "max_hosts"
+CONF_FULL_SCAN_INTERVAL: Final = "full_scan_interval"
+CONF_ADAPTIVE_SCAN_INTERVAL: Final = "adaptive_scan_interval"
+CONF_PRESENCE_WATCH: Final = "presence_watch"
+CONF_MESH_EXTENDER: Final = "mesh_extender"
+CONF_COMPRESS_DIAGNOSTICS: Final = "compress_diagnostics"
 
 DEFAULT_TRACK_WIRELESS_CLIENTS: Final = True
 DEFAULT_TRACK_WIRED_CLIENTS: Final = True
+DEFAULT_HOST_ALLOWLIST: Final = ""
+DEFAULT_KEEP_SESSION: Final = False
+DEFAULT_HOST_MAX_AGE: Final = 0
+DEFAULT_MAX_HOSTS: Final = 0
+DEFAULT_ADAPTIVE_SCAN_INTERVAL: Final = False
+DEFAULT_PRESENCE_WATCH: Final = False
+DEFAULT_MESH_EXTENDER: Final = False
+DEFAULT_COMPRESS_DIAGNOSTICS: Final = False
+
+# Budget for validating credentials in the config flow (seconds)
+VALIDATION_TIMEOUT: Final = 45
 
 ATTR_MANUFACTURER: Final = "Sagemcom"
+ATTR_MAC_ADDRESS: Final = "mac_address"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+
+SERVICE_GET_CONNECTION_HISTORY: Final = "get_connection_history"
+SERVICE_REBOOT: Final = "reboot"
+SERVICE_REFRESH: Final = "refresh"
+
+# Services targeting many gateways run this many at once, each within a timeout
+SERVICE_MAX_CONCURRENCY: Final = 8
+DEFAULT_SERVICE_TIMEOUT: Final = 60
+
+# Fired when hosts join or leave, in one batched event when many hosts change
+EVENT_HOST_JOINED: Final = f"{DOMAIN}_host_joined"
+EVENT_HOST_LEFT: Final = f"{DOMAIN}_host_left"
+EVENT_HOSTS_CHANGED: Final = f"{DOMAIN}_hosts_changed"
+HOST_EVENTS_BATCH_THRESHOLD: Final = 10
 
 MIN_SCAN_INTERVAL: Final = 10
 DEFAULT_SCAN_INTERVAL: Final = 10
+DEFAULT_FULL_SCAN_INTERVAL: Final = 60
+
+# Bounds and thresholds of the adaptive scan interval
+ADAPTIVE_MIN_INTERVAL: Final = 5
+ADAPTIVE_MAX_FACTOR: Final = 6
+ADAPTIVE_RESPONSE_TIME_FACTOR: Final = 4
+ADAPTIVE_ERROR_STREAK: Final = 3
+ADAPTIVE_CHURN_HIGH: Final = 0.05
+ADAPTIVE_CHURN_LOW: Final = 0.005
+ADAPTIVE_SMOOTHING: Final = 0.3
+
+# New host entities are added in chunks, yielding to the event loop in between
+ENTITY_CHUNK_SIZE: Final = 25
+
+STORAGE_VERSION: Final = 1
+# Delay before the host snapshot is written to storage (seconds)
+SNAPSHOT_SAVE_DELAY: Final = 60
+# Connection events kept per host, and the delay before they are stored
+HISTORY_SIZE: Final = 32
+HISTORY_SAVE_DELAY: Final = 300
+
+# Renew a persistent session before the gateway expires it (seconds)
+SESSION_RENEW_INTERVAL: Final = 600
+
+# Stop polling a failing gateway, backing off between trials (seconds)
+BREAKER_FAILURE_THRESHOLD: Final = 3
+BREAKER_BASE_DELAY: Final = 30
+BREAKER_MAX_DELAY: Final = 900
+
+# Time allowed to probe the capabilities of a new gateway model (seconds)
+CAPABILITY_PROBE_TIMEOUT: Final = 60
+
+# Requests to all gateways share this many slots
+MAX_CONCURRENT_POLLS: Final = 4
+
+# Request metrics keep this many samples per phase, histogram buckets in ms
+METRICS_WINDOW: Final = 100
+METRICS_BUCKETS: Final = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Minimal values needed for presence, read between full host refreshes
+PRESENCE_XPATHS: Final = {
+    "phys_address": "Device/Hosts/Hosts/*/PhysAddress",
+    "active": "Device/Hosts/Hosts/*/Active",
+}
+
+# A single host by MAC address, read by mesh extenders instead of all hosts
+HOST_XPATH: Final = "Device/Hosts/Hosts/Host[PhysAddress='{}']"
+
+# Changes when hosts join, leave or rejoin, watched within a kept session
+PRESENCE_WATCH_XPATH: Final = PRESENCE_XPATHS["active"]
+PRESENCE_WATCH_INTERVAL: Final = 1.0
+
+# Gateway statistics, read in one batched request with every full refresh
+GATEWAY_STATS_XPATHS: Final = {
+    "uptime": "Device/DeviceInfo/UpTime",
+    "cpu_usage": "Device/DeviceInfo/ProcessStatus/CPUUsage",
+    "memory_total": "Device/DeviceInfo/MemoryStatus/Total",
+    "memory_free": "Device/DeviceInfo/MemoryStatus/Free",
+    "wan_bytes_received": "Device/IP/Interfaces/Interface[Alias='IP_DATA']/Stats/BytesReceived",
+    "wan_bytes_sent": "Device/IP/Interfaces/Interface[Alias='IP_DATA']/Stats/BytesSent",
+    "interfaces": "Device/Ethernet/Interfaces",
+}
+
+# Subtrees dumped one by one in the diagnostics before the other nodes of
+# Device, listed with a read of this depth, within these budgets
+DIAGNOSTICS_XPATHS: Final = [
+    "Device/DeviceInfo",
+    "Device/Hosts",
+    "Device/Ethernet",
+    "Device/WiFi",
+    "Device/IP",
+    "Device/PPP",
+    "Device/DSL",
+    "Device/Optical",
+    "Device/Routing",
+    "Device/DNS",
+    "Device/DHCPv4",
+    "Device/DHCPv6",
+    "Device/NAT",
+    "Device/Firewall",
+    "Device/Time",
+    "Device/Services",
+    "Device/ManagementServer",
+]
+DIAGNOSTICS_NODES_DEPTH: Final = 1
+DIAGNOSTICS_MAX_SIZE: Final = 4_000_000
+DIAGNOSTICS_COMPRESS_SIZE: Final = 256_000
+DIAGNOSTICS_TIME_BUDGET: Final = 60
 
-PLATFORMS: list[Platform] = [Platform.DEVICE_TRACKER, Platform.BUTTON]
+PLATFORMS: list[Platform] = [Platform.DEVICE_TRACKER, Platform.BUTTON, Platform.SENSOR]
@@ -4,23 +4,62 @@ from __future__ import annotations
 
 import asyncio
 from datetime import timedelta
+from functools import partial
 import logging
+import time
+from typing import TYPE_CHECKING
 
 from aiohttp.client_exceptions import ClientError
-import async_timeout
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from sagemcom_api.client import SagemcomClient
 from sagemcom_api.exceptions import (
     AccessRestrictionException,
     AuthenticationException,
     LoginRetryErrorException,
     MaximumSessionCountException,
     UnauthorizedException,
+    UnknownPathException,
 )
 from sagemcom_api.models import Device
 
+from .adaptive import AdaptiveInterval
+from .capabilities import (
+    CapabilityStore,
+    GatewayCapabilities,
+    async_probe_capabilities,
+    capabilities_key,
+)
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    ADAPTIVE_MAX_FACTOR,
+    ADAPTIVE_MIN_INTERVAL,
+    BREAKER_BASE_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_DELAY,
+    CAPABILITY_PROBE_TIMEOUT,
+    EVENT_HOST_JOINED,
+    EVENT_HOST_LEFT,
+    EVENT_HOSTS_CHANGED,
+    GATEWAY_STATS_XPATHS,
+    HISTORY_SIZE,
+    HOST_EVENTS_BATCH_THRESHOLD,
+    HOST_XPATH,
+    PRESENCE_XPATHS,
+)
+from .gateway_stats import GatewayStats
+from .history import ConnectionHistory
+from .host_table import HostChanges, HostFilter, HostTable
+from .instrumentation import RequestMetrics
+from .scheduler import PollScheduler
+from .session import SessionBroker
+
+if TYPE_CHECKING:
+    from sagemcom_api.client import SagemcomClient
+    from sagemcom_api.models import DeviceInfo as GatewayDeviceInfo
+
+    from .host_index import HostIndex
+
 
 class SagemcomDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Sagemcom data."""
@@ -33,6 +72,13 @@ class SagemcomDataUpdateCoordinator(DataUpdateCoordinator):
         name: str,
         client: SagemcomClient,
         update_interval: timedelta | None = None,
+        keep_session: bool = False,
+        host_max_age: float | None = None,
+        max_hosts: int | None = None,
+        full_scan_interval: timedelta | None = None,
+        scheduler: PollScheduler | None = None,
+        adaptive_scan_interval: bool = False,
+        host_filter: HostFilter | None = None,
     ):
         """Initialize update coordinator."""
         super().__init__(
@@ -42,41 +88,461 @@ class SagemcomDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=update_interval,
         )
         self.data = {}
-        self.hosts: dict[str, Device] = {}
+        self.hosts = HostTable(max_age=host_max_age, max_size=max_hosts)
         self.client = client
         self.logger = logger
+        self.full_scan_interval = full_scan_interval
+        self.scheduler = scheduler
+        self._last_full_scan: float | None = None
+        self._presence_supported: bool | None = None
+        self._host_xpath_supported: bool | None = None
+        self._addresses: dict[str, str] = {}
+        self.host_filter = host_filter or HostFilter()
+        # Active hosts left out by the filter, so presence scans can skip them
+        self._excluded: set[str] = set()
+        self._refresh_all = False
+        # Set while a watcher reports presence changes, polls are then only
+        # needed for the full scans
+        self.presence_watched = False
+        self._presence_refresh = False
+        self._gateway_stats_xpaths = dict(GATEWAY_STATS_XPATHS)
+        self._stats_batch = True
+        self.capabilities: GatewayCapabilities | None = None
+        self._pending_probe: tuple[CapabilityStore, str] | None = None
+        self.gateway_stats = GatewayStats()
+        self.history = ConnectionHistory(HISTORY_SIZE)
+        # None means every entity should refresh, e.g. after a failed update
+        self.changes: HostChanges | None = None
+        self.adaptive_interval: AdaptiveInterval | None = None
+        self.metrics = RequestMetrics()
+        self.broker = SessionBroker(
+            client, logger, self.metrics, keep_session, scheduler
+        )
+        self.breaker = CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_DELAY, BREAKER_MAX_DELAY
+        )
+        self.host_index: HostIndex | None = None
+        self.entry_id: str | None = None
+        self.mesh_extender = False
+        self._scan_interval: timedelta | None = None
+        # Delays the poll after the first one, so gateways do not poll together
+        self._offset = 0.0
+        if update_interval:
+            self.set_scan_interval(update_interval, adaptive_scan_interval)
+            if scheduler:
+                self._offset = scheduler.offset(
+                    client.host, update_interval.total_seconds()
+                )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the entity fan-out."""
+        with self.metrics.measure("fan_out"):
+            super().async_update_listeners()
+
+    @callback
+    def async_join_mesh(
+        self, host_index: HostIndex, entry_id: str, extender: bool
+    ) -> CALLBACK_TYPE:
+        """Share the hosts with the other gateways of the mesh, return how to leave."""
+        self.host_index = host_index
+        self.entry_id = entry_id
+        self.mesh_extender = extender
+        unregister = host_index.async_register(
+            entry_id,
+            not extender,
+            self.hosts,
+            self.async_release_hosts,
+            self.async_claim_hosts,
+        )
+        if extender:
+            self.hosts.discard([idx for idx in self.hosts if self._is_foreign(idx)])
+
+        return unregister
+
+    @callback
+    def async_release_hosts(self, idxs: set[str]) -> None:
+        """Stop tracking hosts that a primary gateway of the mesh takes over."""
+        self.changes = HostChanges(removed=self.hosts.discard(idxs))
+        self.async_update_listeners()
+
+    @callback
+    def async_claim_hosts(self, idxs: set[str]) -> None:
+        """Start tracking hosts that another gateway of the mesh handed over."""
+        self.changes = HostChanges(added={idx for idx in idxs if idx in self.hosts})
+        self.async_update_listeners()
+
+    def _is_foreign(self, idx: str) -> bool:
+        """Return True if this is an extender and another gateway tracks the host."""
+        return (
+            self.mesh_extender
+            and self.host_index is not None
+            and self.host_index.is_foreign(self.entry_id, idx)
+        )
+
+    def set_scan_interval(self, interval: timedelta, adaptive: bool) -> None:
+        """Set the configured scan interval, optionally adapting it while polling."""
+        self.update_interval = self._scan_interval = interval
+        self.adaptive_interval = (
+            AdaptiveInterval(
+                interval.total_seconds(),
+                ADAPTIVE_MIN_INTERVAL,
+                interval.total_seconds() * ADAPTIVE_MAX_FACTOR,
+            )
+            if adaptive
+            else None
+        )
 
-    async def _async_update_data(self) -> dict[str, Device]:
+    def restore_hosts(self, hosts: list[tuple[Device, float]]) -> None:
+        """Start from previously known hosts, until the first update."""
+        self.hosts.restore(
+            (host, last_seen) for host, last_seen in hosts if self.host_filter(host)
+        )
+        self.data = self.hosts
+
+    async def async_get_device_info(self) -> GatewayDeviceInfo:
+        """Retrieve the gateway info."""
+        return await self.broker.async_read(self.client.get_device_info)
+
+    @property
+    def probe_pending(self) -> bool:
+        """Return True while the gateway model is still to be probed."""
+        return self._pending_probe is not None
+
+    async def async_load_capabilities(
+        self, store: CapabilityStore, gateway: GatewayDeviceInfo
+    ) -> None:
+        """Plan the requests for this gateway model, probing it the first time.
+
+        A gateway model that was never probed is left for
+        async_probe_capabilities, until then every XPath is assumed supported.
+        """
+        key = capabilities_key(gateway)
+        if (capabilities := await store.async_get(key)) is None:
+            self._pending_probe = (store, key)
+            return
+
+        self._set_capabilities(capabilities)
+
+    def _set_capabilities(self, capabilities: GatewayCapabilities) -> None:
+        """Plan the requests for the capabilities of the gateway."""
+        self.capabilities = capabilities
+        self._presence_supported = capabilities.supports_all(PRESENCE_XPATHS.values())
+        self._gateway_stats_xpaths = {
+            key: xpath
+            for key, xpath in GATEWAY_STATS_XPATHS.items()
+            if capabilities.supports(xpath)
+        }
+        self._stats_batch = capabilities.stats_batch
+
+    async def async_probe_capabilities(self) -> None:
+        """Probe the gateway for the pending capabilities, apart from the polls.
+
+        The probe has a timeout of its own, so a slow gateway does not fail
+        the poll it would otherwise run in. Only a complete probe is stored,
+        the XPaths probed before a timeout or an error are used until the
+        next setup probes again.
+        """
+        if self._pending_probe is None:
+            return
+
+        store, key = self._pending_probe
+        capabilities = GatewayCapabilities()
+        try:
+            async with asyncio.timeout(CAPABILITY_PROBE_TIMEOUT):
+                await self.broker.async_read(
+                    partial(async_probe_capabilities, self.client, capabilities)
+                )
+        except Exception as exception:  # pylint: disable=broad-except
+            self.logger.debug(
+                "Failed to probe %s, %s XPaths probed: %s",
+                self.client.host,
+                len(capabilities.xpaths),
+                repr(exception),
+            )
+            if capabilities.xpaths:
+                self._set_capabilities(capabilities)
+        else:
+            store.async_set(key, capabilities)
+            self._set_capabilities(capabilities)
+        finally:
+            self._pending_probe = None
+
+    def set_host_filter(self, host_filter: HostFilter) -> None:
+        """Change which hosts are tracked and forget hosts that are excluded now."""
+        self.host_filter = host_filter
+        self.hosts.retain(host_filter)
+        self._excluded.clear()
+        self._last_full_scan = None
+        self._refresh_all = True
+
+    async def async_refresh_presence(self) -> None:
+        """Refresh right away, reading only presence unless a host is new."""
+        self._presence_refresh = True
+        try:
+            await self.async_refresh()
+        finally:
+            self._presence_refresh = False
+
+    async def _async_update_data(self) -> HostTable:
         """Update hosts data."""
+        previous_update_success = self.last_update_success
+        self.changes = None
+        response_time: float | None = None
+        changed: int | None = None
+        # Only an unreachable or locked out gateway counts toward the breaker,
+        # invalid credentials go straight to reauthentication
+        unreachable = lockout = False
+
+        now = time.monotonic()
+        if not self.breaker.allow(now):
+            retry_in = self.breaker.retry_in(now)
+            raise UpdateFailed(
+                f"Gateway unavailable, retrying in {retry_in:.0f} seconds"
+            )
+
         try:
-            async with async_timeout.timeout(25):
-                try:
-                    await self.client.login()
-                    await asyncio.sleep(1)
-                    hosts = await self.client.get_hosts(only_active=True)
-                finally:
-                    await self.client.logout()
-
-                """Mark all device as non-active."""
-                for idx, host in self.hosts.items():
-                    host.active = False
-                    self.hosts[idx] = host
-                for host in hosts:
-                    self.hosts[host.id] = host
-
-                return self.hosts
+            with self.metrics.measure("poll"):
+                async with asyncio.timeout(25):
+                    known = len(self.hosts)
+                    started = time.monotonic()
+                    changes = await self.broker.async_read(self._async_fetch)
+                    response_time = time.monotonic() - started
+                    # The first poll only discovers hosts, that is not churn
+                    changed = len(changes) if known else 0
+                    if previous_update_success and not self._refresh_all:
+                        self.changes = changes
+                    self._refresh_all = False
+                    self.history.update(self.hosts, self.changes, time.time())
+                    if known:
+                        self._async_fire_host_events(changes)
+                    if self.host_index:
+                        self.host_index.async_update(self.entry_id, self.changes)
+                    self.breaker.record_success()
+
+                    return self.hosts
         except AccessRestrictionException as exception:
             raise ConfigEntryAuthFailed("Access restricted") from exception
         except (AuthenticationException, UnauthorizedException) as exception:
             raise ConfigEntryAuthFailed("Invalid credentials") from exception
         except (TimeoutError, ClientError, ConnectionError) as exception:
+            unreachable = True
             raise UpdateFailed("Failed to connect") from exception
         except LoginRetryErrorException as exception:
+            # Retrying would only extend the lockout
+            lockout = True
             raise UpdateFailed(
                 "Too many login attempts. Retrying later."
             ) from exception
         except MaximumSessionCountException as exception:
+            lockout = True
             raise UpdateFailed("Maximum session count reached") from exception
         except Exception as exception:
             self.logger.exception(exception)
             raise UpdateFailed(f"Error communicating with API: {str(exception)}")
+        finally:
+            if unreachable or lockout:
+                self.breaker.record_failure(time.monotonic(), trip=lockout)
+            if self._scan_interval:
+                self.update_interval = self._next_interval(response_time, changed)
+
+    def _next_interval(
+        self, response_time: float | None, changed: int | None
+    ) -> timedelta:
+        """Return the interval until the next poll, offset once after the first."""
+        interval = self._scan_interval
+        if self.adaptive_interval:
+            interval = timedelta(
+                seconds=self.adaptive_interval.record(
+                    response_time, changed, len(self.hosts)
+                )
+            )
+        if self.presence_watched and self.full_scan_interval:
+            interval = max(interval, self.full_scan_interval)
+        if self._offset:
+            interval += timedelta(seconds=self._offset)
+            self._offset = 0.0
+
+        return interval
+
+    @callback
+    def _async_fire_host_events(self, changes: HostChanges) -> None:
+        """Fire an event per host that joined or left, or one for all of them."""
+        joined = changes.added | changes.connected
+        left = changes.disconnected
+        if not joined and not left:
+            return
+
+        if len(joined) + len(left) > HOST_EVENTS_BATCH_THRESHOLD:
+            self.hass.bus.async_fire(
+                EVENT_HOSTS_CHANGED,
+                {
+                    "config_entry_id": self.entry_id,
+                    "joined": [self._host_event_data(idx) for idx in joined],
+                    "left": [self._host_event_data(idx) for idx in left],
+                },
+            )
+            return
+
+        for idx in joined:
+            self.hass.bus.async_fire(
+                EVENT_HOST_JOINED,
+                {"config_entry_id": self.entry_id, **self._host_event_data(idx)},
+            )
+        for idx in left:
+            self.hass.bus.async_fire(
+                EVENT_HOST_LEFT,
+                {"config_entry_id": self.entry_id, **self._host_event_data(idx)},
+            )
+
+    def _host_event_data(self, idx: str) -> dict[str, str | None]:
+        """Return the details of a host carried by its events."""
+        host = self.hosts[idx]
+        return {
+            "mac_address": idx,
+            "ip_address": host.ip_address,
+            "interface_type": host.interface_type,
+        }
+
+    async def _async_fetch(self) -> HostChanges:
+        """Read presence only, or refresh hosts and statistics when a full scan is due."""
+        self.gateway_stats.updated = False
+        full_scan = not self._presence_refresh and self._full_scan_due()
+
+        # Extenders read presence before a full scan too, to skip foreign hosts
+        active: set[str] | None = None
+        if not full_scan or self.mesh_extender:
+            if (active := await self._async_get_presence()) is not None:
+                if self.mesh_extender:
+                    active = {idx for idx in active if not self._is_foreign(idx)}
+                # A host we have never seen needs a full refresh for its details
+                if not full_scan and active - self._excluded <= self.hosts.keys():
+                    return self.hosts.update_presence(
+                        active - self._excluded, time.time()
+                    )
+
+        with self.metrics.measure("hosts"):
+            hosts = await self._async_get_hosts(active)
+        self.metrics.record_size("hosts", len(hosts))
+        with self.metrics.measure("stats"):
+            await self._async_fetch_gateway_stats()
+        self._last_full_scan = time.monotonic()
+
+        # Extenders leave the hosts a primary gateway knows to that gateway
+        tracked = [
+            host
+            for host in hosts
+            if self.host_filter(host) and not self._is_foreign(host.id)
+        ]
+        self._excluded = {host.id for host in hosts} - {host.id for host in tracked}
+
+        return self.hosts.update(tracked, time.time())
+
+    async def _async_get_hosts(self, active: set[str] | None) -> list[Device]:
+        """Return the active hosts, on an extender only the ones it may track."""
+        if not (
+            self.mesh_extender
+            and active is not None
+            and self._host_xpath_supported is not False
+        ):
+            return await self.client.get_hosts(only_active=True)
+
+        if not active:
+            return []
+        try:
+            values = await self.client.get_values_by_xpaths(
+                {idx: HOST_XPATH.format(self._addresses[idx]) for idx in active}
+            )
+        except UnknownPathException:
+            self.logger.debug(
+                "Host lookup by address not supported by %s, reading all hosts",
+                self.client.host,
+            )
+            self._host_xpath_supported = False
+            return await self.client.get_hosts(only_active=True)
+
+        self._host_xpath_supported = True
+        hosts = [Device(**value) for value in values.values() if value]
+        return [host for host in hosts if host.active is True]
+
+    async def _async_fetch_gateway_stats(self) -> None:
+        """Read all gateway statistics in a single batched request."""
+        if not self._gateway_stats_xpaths:
+            return
+
+        try:
+            if self._stats_batch:
+                values = await self.client.get_values_by_xpaths(
+                    self._gateway_stats_xpaths
+                )
+            else:
+                values = {
+                    key: await self.client.get_value_by_xpath(xpath)
+                    for key, xpath in self._gateway_stats_xpaths.items()
+                }
+        except UnknownPathException:
+            # Not covered by the capabilities, find the values this gateway
+            # lacks and stop asking for them
+            for key, xpath in list(self._gateway_stats_xpaths.items()):
+                try:
+                    await self.client.get_value_by_xpath(xpath)
+                except UnknownPathException:
+                    self.logger.debug("%s not supported by %s", xpath, self.client.host)
+                    del self._gateway_stats_xpaths[key]
+
+            if not self._gateway_stats_xpaths:
+                return
+            values = await self.client.get_values_by_xpaths(self._gateway_stats_xpaths)
+
+        self.metrics.record_size("stats", len(values))
+        self.gateway_stats.update(values, time.monotonic())
+
+    def _full_scan_due(self) -> bool:
+        """Return True if all host details should be refreshed."""
+        return (
+            self._last_full_scan is None
+            or self.full_scan_interval is None
+            or self.update_interval is None
+            or self.full_scan_interval <= self.update_interval
+            or time.monotonic() - self._last_full_scan
+            >= self.full_scan_interval.total_seconds()
+        )
+
+    async def _async_get_presence(self) -> set[str] | None:
+        """Return the ids of the active hosts, or None if not supported."""
+        if self._presence_supported is False:
+            return None
+
+        try:
+            with self.metrics.measure("presence"):
+                data = await self.client.get_values_by_xpaths(PRESENCE_XPATHS)
+        except UnknownPathException:
+            data = {}
+
+        addresses = data.get("phys_address")
+        active = data.get("active")
+        if (
+            not isinstance(addresses, list)
+            or not isinstance(active, list)
+            or len(addresses) != len(active)
+        ):
+            self.logger.debug(
+                "Presence scan not supported by %s, using full scans only",
+                self.client.host,
+            )
+            self._presence_supported = False
+            return None
+
+        self._presence_supported = True
+        self.metrics.record_size("presence", len(addresses))
+        if self.mesh_extender:
+            # Hosts are looked up by their address as the gateway spells it
+            self._addresses = {
+                address.upper(): address for address in addresses if address
+            }
+
+        return {
+            address.upper()
+            for address, is_active in zip(addresses, active)
+            if address and is_active is True
+        }
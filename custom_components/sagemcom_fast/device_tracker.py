@@ -2,21 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+from typing import TYPE_CHECKING
+
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import ScannerEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity_platform,
+    entity_registry as er,
+)
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from sagemcom_api.models import Device
 
-from . import HomeAssistantSagemcomFastData
-from .const import DOMAIN
+from .const import DOMAIN, ENTITY_CHUNK_SIZE
 from .coordinator import SagemcomDataUpdateCoordinator
 
+if TYPE_CHECKING:
+    from sagemcom_api.models import Device
+
+    from . import HomeAssistantSagemcomFastData
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,18 +37,92 @@ async def async_setup_entry(
     """Set up device tracker from config entry."""
     data: HomeAssistantSagemcomFastData = hass.data[DOMAIN][entry.entry_id]
     tracked: dict[str, SagemcomScannerEntity] = {}
+    handing_over: set[str] = set()
+    platform = entity_platform.async_get_current_platform()
+    host_index = data.coordinator.host_index
+
+    async def async_add_chunked(entities: list[SagemcomScannerEntity]) -> None:
+        """Add many entities chunk by chunk, letting other tasks run in between."""
+        for start in range(0, len(entities), ENTITY_CHUNK_SIZE):
+            await platform.async_add_entities(
+                entities[start : start + ENTITY_CHUNK_SIZE]
+            )
+            # Adding runs eagerly, so explicitly give other tasks a turn
+            await asyncio.sleep(0)
+
+    async def async_hand_over(
+        idxs: set[str], entities: list[SagemcomScannerEntity]
+    ) -> None:
+        """Remove the entities of released hosts, keeping their registry entries."""
+        try:
+            await asyncio.gather(*(entity.async_remove() for entity in entities))
+        finally:
+            handing_over.difference_update(idxs)
+            host_index.async_released(entry.entry_id, idxs)
 
     @callback
     def async_update_router() -> None:
         """Update the values of the router."""
-        newly_discovered: list[SagemcomScannerEntity] = []
-        for idx, device in data.coordinator.data.items():
-            if idx not in tracked:
-                tracked[idx] = SagemcomScannerEntity(
-                    data.coordinator, idx, data.gateway.serial_number
-                )
-                newly_discovered.append(tracked[idx])
-        async_add_entities(newly_discovered)
+        changes = data.coordinator.changes
+        if host_index and (
+            releasing := host_index.releasing(entry.entry_id) - handing_over
+        ):
+            handing_over.update(releasing)
+            entry.async_create_background_task(
+                hass,
+                async_hand_over(
+                    releasing,
+                    [tracked.pop(idx) for idx in releasing if idx in tracked],
+                ),
+                f"{DOMAIN}_hand_over_{entry.entry_id}",
+            )
+
+        new_hosts = (
+            data.coordinator.data.keys() - tracked.keys()
+            if changes is None
+            else changes.added - tracked.keys()
+        )
+        newly_discovered = [
+            SagemcomScannerEntity(data.coordinator, idx, data.gateway.serial_number)
+            for idx in new_hosts
+            # Another gateway of the mesh may track the host
+            if host_index is None or host_index.owns(entry.entry_id, idx)
+        ]
+        tracked.update((entity.unique_id, entity) for entity in newly_discovered)
+
+        if len(newly_discovered) > ENTITY_CHUNK_SIZE:
+            entry.async_create_background_task(
+                hass,
+                async_add_chunked(newly_discovered),
+                f"{DOMAIN}_add_entities_{entry.entry_id}",
+            )
+        elif newly_discovered:
+            async_add_entities(newly_discovered)
+
+        removed = (
+            tracked.keys() - data.coordinator.data.keys()
+            if changes is None
+            else changes.removed
+        )
+        for idx in removed:
+            if entity := tracked.pop(idx, None):
+                async_remove_entity(entity)
+
+    @callback
+    def async_remove_entity(entity: SagemcomScannerEntity) -> None:
+        """Remove the entity and its device of a host that was evicted."""
+        entity_registry = er.async_get(hass)
+        if entity.entity_id is None or not (
+            registry_entry := entity_registry.async_get(entity.entity_id)
+        ):
+            hass.async_create_task(entity.async_remove(force_remove=True))
+            return
+
+        entity_registry.async_remove(entity.entity_id)
+        if registry_entry.device_id:
+            dr.async_get(hass).async_update_device(
+                registry_entry.device_id, remove_config_entry_id=entry.entry_id
+            )
 
     entry.async_on_unload(data.coordinator.async_add_listener(async_update_router))
     async_update_router()
@@ -55,6 +140,40 @@ class SagemcomScannerEntity(
         super().__init__(coordinator)
         self._idx = idx
         self._via_device = parent
+        self._device_info: DeviceInfo | None = None
+        self._device_info_key: tuple[str, str] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Take over the device of a host another gateway of the mesh tracked."""
+        await super().async_added_to_hass()
+        if self.coordinator.host_index is None or not (
+            self.registry_entry and self.registry_entry.device_id
+        ):
+            return
+
+        device_registry = dr.async_get(self.hass)
+        if not (device := device_registry.async_get(self.registry_entry.device_id)):
+            return
+        for entry_id in device.config_entries - {self.registry_entry.config_entry_id}:
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            if entry and entry.domain == DOMAIN:
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry_id
+                )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state when this host changed in the last update."""
+        if self._idx not in self.coordinator.data:
+            return
+        changes = self.coordinator.changes
+        if changes is None or self._idx in changes:
+            super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return if the host is still known to the gateway."""
+        return super().available and self._idx in self.coordinator.data
 
     @property
     def device(self) -> Device:
@@ -73,7 +192,7 @@ class SagemcomScannerEntity(
     @property
     def unique_id(self) -> str:
         """Return a unique ID."""
-        return self.device.id
+        return self._idx
 
     @property
     def source_type(self) -> str:
@@ -87,18 +206,25 @@ class SagemcomScannerEntity(
 
     @property
     def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.unique_id)},
-            connections={(CONNECTION_NETWORK_MAC, self.device.phys_address)},
-            name=self.name,
-            via_device=(DOMAIN, self._via_device),
-        )
+        """Return the device info, rebuilt only when the host details change."""
+        key = (self.name, self.device.phys_address)
+        if self._device_info is None or key != self._device_info_key:
+            self._device_info_key = key
+            self._device_info = DeviceInfo(
+                identifiers={(DOMAIN, self.unique_id)},
+                connections={(CONNECTION_NETWORK_MAC, self.device.phys_address)},
+                name=self.name,
+                via_device=(DOMAIN, self._via_device),
+            )
+        return self._device_info
 
     @property
     def extra_state_attributes(self) -> dict[str, StateType]:
         """Return the state attributes of the device."""
-        return {"interface_type": self.device.interface_type}
+        return {
+            "interface_type": self.device.interface_type,
+            **self.coordinator.history.summary(self._idx),
+        }
 
     @property
     def ip_address(self) -> str:
@@ -1,14 +1,38 @@
-"""Provides diagnostics for Overkiz."""
+"""Provides diagnostics for Sagemcom F@st."""
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import base64
+from dataclasses import asdict
+import json
+import time
+from typing import TYPE_CHECKING, Any
+import zlib
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from sagemcom_api.exceptions import UnauthorizedException
 
-from . import HomeAssistantSagemcomFastData
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_COMPRESS_DIAGNOSTICS,
+    DEFAULT_COMPRESS_DIAGNOSTICS,
+    DIAGNOSTICS_COMPRESS_SIZE,
+    DIAGNOSTICS_MAX_SIZE,
+    DIAGNOSTICS_NODES_DEPTH,
+    DIAGNOSTICS_TIME_BUDGET,
+    DIAGNOSTICS_XPATHS,
+    DOMAIN,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from sagemcom_api.client import SagemcomClient
+
+    from . import HomeAssistantSagemcomFastData
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
 
 
 async def async_get_config_entry_diagnostics(
@@ -17,18 +41,142 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     entry_data: HomeAssistantSagemcomFastData = hass.data[DOMAIN][entry.entry_id]
     client = entry_data.coordinator.client
+    compress = entry.options.get(
+        CONF_COMPRESS_DIAGNOSTICS, DEFAULT_COMPRESS_DIAGNOSTICS
+    )
+
+    data: dict[str, Any] = {}
 
-    full_dump = None
     try:
-        await client.login()
-        full_dump = await client.get_value_by_xpath("*")
+        # Shares the session of a running poll instead of logging it out
+        data["raw"], data["raw_summary"] = (
+            await entry_data.coordinator.broker.async_read(
+                lambda: _async_dump_tree(client, compress)
+            )
+        )
     except Exception as exception:  # pylint: disable=broad-except
         LOGGER.exception(exception)
+        data["error"] = repr(exception)
+
+    if scheduler := entry_data.coordinator.scheduler:
+        if stats := scheduler.stats.get(client.host):
+            data["scheduler"] = {
+                **stats.as_dict(),
+                "offset": scheduler.offsets.get(client.host),
+            }
+
+    if adaptive_interval := entry_data.coordinator.adaptive_interval:
+        data["adaptive_scan_interval"] = adaptive_interval.as_dict()
 
-        return False
-    finally:
-        await client.logout()
+    if capabilities := entry_data.coordinator.capabilities:
+        data["capabilities"] = asdict(capabilities)
 
-    data = {"raw": full_dump}
+    if host_index := entry_data.coordinator.host_index:
+        data["host_index"] = host_index.as_dict(entry.entry_id)
+
+    data["circuit_breaker"] = entry_data.coordinator.breaker.as_dict(time.monotonic())
+    data["request_metrics"] = entry_data.coordinator.metrics.as_dict()
+    data["presence_watch"] = entry_data.watcher.as_dict()
 
     return data
+
+
+async def _async_dump_tree(
+    client: SagemcomClient, compress: bool
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Dump the gateway tree subtree by subtree, within a size and time budget.
+
+    The listed subtrees are read one by one, then the other nodes of Device,
+    e.g. vendor specific ones, are listed with a depth limited read and read
+    one by one as well. A subtree that fails is recorded with its error,
+    large subtrees are optionally compressed and subtrees that no longer fit
+    in the budget are skipped.
+    """
+    started = time.monotonic()
+    dump: dict[str, Any] = {}
+    size = 0
+    skipped: list[str] = []
+
+    def add(xpath: str, subtree: Any) -> None:
+        """Add a subtree to the dump, if it fits in the size budget.
+
+        The subtree is serialized piece by piece, so that only its compressed
+        form is held next to it.
+        """
+        nonlocal size
+
+        length = 0
+        compressor = zlib.compressobj() if compress else None
+        compressed: list[bytes] = []
+        for chunk in _ENCODER.iterencode(subtree):
+            encoded = chunk.encode()
+            length += len(encoded)
+            if compressor and (data := compressor.compress(encoded)):
+                compressed.append(data)
+
+        value: Any = subtree
+        if compressor and length > DIAGNOSTICS_COMPRESS_SIZE:
+            compressed.append(compressor.flush())
+            value = {"zlib_base64": base64.b64encode(b"".join(compressed)).decode()}
+            length = len(value["zlib_base64"])
+        del compressed
+
+        if size + length > DIAGNOSTICS_MAX_SIZE:
+            skipped.append(xpath)
+            return
+
+        size += length
+        dump[xpath] = value
+
+    async def async_get(xpath: str, options: dict[str, Any] | None = None) -> Any:
+        """Return a subtree within the time budget, or None if out of budget."""
+        remaining = DIAGNOSTICS_TIME_BUDGET - (time.monotonic() - started)
+        if remaining <= 0 or size >= DIAGNOSTICS_MAX_SIZE:
+            skipped.append(xpath)
+            return None
+
+        try:
+            async with asyncio.timeout(remaining):
+                return await client.get_value_by_xpath(xpath, options)
+        except UnauthorizedException:
+            # Lets the broker log in again
+            raise
+        except Exception as exception:  # pylint: disable=broad-except
+            dump[xpath] = {"error": repr(exception)}
+            return None
+
+    for xpath in DIAGNOSTICS_XPATHS:
+        if (subtree := await async_get(xpath)) is not None:
+            add(xpath, subtree)
+            del subtree
+
+    nodes = await async_get("Device", {"depth": DIAGNOSTICS_NODES_DEPTH})
+    if isinstance(nodes, dict):
+        nodes = nodes.get("device", nodes)
+        listed = {_normalize(xpath.split("/")[-1]) for xpath in DIAGNOSTICS_XPATHS}
+        for xpath in [
+            f"Device/{_pascalize(key)}"
+            for key in nodes
+            if _normalize(key) not in listed
+        ]:
+            if (subtree := await async_get(xpath)) is not None:
+                add(xpath, subtree)
+                del subtree
+
+    summary = {
+        "size": size,
+        "elapsed": time.monotonic() - started,
+        "skipped": skipped,
+    }
+
+    return dump, summary
+
+
+def _normalize(name: str) -> str:
+    """Return a node name the same whether it is camel or snake case."""
+    return name.replace("_", "").lower()
+
+
+def _pascalize(name: str) -> str:
+    """Return the node name of an xpath from its snake case key."""
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_"))
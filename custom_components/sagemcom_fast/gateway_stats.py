@@ -0,0 +1,71 @@
+"""Traffic and load statistics of a Sagemcom F@st gateway."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Counters that are turned into a rate, by the key of the rate
+RATE_COUNTERS: dict[str, str] = {
+    "wan_download_rate": "wan_bytes_received",
+    "wan_upload_rate": "wan_bytes_sent",
+}
+
+INTERFACE_COUNTERS: tuple[str, ...] = ("bytes_received", "bytes_sent")
+
+
+class GatewayStats:
+    """Latest gateway statistics, with rates derived from counter deltas."""
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.values: dict[str, Any] = {}
+        self.interfaces: dict[str, dict[str, int]] = {}
+        self.rates: dict[str, float | None] = {}
+        self.memory_usage: float | None = None
+        self.updated = False
+        self._sampled_at: float | None = None
+
+    def update(self, values: dict[str, Any], now: float) -> None:
+        """Store the values read from the gateway at the given monotonic time."""
+        previous = self.values
+        elapsed = None if self._sampled_at is None else now - self._sampled_at
+
+        self.values = {
+            key: value for key, value in values.items() if key != "interfaces"
+        }
+        self.interfaces = {
+            interface["alias"]: {
+                counter: _to_int((interface.get("stats") or {}).get(counter))
+                for counter in INTERFACE_COUNTERS
+            }
+            for interface in values.get("interfaces") or []
+            if isinstance(interface, dict) and interface.get("alias")
+        }
+
+        total = _to_int(self.values.get("memory_total"))
+        free = _to_int(self.values.get("memory_free"))
+        self.memory_usage = (
+            round((total - free) / total * 100, 1)
+            if total and free is not None
+            else None
+        )
+
+        for rate, counter in RATE_COUNTERS.items():
+            current = _to_int(self.values.get(counter))
+            last = _to_int(previous.get(counter))
+            # Counters reset when the gateway reboots or wraps around
+            if current is None or last is None or not elapsed or current < last:
+                self.rates[rate] = None
+            else:
+                self.rates[rate] = (current - last) / elapsed
+
+        self._sampled_at = now
+        self.updated = True
+
+
+def _to_int(value: Any) -> int | None:
+    """Return the value as an integer, or None if it is not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,180 @@
+"""Connection history of the hosts of a Sagemcom F@st gateway."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, HISTORY_SAVE_DELAY, STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from .host_table import HostChanges, HostTable
+
+
+class _HostHistory:
+    """Ring buffer of the connect and disconnect times of a host.
+
+    Events are whole seconds since the epoch, positive when the host
+    connected and negative when it disconnected.
+    """
+
+    __slots__ = ("events", "start", "first_seen", "connects")
+
+    def __init__(self, first_seen: int, connects: int = 0) -> None:
+        """Initialize an empty history."""
+        self.events = array("q")
+        self.start = 0
+        self.first_seen = first_seen
+        self.connects = connects
+
+    def append(self, event: int, size: int) -> None:
+        """Add an event, overwriting the oldest one when the buffer is full."""
+        if len(self.events) < size:
+            self.events.append(event)
+        else:
+            self.events[self.start] = event
+            self.start = (self.start + 1) % size
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the events, oldest first."""
+        yield from self.events[self.start :]
+        yield from self.events[: self.start]
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the last event is a connect."""
+        return bool(self.events) and self.events[self.start - 1] > 0
+
+
+class ConnectionHistory:
+    """Connect and disconnect events of each host, in fixed-size buffers."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty history keeping size events per host."""
+        self.size = size
+        self._hosts: dict[str, _HostHistory] = {}
+
+    def __contains__(self, idx: object) -> bool:
+        """Return True if the host has a history."""
+        return idx in self._hosts
+
+    def update(self, hosts: HostTable, changes: HostChanges | None, now: float) -> None:
+        """Record the hosts that connected or disconnected since the last update."""
+        if changes is None:
+            for idx in self._hosts.keys() - hosts.keys():
+                del self._hosts[idx]
+            candidates: set[str] | HostTable = hosts
+        else:
+            for idx in changes.removed:
+                self._hosts.pop(idx, None)
+            candidates = changes.added | changes.connected | changes.disconnected
+
+        timestamp = int(now)
+        for idx in candidates:
+            connected = idx in hosts.active
+            if (history := self._hosts.get(idx)) is None:
+                history = self._hosts[idx] = _HostHistory(timestamp)
+            if history.connected == connected:
+                continue
+
+            history.append(timestamp if connected else -timestamp, self.size)
+            if connected:
+                history.connects += 1
+
+    def events(self, idx: str) -> list[dict[str, Any]]:
+        """Return the recorded events of a host, oldest first."""
+        if (history := self._hosts.get(idx)) is None:
+            return []
+        return [
+            {"time": _isoformat(abs(event)), "connected": event > 0}
+            for event in history
+        ]
+
+    def summary(self, idx: str) -> dict[str, Any]:
+        """Return when a host was first seen, connected and its session lengths."""
+        if (history := self._hosts.get(idx)) is None:
+            return {}
+
+        last_connected = last_disconnected = None
+        sessions: list[int] = []
+        for event in history:
+            if event > 0:
+                last_connected = event
+            else:
+                if last_connected is not None and last_connected <= -event:
+                    sessions.append(-event - last_connected)
+                last_disconnected = -event
+
+        return {
+            "first_seen": _isoformat(history.first_seen),
+            "last_connected": _isoformat(last_connected),
+            "last_disconnected": _isoformat(last_disconnected),
+            "connect_count": history.connects,
+            "average_session": sum(sessions) // len(sessions) if sessions else None,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history in a form that can be stored."""
+        return {
+            idx: {
+                "first_seen": history.first_seen,
+                "connects": history.connects,
+                "events": list(history),
+            }
+            for idx, history in self._hosts.items()
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Load a history previously returned by as_dict."""
+        for idx, host in data.items():
+            history = self._hosts[idx] = _HostHistory(
+                host["first_seen"], host["connects"]
+            )
+            for event in host["events"][-self.size :]:
+                history.append(event, self.size)
+
+
+def _isoformat(timestamp: int | None) -> str | None:
+    """Return a timestamp as an ISO 8601 string."""
+    if timestamp is None:
+        return None
+    return dt_util.utc_from_timestamp(timestamp).isoformat()
+
+
+class HistoryStore:
+    """Persist the connection history of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history store of a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history"
+        )
+        self._save_pending = False
+
+    async def async_load(self) -> dict[str, Any]:
+        """Return the stored history."""
+        return (await self._store.async_load() or {}).get("hosts", {})
+
+    @callback
+    def async_schedule_save(self, history: ConnectionHistory) -> None:
+        """Save the history after a delay, unless a save is already scheduled."""
+        if self._save_pending:
+            return
+
+        self._save_pending = True
+
+        @callback
+        def _data() -> dict[str, Any]:
+            self._save_pending = False
+            return {"hosts": history.as_dict()}
+
+        self._store.async_delay_save(_data, HISTORY_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the stored history."""
+        await self._store.async_remove()
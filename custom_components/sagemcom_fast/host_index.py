@@ -0,0 +1,181 @@
+"""Hosts of the gateways of a mesh, each tracked by a single config entry."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Collection, Iterable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_HOST_INDEX
+
+if TYPE_CHECKING:
+    from .host_table import HostChanges
+
+HostsCallback = Callable[[set[str]], None]
+
+
+class _Gateway:
+    """A gateway of the mesh, the hosts it knows and how to move hosts."""
+
+    __slots__ = ("primary", "hosts", "release", "claim")
+
+    def __init__(
+        self,
+        primary: bool,
+        hosts: Collection[str],
+        release: HostsCallback,
+        claim: HostsCallback,
+    ) -> None:
+        """Initialize the gateway."""
+        self.primary = primary
+        self.hosts = hosts
+        self.release = release
+        self.claim = claim
+
+
+class HostIndex:
+    """Owner of each host of a mesh, by MAC address.
+
+    A host known to a primary gateway is owned by it, mesh extenders only
+    own the hosts no primary gateway knows. A host moves from an extender
+    to a primary gateway in two steps: the extender is asked to release it
+    and, once its entity is gone, the primary gateway claims it. There is
+    never more than one tracker entity per host.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._gateways: dict[str, _Gateway] = {}
+        self._owners: dict[str, str] = {}
+        # Hosts an extender was asked to release, with the entry claiming them
+        self._releasing: dict[str, str] = {}
+
+    def owns(self, entry_id: str, idx: str) -> bool:
+        """Return True if the entry owns the host."""
+        return self._owners.get(idx) == entry_id
+
+    def is_foreign(self, entry_id: str, idx: str) -> bool:
+        """Return True if another entry owns the host, or is about to."""
+        return self._releasing.get(idx, self._owners.get(idx)) not in (None, entry_id)
+
+    def releasing(self, entry_id: str) -> set[str]:
+        """Return the hosts the entry was asked to release."""
+        return {idx for idx in self._releasing if self._owners.get(idx) == entry_id}
+
+    @callback
+    def async_register(
+        self,
+        entry_id: str,
+        primary: bool,
+        hosts: Collection[str],
+        release: HostsCallback,
+        claim: HostsCallback,
+    ) -> CALLBACK_TYPE:
+        """Add a gateway with the hosts it already knows, return how to remove it."""
+        self._gateways[entry_id] = _Gateway(primary, hosts, release, claim)
+        self._async_assign(list(hosts), entry_id)
+
+        @callback
+        def async_unregister() -> None:
+            """Remove the gateway and give its hosts to the other gateways."""
+            del self._gateways[entry_id]
+            owned = {idx for idx, owner in self._owners.items() if owner == entry_id}
+            for idx in owned:
+                del self._owners[idx]
+                self._releasing.pop(idx, None)
+            for idx, claiming in list(self._releasing.items()):
+                if claiming == entry_id:
+                    del self._releasing[idx]
+            self._async_assign(owned)
+
+        return async_unregister
+
+    @callback
+    def async_update(self, entry_id: str, changes: HostChanges | None) -> None:
+        """Assign the hosts a gateway added or removed, None meaning all of them."""
+        if changes is None:
+            idxs: Iterable[str] = {
+                *self._gateways[entry_id].hosts,
+                *(idx for idx, owner in self._owners.items() if owner == entry_id),
+            }
+        else:
+            idxs = changes.added | changes.removed
+
+        self._async_assign(idxs, entry_id)
+
+    @callback
+    def async_released(self, entry_id: str, idxs: Iterable[str]) -> None:
+        """Hand the hosts an extender released over to the entries claiming them."""
+        released = set()
+        for idx in idxs:
+            if self._owners.get(idx) == entry_id and idx in self._releasing:
+                del self._owners[idx]
+                del self._releasing[idx]
+                released.add(idx)
+
+        self._async_assign(released)
+
+    def _owner(self, idx: str, owner: str | None) -> str | None:
+        """Return who should own a host, keeping its owner unless outranked."""
+        known = [
+            entry_id
+            for entry_id, gateway in self._gateways.items()
+            if idx in gateway.hosts
+        ]
+        candidates = [
+            entry_id for entry_id in known if self._gateways[entry_id].primary
+        ] or known
+        if owner in candidates:
+            return owner
+        return candidates[0] if candidates else None
+
+    @callback
+    def _async_assign(self, idxs: Iterable[str], updating: str | None = None) -> None:
+        """Assign hosts to their owners, releasing or claiming them as needed.
+
+        The gateway that is updating picks up its new hosts by itself.
+        """
+        releases: dict[str, set[str]] = defaultdict(set)
+        claims: dict[str, set[str]] = defaultdict(set)
+
+        for idx in idxs:
+            if idx in self._releasing:
+                continue
+            owner = self._owners.get(idx)
+            if (new_owner := self._owner(idx, owner)) == owner:
+                continue
+            if owner is not None and new_owner is not None:
+                self._releasing[idx] = new_owner
+                releases[owner].add(idx)
+            elif new_owner is None:
+                del self._owners[idx]
+            else:
+                self._owners[idx] = new_owner
+                if new_owner != updating:
+                    claims[new_owner].add(idx)
+
+        for entry_id, released in releases.items():
+            self._gateways[entry_id].release(released)
+        for entry_id, claimed in claims.items():
+            self._gateways[entry_id].claim(claimed)
+
+    def as_dict(self, entry_id: str) -> dict[str, Any]:
+        """Return the role of an entry and the hosts it owns."""
+        return {
+            "primary": self._gateways[entry_id].primary,
+            "gateways": len(self._gateways),
+            "owned_hosts": sum(owner == entry_id for owner in self._owners.values()),
+            "hosts": len(self._owners),
+            "releasing": len(self.releasing(entry_id)),
+        }
+
+
+@callback
+def async_get_host_index(hass: HomeAssistant) -> HostIndex:
+    """Return the host index shared by all config entries."""
+    if (index := hass.data.get(DATA_HOST_INDEX)) is None:
+        index = hass.data[DATA_HOST_INDEX] = HostIndex()
+
+    return index
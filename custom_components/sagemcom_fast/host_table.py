@@ -0,0 +1,228 @@
+"""Table of hosts known to a Sagemcom F@st gateway."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Set
+from dataclasses import dataclass, field
+
+from sagemcom_api.models import Device
+
+
+@dataclass
+class HostChanges:
+    """Hosts that changed during the last update, by id."""
+
+    added: set[str] = field(default_factory=set)
+    removed: set[str] = field(default_factory=set)
+    connected: set[str] = field(default_factory=set)
+    disconnected: set[str] = field(default_factory=set)
+    updated: set[str] = field(default_factory=set)
+
+    def __contains__(self, idx: object) -> bool:
+        """Return True if the host changed in any way."""
+        return (
+            idx in self.added
+            or idx in self.removed
+            or idx in self.connected
+            or idx in self.disconnected
+            or idx in self.updated
+        )
+
+    def __len__(self) -> int:
+        """Return the number of changes."""
+        return (
+            len(self.added)
+            + len(self.removed)
+            + len(self.connected)
+            + len(self.disconnected)
+            + len(self.updated)
+        )
+
+
+@dataclass(frozen=True)
+class HostFilter:
+    """Decide which hosts are tracked, based on their connection."""
+
+    track_wireless: bool = True
+    track_wired: bool = True
+    # MAC addresses and interface types, in upper case
+    allowlist: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_allowlist(
+        cls, track_wireless: bool, track_wired: bool, allowlist: str
+    ) -> HostFilter:
+        """Create a filter from a comma separated allowlist."""
+        return cls(
+            track_wireless,
+            track_wired,
+            frozenset(
+                item.strip().upper() for item in allowlist.split(",") if item.strip()
+            ),
+        )
+
+    def __call__(self, host: Device) -> bool:
+        """Return True if the host should be tracked."""
+        interface_type = (host.interface_type or "").upper()
+        wireless = interface_type.startswith(("WIFI", "WLAN", "802.11"))
+        if not (self.track_wireless if wireless else self.track_wired):
+            return False
+
+        return (
+            not self.allowlist
+            or host.id in self.allowlist
+            or interface_type in self.allowlist
+        )
+
+
+def _host_state(host: Device) -> tuple:
+    """Return the host attributes that are exposed on an entity."""
+    return (
+        host.ip_address,
+        host.host_name,
+        host.user_host_name,
+        host.user_friendly_name,
+        host.interface_type,
+    )
+
+
+class _HostRecord:
+    """A known host and the last time it was seen active."""
+
+    __slots__ = ("device", "last_seen")
+
+    def __init__(self, device: Device, last_seen: float) -> None:
+        """Initialize the record."""
+        self.device = device
+        self.last_seen = last_seen
+
+
+class HostTable(Mapping[str, Device]):
+    """Hosts keyed by id, ordered from least to most recently seen.
+
+    Only the active hosts are visited when marking hosts inactive, and hosts
+    that have not been seen for max_age seconds, or that do not fit in
+    max_size, are evicted starting with the least recently seen.
+    """
+
+    def __init__(self, max_age: float | None = None, max_size: int | None = None):
+        """Initialize the host table."""
+        self.max_age = max_age
+        self.max_size = max_size
+        self._records: OrderedDict[str, _HostRecord] = OrderedDict()
+        self._active: set[str] = set()
+
+    def __getitem__(self, idx: str) -> Device:
+        """Return the host with the given id."""
+        return self._records[idx].device
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the host ids."""
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        """Return the number of known hosts."""
+        return len(self._records)
+
+    def __contains__(self, idx: object) -> bool:
+        """Return True if the host is known."""
+        return idx in self._records
+
+    @property
+    def active(self) -> set[str]:
+        """Return the ids of the active hosts."""
+        return self._active
+
+    def last_seen(self, idx: str) -> float:
+        """Return the timestamp the host was last seen active."""
+        return self._records[idx].last_seen
+
+    def restore(self, hosts: Iterable[tuple[Device, float]]) -> None:
+        """Load hosts with their last seen timestamp, e.g. from a snapshot."""
+        for host, last_seen in sorted(hosts, key=lambda item: item[1]):
+            self._records[host.id] = _HostRecord(host, last_seen)
+            if host.active:
+                self._active.add(host.id)
+
+    def update(self, hosts: Iterable[Device], now: float) -> HostChanges:
+        """Merge the active hosts into the table and return what changed."""
+        changes = HostChanges()
+        current = {host.id: host for host in hosts}
+
+        for idx, host in current.items():
+            record = self._records.get(idx)
+            if record is None:
+                self._records[idx] = _HostRecord(host, now)
+                changes.added.add(idx)
+                continue
+            if idx in self._active and _host_state(record.device) != _host_state(host):
+                changes.updated.add(idx)
+            record.device = host
+
+        self._update_active(current.keys(), now, changes)
+
+        return changes
+
+    def update_presence(self, active: set[str], now: float) -> HostChanges:
+        """Update which known hosts are active and return what changed.
+
+        Every id in active must already be in the table.
+        """
+        changes = HostChanges()
+        self._update_active(active, now, changes)
+
+        return changes
+
+    def _update_active(self, active: Set[str], now: float, changes: HostChanges):
+        """Mark the given hosts active and all other hosts inactive."""
+        for idx in self._active - active:
+            self._records[idx].device.active = False
+            changes.disconnected.add(idx)
+
+        for idx in active:
+            record = self._records[idx]
+            if idx not in self._active and idx not in changes.added:
+                changes.connected.add(idx)
+            record.device.active = True
+            record.last_seen = now
+            self._records.move_to_end(idx)
+
+        self._active = set(active)
+        changes.removed = self.evict(now)
+        changes.disconnected -= changes.removed
+
+    def retain(self, predicate: Callable[[Device], bool]) -> set[str]:
+        """Remove all hosts for which predicate is False and return their ids."""
+        removed = {
+            idx for idx, record in self._records.items() if not predicate(record.device)
+        }
+        for idx in removed:
+            del self._records[idx]
+        self._active -= removed
+
+        return removed
+
+    def discard(self, ids: Iterable[str]) -> set[str]:
+        """Remove the given hosts and return the ids of those that were known."""
+        removed = {idx for idx in ids if self._records.pop(idx, None) is not None}
+        self._active -= removed
+
+        return removed
+
+    def evict(self, now: float) -> set[str]:
+        """Evict expired hosts and hosts over the size limit."""
+        evicted: set[str] = set()
+
+        while self._records:
+            idx, record = next(iter(self._records.items()))
+            if idx in self._active:
+                break
+            expired = self.max_age and now - record.last_seen > self.max_age
+            oversized = self.max_size and len(self._records) > self.max_size
+            if not expired and not oversized:
+                break
+            del self._records[idx]
+            evicted.add(idx)
+
+        return evicted
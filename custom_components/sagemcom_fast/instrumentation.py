@@ -0,0 +1,131 @@
+"""Cheap per-phase instrumentation of the gateway requests."""
+
+from __future__ import annotations
+
+from collections import Counter, deque
+import time
+from types import TracebackType
+from typing import Any
+
+from .const import METRICS_BUCKETS, METRICS_WINDOW
+
+
+class PhaseStats:
+    """Rolling durations, payload sizes and error classes of a single phase."""
+
+    __slots__ = ("count", "durations", "sizes", "errors")
+
+    def __init__(self, window: int) -> None:
+        """Initialize empty statistics, keeping the last window samples."""
+        self.count = 0
+        self.durations: deque[float] = deque(maxlen=window)
+        self.sizes: deque[int] = deque(maxlen=window)
+        self.errors: Counter[str] = Counter()
+
+    @property
+    def last(self) -> float | None:
+        """Return the last duration in milliseconds."""
+        return self.durations[-1] if self.durations else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the recent durations in milliseconds."""
+        if not self.durations:
+            return None
+
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def histogram(self) -> dict[str, int]:
+        """Return how many recent durations fall in each bucket."""
+        buckets = dict.fromkeys([f"<={bucket}" for bucket in METRICS_BUCKETS], 0)
+        buckets[f">{METRICS_BUCKETS[-1]}"] = 0
+        for duration in self.durations:
+            for bucket in METRICS_BUCKETS:
+                if duration <= bucket:
+                    buckets[f"<={bucket}"] += 1
+                    break
+            else:
+                buckets[f">{METRICS_BUCKETS[-1]}"] += 1
+
+        return buckets
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            "count": self.count,
+            "last_ms": self.last,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": max(self.durations, default=None),
+            "histogram_ms": self.histogram(),
+            "last_size": self.sizes[-1] if self.sizes else None,
+            "max_size": max(self.sizes, default=None),
+            "errors": dict(self.errors),
+        }
+
+
+class _PhaseTimer:
+    """Context manager recording the duration and error of a phase."""
+
+    __slots__ = ("_stats", "_started")
+
+    def __init__(self, stats: PhaseStats) -> None:
+        """Initialize the timer."""
+        self._stats = stats
+        self._started = 0.0
+
+    def __enter__(self) -> None:
+        """Start timing."""
+        self._started = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Record the duration, and the error class if the phase failed."""
+        self._stats.count += 1
+        self._stats.durations.append((time.perf_counter() - self._started) * 1000)
+        if exc_type is not None:
+            self._stats.errors[exc_type.__name__] += 1
+
+
+class RequestMetrics:
+    """Per-phase timings, payload sizes, retries and errors of a gateway."""
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        """Initialize empty metrics."""
+        self.phases: dict[str, PhaseStats] = {}
+        self.retries = 0
+        self._window = window
+
+    def phase(self, name: str) -> PhaseStats:
+        """Return the statistics of a phase."""
+        if (stats := self.phases.get(name)) is None:
+            stats = self.phases[name] = PhaseStats(self._window)
+        return stats
+
+    def measure(self, name: str) -> _PhaseTimer:
+        """Return a context manager timing a phase."""
+        return _PhaseTimer(self.phase(name))
+
+    def record_size(self, name: str, size: int) -> None:
+        """Record the number of items a phase returned."""
+        self.phase(name).sizes.append(size)
+
+    def record_retry(self) -> None:
+        """Record a request that was retried."""
+        self.retries += 1
+
+    @property
+    def errors(self) -> int:
+        """Return the number of failed polls."""
+        return sum(self.phase("poll").errors.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "retries": self.retries,
+            "phases": {name: stats.as_dict() for name, stats in self.phases.items()},
+        }
@@ -5,7 +5,32 @@ from homeassistant.const import CONF_SCAN_INTERVAL
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
-from .const import DEFAULT_SCAN_INTERVAL, MIN_SCAN_INTERVAL
+from .const import (
+    CONF_ADAPTIVE_SCAN_INTERVAL,
+    CONF_COMPRESS_DIAGNOSTICS,
+    CONF_FULL_SCAN_INTERVAL,
+    CONF_HOST_ALLOWLIST,
+    CONF_HOST_MAX_AGE,
+    CONF_KEEP_SESSION,
+    CONF_MAX_HOSTS,
+    CONF_MESH_EXTENDER,
+    CONF_PRESENCE_WATCH,
+    CONF_TRACK_WIRED_CLIENTS,
+    CONF_TRACK_WIRELESS_CLIENTS,
+    DEFAULT_ADAPTIVE_SCAN_INTERVAL,
+    DEFAULT_COMPRESS_DIAGNOSTICS,
+    DEFAULT_FULL_SCAN_INTERVAL,
+    DEFAULT_HOST_ALLOWLIST,
+    DEFAULT_HOST_MAX_AGE,
+    DEFAULT_KEEP_SESSION,
+    DEFAULT_MAX_HOSTS,
+    DEFAULT_MESH_EXTENDER,
+    DEFAULT_PRESENCE_WATCH,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TRACK_WIRED_CLIENTS,
+    DEFAULT_TRACK_WIRELESS_CLIENTS,
+    MIN_SCAN_INTERVAL,
+)
 
 
 class OptionsFlow(config_entries.OptionsFlow):
@@ -29,7 +54,71 @@ class OptionsFlow(config_entries.OptionsFlow):
                         default=self._options.get(
                             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                         ),
-                    ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL))
+                    ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                    vol.Optional(
+                        CONF_ADAPTIVE_SCAN_INTERVAL,
+                        default=self._options.get(
+                            CONF_ADAPTIVE_SCAN_INTERVAL, DEFAULT_ADAPTIVE_SCAN_INTERVAL
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_FULL_SCAN_INTERVAL,
+                        default=self._options.get(
+                            CONF_FULL_SCAN_INTERVAL, DEFAULT_FULL_SCAN_INTERVAL
+                        ),
+                    ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                    vol.Optional(
+                        CONF_KEEP_SESSION,
+                        default=self._options.get(
+                            CONF_KEEP_SESSION, DEFAULT_KEEP_SESSION
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PRESENCE_WATCH,
+                        default=self._options.get(
+                            CONF_PRESENCE_WATCH, DEFAULT_PRESENCE_WATCH
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TRACK_WIRELESS_CLIENTS,
+                        default=self._options.get(
+                            CONF_TRACK_WIRELESS_CLIENTS, DEFAULT_TRACK_WIRELESS_CLIENTS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_TRACK_WIRED_CLIENTS,
+                        default=self._options.get(
+                            CONF_TRACK_WIRED_CLIENTS, DEFAULT_TRACK_WIRED_CLIENTS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HOST_ALLOWLIST,
+                        default=self._options.get(
+                            CONF_HOST_ALLOWLIST, DEFAULT_HOST_ALLOWLIST
+                        ),
+                    ): str,
+                    vol.Optional(
+                        CONF_HOST_MAX_AGE,
+                        default=self._options.get(
+                            CONF_HOST_MAX_AGE, DEFAULT_HOST_MAX_AGE
+                        ),
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_MAX_HOSTS,
+                        default=self._options.get(CONF_MAX_HOSTS, DEFAULT_MAX_HOSTS),
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_MESH_EXTENDER,
+                        default=self._options.get(
+                            CONF_MESH_EXTENDER, DEFAULT_MESH_EXTENDER
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_COMPRESS_DIAGNOSTICS,
+                        default=self._options.get(
+                            CONF_COMPRESS_DIAGNOSTICS, DEFAULT_COMPRESS_DIAGNOSTICS
+                        ),
+                    ): bool,
                 }
             ),
         )
@@ -0,0 +1,119 @@
+"""Watch the active flags of the gateway host table."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from sagemcom_api.exceptions import UnknownPathException
+
+from .const import PRESENCE_WATCH_INTERVAL, PRESENCE_WATCH_XPATH
+
+if TYPE_CHECKING:
+    from .coordinator import SagemcomDataUpdateCoordinator
+
+
+class PresenceWatcher:
+    """Refresh the hosts as soon as hosts join, leave or rejoin the gateway.
+
+    Reads the active flags of the hosts every second, through the session
+    broker and so within the request cap, and refreshes presence right away
+    when they change. Meanwhile the regular polls only run as often as the
+    full scans, and take over again when the gateway does not expose the
+    flags.
+    """
+
+    def __init__(
+        self,
+        coordinator: SagemcomDataUpdateCoordinator,
+        interval: float = PRESENCE_WATCH_INTERVAL,
+    ) -> None:
+        """Initialize the watcher, disabled until enabled."""
+        self.coordinator = coordinator
+        self.interval = interval
+        self.supported: bool | None = None
+        self.changes = 0
+        self._flags: list[Any] | None = None
+        self._enabled = asyncio.Event()
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the watcher is enabled."""
+        return self._enabled.is_set()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Start or pause watching."""
+        if enabled:
+            self._enabled.set()
+        else:
+            self._enabled.clear()
+            self._flags = None
+            self.coordinator.presence_watched = False
+
+    async def async_run(self) -> None:
+        """Watch the gateway until it turns out not to support it."""
+        while self.supported is not False:
+            await self._enabled.wait()
+            await asyncio.sleep(self.interval)
+
+            # Leave a failing gateway to the regular polls and their backoff
+            if not self.enabled or not self.coordinator.last_update_success:
+                continue
+
+            if not await self._async_check() and self.coordinator.update_interval:
+                await asyncio.sleep(self.coordinator.update_interval.total_seconds())
+
+    async def _async_check(self) -> bool:
+        """Refresh if the flags changed, return False on errors."""
+        client = self.coordinator.client
+        if (
+            capabilities := self.coordinator.capabilities
+        ) and not capabilities.supports(PRESENCE_WATCH_XPATH):
+            self._unsupported()
+            return False
+
+        try:
+            flags = await self.coordinator.broker.async_read(
+                lambda: client.get_value_by_xpath(PRESENCE_WATCH_XPATH)
+            )
+        except UnknownPathException:
+            self._unsupported()
+            return False
+        except Exception as exception:  # pylint: disable=broad-except
+            self.coordinator.logger.debug(
+                "Failed to watch %s: %s", client.host, exception
+            )
+            # Polls at the regular interval until the watch recovers
+            self.coordinator.presence_watched = False
+            return False
+
+        if not isinstance(flags, list):
+            self._unsupported()
+            return False
+
+        self.supported = True
+        self.coordinator.presence_watched = self.enabled
+        if self._flags is not None and flags != self._flags:
+            self.changes += 1
+            # Not debounced, the flags already tell the hosts changed
+            await self.coordinator.async_refresh_presence()
+        self._flags = flags
+
+        return True
+
+    def _unsupported(self) -> None:
+        """Stop watching a gateway that does not expose the flags."""
+        self.coordinator.logger.debug(
+            "Active flags not supported by %s, polling only",
+            self.coordinator.client.host,
+        )
+        self.supported = False
+        self.coordinator.presence_watched = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the watcher."""
+        return {
+            "enabled": self.enabled,
+            "supported": self.supported,
+            "changes": self.changes,
+        }
@@ -0,0 +1,102 @@
+"""Poll scheduler shared by all Sagemcom F@st gateways."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import random
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_SCHEDULER, MAX_CONCURRENT_POLLS
+
+
+@dataclass
+class RequestStats:
+    """Queue and request latency of a single gateway, in seconds."""
+
+    requests: int = 0
+    last_queue_time: float = 0.0
+    max_queue_time: float = 0.0
+    total_queue_time: float = 0.0
+    last_request_time: float = 0.0
+    max_request_time: float = 0.0
+    total_request_time: float = 0.0
+
+    @property
+    def avg_queue_time(self) -> float:
+        """Return the average time spent waiting for a slot."""
+        return self.total_queue_time / self.requests if self.requests else 0.0
+
+    @property
+    def avg_request_time(self) -> float:
+        """Return the average time a slot was held."""
+        return self.total_request_time / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the statistics as a dictionary."""
+        return {
+            "requests": self.requests,
+            "last_queue_time": self.last_queue_time,
+            "max_queue_time": self.max_queue_time,
+            "avg_queue_time": self.avg_queue_time,
+            "last_request_time": self.last_request_time,
+            "max_request_time": self.max_request_time,
+            "avg_request_time": self.avg_request_time,
+        }
+
+
+class PollScheduler:
+    """Stagger gateway polls and cap how many requests are in flight at once.
+
+    Each gateway gets a fixed random offset, which delays its polls once so
+    that gateways set up together stay apart afterwards. Every request to a
+    gateway, polls as well as diagnostics or reboots, holds a slot.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        """Initialize the scheduler."""
+        self.stats: dict[str, RequestStats] = {}
+        self.offsets: dict[str, float] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def offset(self, key: str, interval: float) -> float:
+        """Return the offset of a gateway, at most one scan interval."""
+        if (offset := self.offsets.get(key)) is None:
+            offset = self.offsets[key] = random.uniform(0, interval)
+
+        return offset
+
+    @asynccontextmanager
+    async def async_slot(self, key: str) -> AsyncIterator[None]:
+        """Wait for a free slot, then hold it during a request."""
+        loop = asyncio.get_running_loop()
+        stats = self.stats.setdefault(key, RequestStats())
+        queued = loop.time()
+
+        async with self._semaphore:
+            started = loop.time()
+            queue_time = started - queued
+            stats.last_queue_time = queue_time
+            stats.max_queue_time = max(stats.max_queue_time, queue_time)
+            stats.total_queue_time += queue_time
+
+            try:
+                yield
+            finally:
+                request_time = loop.time() - started
+                stats.requests += 1
+                stats.last_request_time = request_time
+                stats.max_request_time = max(stats.max_request_time, request_time)
+                stats.total_request_time += request_time
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the poll scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = PollScheduler(MAX_CONCURRENT_POLLS)
+
+    return scheduler
@@ -0,0 +1,309 @@
+"""Support for Sagemcom F@st sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfDataRate,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import SagemcomDataUpdateCoordinator
+from .gateway_stats import GatewayStats
+from .instrumentation import RequestMetrics
+
+if TYPE_CHECKING:
+    from . import HomeAssistantSagemcomFastData
+
+
+@dataclass(frozen=True, kw_only=True)
+class SagemcomSensorEntityDescription(SensorEntityDescription):
+    """Class describing Sagemcom F@st sensor entities."""
+
+    value_fn: Callable[[GatewayStats], StateType]
+
+
+def _rate(key: str) -> Callable[[GatewayStats], StateType]:
+    """Return a function reading a derived rate."""
+
+    def _value(stats: GatewayStats) -> StateType:
+        rate = stats.rates.get(key)
+        return None if rate is None else round(rate)
+
+    return _value
+
+
+SENSOR_DESCRIPTIONS: tuple[SagemcomSensorEntityDescription, ...] = (
+    SagemcomSensorEntityDescription(
+        key="uptime",
+        name="Uptime",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.values.get("uptime"),
+    ),
+    SagemcomSensorEntityDescription(
+        key="cpu_usage",
+        name="CPU usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.values.get("cpu_usage"),
+    ),
+    SagemcomSensorEntityDescription(
+        key="memory_usage",
+        name="Memory usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.memory_usage,
+    ),
+    SagemcomSensorEntityDescription(
+        key="wan_download_rate",
+        name="WAN download rate",
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_rate("wan_download_rate"),
+    ),
+    SagemcomSensorEntityDescription(
+        key="wan_upload_rate",
+        name="WAN upload rate",
+        device_class=SensorDeviceClass.DATA_RATE,
+        native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_rate("wan_upload_rate"),
+    ),
+    SagemcomSensorEntityDescription(
+        key="wan_bytes_received",
+        name="WAN received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.values.get("wan_bytes_received"),
+    ),
+    SagemcomSensorEntityDescription(
+        key="wan_bytes_sent",
+        name="WAN sent",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.values.get("wan_bytes_sent"),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SagemcomMetricSensorEntityDescription(SensorEntityDescription):
+    """Class describing Sagemcom F@st request metric sensor entities."""
+
+    value_fn: Callable[[RequestMetrics], StateType]
+    attributes_fn: Callable[[RequestMetrics], dict[str, Any]] | None = None
+
+
+def _round(value: float | None) -> float | None:
+    """Return a duration rounded to a tenth of a millisecond."""
+    return None if value is None else round(value, 1)
+
+
+def _phase_description(
+    phase: str, name: str, enabled: bool = False
+) -> SagemcomMetricSensorEntityDescription:
+    """Return the description of the median duration of a request phase."""
+    return SagemcomMetricSensorEntityDescription(
+        key=f"{phase}_duration",
+        name=f"{name} duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=enabled,
+        value_fn=lambda metrics: _round(metrics.phase(phase).percentile(50)),
+        attributes_fn=lambda metrics: {
+            "p95": _round(metrics.phase(phase).percentile(95)),
+            "max": _round(max(metrics.phase(phase).durations, default=None)),
+            "last": _round(metrics.phase(phase).last),
+        },
+    )
+
+
+METRIC_SENSOR_DESCRIPTIONS: tuple[SagemcomMetricSensorEntityDescription, ...] = (
+    _phase_description("poll", "Poll", enabled=True),
+    _phase_description("login", "Login"),
+    _phase_description("logout", "Logout"),
+    _phase_description("hosts", "Host list"),
+    _phase_description("presence", "Presence scan"),
+    _phase_description("stats", "Statistics"),
+    _phase_description("fan_out", "Entity update"),
+    SagemcomMetricSensorEntityDescription(
+        key="host_list_size",
+        name="Host list size",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: next(reversed(metrics.phase("hosts").sizes), None),
+    ),
+    SagemcomMetricSensorEntityDescription(
+        key="request_retries",
+        name="Request retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.retries,
+    ),
+    SagemcomMetricSensorEntityDescription(
+        key="poll_errors",
+        name="Poll errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda metrics: metrics.errors,
+        attributes_fn=lambda metrics: dict(metrics.phase("poll").errors),
+    ),
+)
+
+
+def _interface_descriptions(
+    alias: str,
+) -> tuple[SagemcomSensorEntityDescription, ...]:
+    """Return the byte counter descriptions of a network interface."""
+    return tuple(
+        SagemcomSensorEntityDescription(
+            key=f"{alias}_{counter}",
+            name=f"{alias} {label}",
+            device_class=SensorDeviceClass.DATA_SIZE,
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_registry_enabled_default=False,
+            value_fn=lambda stats, counter=counter: stats.interfaces.get(alias, {}).get(
+                counter
+            ),
+        )
+        for counter, label in (("bytes_received", "received"), ("bytes_sent", "sent"))
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Sagemcom F@st sensors from a config entry."""
+    data: HomeAssistantSagemcomFastData = hass.data[DOMAIN][entry.entry_id]
+    serial_number = data.gateway.serial_number
+    tracked_interfaces: set[str] = set()
+
+    async_add_entities(
+        SagemcomSensor(data.coordinator, serial_number, description)
+        for description in SENSOR_DESCRIPTIONS
+    )
+    async_add_entities(
+        SagemcomMetricSensor(data.coordinator, serial_number, description)
+        for description in METRIC_SENSOR_DESCRIPTIONS
+    )
+
+    @callback
+    def async_add_interfaces() -> None:
+        """Add sensors for network interfaces that were not seen before."""
+        new_interfaces = (
+            data.coordinator.gateway_stats.interfaces.keys() - tracked_interfaces
+        )
+        if not new_interfaces:
+            return
+
+        tracked_interfaces.update(new_interfaces)
+        async_add_entities(
+            SagemcomSensor(data.coordinator, serial_number, description)
+            for alias in new_interfaces
+            for description in _interface_descriptions(alias)
+        )
+
+    entry.async_on_unload(data.coordinator.async_add_listener(async_add_interfaces))
+    async_add_interfaces()
+
+
+class SagemcomSensor(CoordinatorEntity[SagemcomDataUpdateCoordinator], SensorEntity):
+    """Representation of a Sagemcom F@st sensor."""
+
+    _attr_has_entity_name = True
+    entity_description: SagemcomSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SagemcomDataUpdateCoordinator,
+        serial_number: str,
+        description: SagemcomSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{serial_number}_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, serial_number)})
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state when the statistics were refreshed."""
+        if self.coordinator.changes is None or self.coordinator.gateway_stats.updated:
+            super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.gateway_stats)
+
+
+class SagemcomMetricSensor(
+    CoordinatorEntity[SagemcomDataUpdateCoordinator], SensorEntity
+):
+    """Representation of a Sagemcom F@st request metric sensor."""
+
+    _attr_has_entity_name = True
+    entity_description: SagemcomMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SagemcomDataUpdateCoordinator,
+        serial_number: str,
+        description: SagemcomMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{serial_number}_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, serial_number)})
+
+    @property
+    def available(self) -> bool:
+        """Return True, metrics are also meaningful when polling fails."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the distribution of the metric."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.metrics)
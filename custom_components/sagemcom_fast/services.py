@@ -0,0 +1,169 @@
+"""Services of the Sagemcom F@st integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_TIMEOUT
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_MAC_ADDRESS,
+    DEFAULT_SERVICE_TIMEOUT,
+    DOMAIN,
+    LOGGER,
+    SERVICE_GET_CONNECTION_HISTORY,
+    SERVICE_MAX_CONCURRENCY,
+    SERVICE_REBOOT,
+    SERVICE_REFRESH,
+)
+
+if TYPE_CHECKING:
+    from . import HomeAssistantSagemcomFastData
+
+GET_CONNECTION_HISTORY_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_MAC_ADDRESS): vol.All(cv.string, vol.Upper)}
+)
+
+# Without config entries, the service targets all gateways
+GATEWAYS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_TIMEOUT, default=DEFAULT_SERVICE_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services, once for all config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_CONNECTION_HISTORY):
+        return
+
+    async def async_get_connection_history(call: ServiceCall) -> ServiceResponse:
+        """Return the connection history of a host, without the recorder."""
+        mac_address = call.data[ATTR_MAC_ADDRESS]
+
+        for entry_id, data in hass.data.get(DOMAIN, {}).items():
+            history = data.coordinator.history
+            if mac_address in history:
+                return {
+                    ATTR_CONFIG_ENTRY_ID: entry_id,
+                    ATTR_MAC_ADDRESS: mac_address,
+                    **history.summary(mac_address),
+                    "events": history.events(mac_address),
+                }
+
+        raise ServiceValidationError(f"No connection history for {mac_address}")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CONNECTION_HISTORY,
+        async_get_connection_history,
+        schema=GET_CONNECTION_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_reboot(call: ServiceCall) -> ServiceResponse:
+        """Reboot gateways, a few at a time."""
+        return await _async_run_on_gateways(hass, call, SERVICE_REBOOT, _async_reboot)
+
+    async def async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Refresh the hosts of gateways, a few at a time."""
+        return await _async_run_on_gateways(hass, call, SERVICE_REFRESH, _async_refresh)
+
+    for service, handler in (
+        (SERVICE_REBOOT, async_reboot),
+        (SERVICE_REFRESH, async_refresh),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=GATEWAYS_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+
+async def _async_run_on_gateways(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    service: str,
+    action: Callable[[HomeAssistantSagemcomFastData], Awaitable[dict[str, Any]]],
+) -> ServiceResponse:
+    """Run an action on the targeted gateways and return the result of each."""
+    loaded: dict[str, HomeAssistantSagemcomFastData] = hass.data.get(DOMAIN, {})
+    entry_ids = call.data.get(ATTR_CONFIG_ENTRY_ID, list(loaded))
+    if unknown := [entry_id for entry_id in entry_ids if entry_id not in loaded]:
+        raise ServiceValidationError(f"Config entries not loaded: {', '.join(unknown)}")
+
+    timeout = call.data[CONF_TIMEOUT]
+    semaphore = asyncio.Semaphore(SERVICE_MAX_CONCURRENCY)
+    done = 0
+
+    async def _async_run(data: HomeAssistantSagemcomFastData) -> dict[str, Any]:
+        """Run the action on a gateway, turning errors into its result."""
+        nonlocal done
+        async with semaphore:
+            started = time.monotonic()
+            result: dict[str, Any] = {"host": data.coordinator.client.host}
+            try:
+                async with asyncio.timeout(timeout):
+                    result.update(await action(data))
+            except TimeoutError:
+                result.update(success=False, error=f"Timed out after {timeout:g}s")
+            except Exception as exception:  # pylint: disable=broad-except
+                result.update(success=False, error=repr(exception))
+            result["duration"] = round(time.monotonic() - started, 3)
+
+        done += 1
+        LOGGER.info("%s: %s of %s gateways done", service, done, len(entry_ids))
+        return result
+
+    results = await asyncio.gather(
+        *(_async_run(loaded[entry_id]) for entry_id in entry_ids)
+    )
+    succeeded = sum(result["success"] for result in results)
+
+    return {
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": dict(zip(entry_ids, results)),
+    }
+
+
+async def _async_reboot(data: HomeAssistantSagemcomFastData) -> dict[str, Any]:
+    """Reboot a gateway once the requests in flight are done."""
+    broker = data.coordinator.broker
+    await broker.async_write(broker.client.reboot, ends_session=True)
+
+    return {"success": True}
+
+
+async def _async_refresh(data: HomeAssistantSagemcomFastData) -> dict[str, Any]:
+    """Poll a gateway now, sharing the session of the coordinator."""
+    coordinator = data.coordinator
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        return {"success": False, "error": str(coordinator.last_exception)}
+
+    return {
+        "success": True,
+        "hosts": len(coordinator.hosts),
+        "active_hosts": len(coordinator.hosts.active),
+    }
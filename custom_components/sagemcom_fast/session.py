@@ -0,0 +1,159 @@
+"""Shared session of a Sagemcom F@st gateway."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import nullcontext
+import itertools
+import logging
+import time
+from typing import TYPE_CHECKING, TypeVar
+
+from sagemcom_api.exceptions import UnauthorizedException
+
+from .const import SESSION_RENEW_INTERVAL
+from .instrumentation import RequestMetrics
+
+if TYPE_CHECKING:
+    from sagemcom_api.client import SagemcomClient
+
+    from .scheduler import PollScheduler
+
+_T = TypeVar("_T")
+
+
+class SessionBroker:
+    """Serialize the session lifecycle of a gateway between all its users.
+
+    Reads run concurrently within one shared session, which is closed once
+    the last reader is done unless the session is kept. Writes are queued,
+    wait for running reads to finish and hold off new reads meanwhile. Each
+    request, including its login, holds a slot of the scheduler.
+    """
+
+    def __init__(
+        self,
+        client: SagemcomClient,
+        logger: logging.Logger,
+        metrics: RequestMetrics,
+        keep_session: bool = False,
+        scheduler: PollScheduler | None = None,
+    ) -> None:
+        """Initialize the broker."""
+        self.client = client
+        self.scheduler = scheduler
+        self.logger = logger
+        self.metrics = metrics
+        self.keep_session = keep_session
+        self._session: int | None = None
+        self._session_ids = itertools.count(1)
+        self._session_started = 0.0
+        self._session_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._users = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def async_read(self, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a read request, sharing the session with other reads."""
+        # Queued writes go first
+        async with self._write_lock:
+            self._acquire()
+        try:
+            return await self._async_run(request)
+        finally:
+            await self._async_release()
+
+    async def async_write(
+        self, request: Callable[[], Awaitable[_T]], ends_session: bool = False
+    ) -> _T:
+        """Run a write request on its own, after the running reads."""
+        async with self._write_lock:
+            await self._idle.wait()
+            self._acquire()
+            try:
+                return await self._async_run(request)
+            finally:
+                if ends_session:
+                    # The gateway drops the session by itself, e.g. on reboot
+                    self._session = None
+                await self._async_release()
+
+    async def async_close_session(self) -> None:
+        """Logout of the session, unless it is in use."""
+        async with self._session_lock:
+            if not self._users:
+                await self._async_logout()
+
+    def _acquire(self) -> None:
+        """Register a user of the session."""
+        self._users += 1
+        self._idle.clear()
+
+    async def _async_release(self) -> None:
+        """Unregister a user, closing the session after the last one."""
+        self._users -= 1
+        if self._users:
+            return
+
+        if not self.keep_session:
+            async with self._session_lock:
+                if not self._users:
+                    await self._async_logout()
+
+        if not self._users:
+            self._idle.set()
+
+    async def _async_run(self, request: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a request within the session, logging in again once if it expired."""
+        slot = (
+            self.scheduler.async_slot(self.client.host)
+            if self.scheduler
+            else nullcontext()
+        )
+
+        async with slot:
+            session = await self._async_ensure_session()
+            try:
+                return await request()
+            except UnauthorizedException:
+                self.logger.debug(
+                    "Session for %s expired, logging in", self.client.host
+                )
+                self.metrics.record_retry()
+                await self._async_ensure_session(expired=session)
+                return await request()
+
+    async def _async_ensure_session(self, expired: int | None = None) -> int:
+        """Return the current session, logging in when there is no valid one."""
+        async with self._session_lock:
+            if self._session is not None and self._session != expired:
+                # Only renew a kept session when nobody else is using it
+                if (
+                    self._users > 1
+                    or time.monotonic() - self._session_started < SESSION_RENEW_INTERVAL
+                ):
+                    return self._session
+
+            await self._async_logout()
+            with self.metrics.measure("login"):
+                await self.client.login()
+            with self.metrics.measure("sleep"):
+                await asyncio.sleep(1)
+            self._session = next(self._session_ids)
+            self._session_started = time.monotonic()
+
+            return self._session
+
+    async def _async_logout(self) -> None:
+        """Logout of the session, if there is one."""
+        if self._session is None:
+            return
+
+        self._session = None
+        try:
+            with self.metrics.measure("logout"):
+                await self.client.logout()
+        except Exception as exception:  # pylint: disable=broad-except
+            self.logger.debug("Failed to logout: %s", exception)
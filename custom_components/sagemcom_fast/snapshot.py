@@ -0,0 +1,70 @@
+"""Persisted snapshot of a Sagemcom F@st gateway and its hosts."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from sagemcom_api.models import Device, DeviceInfo as GatewayDeviceInfo
+
+from .const import DOMAIN, LOGGER, SNAPSHOT_SAVE_DELAY, STORAGE_VERSION
+from .host_table import HostTable
+
+
+class HostSnapshot:
+    """Last known gateway info and host table, used to warm start an entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot store of a config entry."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._save_pending = False
+
+    async def async_load(
+        self,
+    ) -> tuple[GatewayDeviceInfo | None, list[tuple[Device, float]]]:
+        """Return the stored gateway info and hosts with their last seen time.
+
+        Hosts are restored as not home until the first poll. A snapshot that
+        no longer matches the models, e.g. after an update of the client, is
+        discarded for a cold start.
+        """
+        if not (data := await self._store.async_load()) or not data.get("gateway"):
+            return None, []
+
+        try:
+            return GatewayDeviceInfo(**data["gateway"]), [
+                (Device(**{**host["device"], "active": False}), host["last_seen"])
+                for host in data["hosts"]
+            ]
+        except (TypeError, KeyError, ValueError) as exception:
+            LOGGER.warning("Discarding invalid snapshot: %s", exception)
+            return None, []
+
+    @callback
+    def async_schedule_save(self, gateway: GatewayDeviceInfo, hosts: HostTable) -> None:
+        """Save the snapshot after a delay, unless a save is already scheduled."""
+        if self._save_pending:
+            return
+
+        self._save_pending = True
+
+        @callback
+        def _data() -> dict[str, Any]:
+            self._save_pending = False
+            return {
+                "gateway": asdict(gateway),
+                "hosts": [
+                    {"device": asdict(host), "last_seen": hosts.last_seen(idx)}
+                    for idx, host in hosts.items()
+                ],
+            }
+
+        self._store.async_delay_save(_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Fake Sagemcom F@st gateway, serving the JSON-req API used by the integration.
+
+Point a config entry at the address this listens on to develop or profile the
+integration without a real gateway, e.g. with hundreds of hosts, a slow
+gateway, a low session limit or random failures.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import re
+import time
+from typing import Any
+from urllib.parse import unquote
+
+from aiohttp import web
+
+INTERFACE_TYPES = ("WiFi", "Ethernet")
+HOST_XPATH = re.compile(r"Device/Hosts/Hosts/Host\[PhysAddress='([^']*)'\]")
+
+
+class FakeGateway:
+    """In-memory state of the fake gateway."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize the gateway with generated hosts."""
+        self.args = args
+        self.sessions: dict[int, float] = {}
+        self.session_ids = itertools.count(1)
+        self.started = time.monotonic()
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.requests = 0
+        self.logins = 0
+        self.flips = 0
+        self.hosts = [self.new_host(index) for index in range(args.hosts)]
+        self.by_address = {host["physAddress"]: host for host in self.hosts}
+
+    def new_host(self, index: int) -> dict[str, Any]:
+        """Return a generated host."""
+        return {
+            "uid": index + 1,
+            "physAddress": f"02:00:{index >> 24 & 255:02x}:{index >> 16 & 255:02x}:{index >> 8 & 255:02x}:{index & 255:02x}",
+            "IPAddress": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+            "hostName": f"host-{index}",
+            "userHostName": "",
+            "userFriendlyName": "",
+            "interfaceType": INTERFACE_TYPES[index % len(INTERFACE_TYPES)],
+            "active": random.random() < self.args.active,
+        }
+
+    def join(self) -> None:
+        """Add the hosts that joined since the gateway started."""
+        if not self.args.join_interval:
+            return
+        joined = int((time.monotonic() - self.started) / self.args.join_interval)
+        while len(self.hosts) < self.args.hosts + joined:
+            self.hosts.append(self.new_host(len(self.hosts)))
+            self.hosts[-1]["active"] = True
+            self.by_address[self.hosts[-1]["physAddress"]] = self.hosts[-1]
+
+    def flip(self) -> None:
+        """Make a host leave, then rejoin one interval later, and so on."""
+        if not self.args.flip_interval:
+            return
+        flips = int((time.monotonic() - self.started) / self.args.flip_interval)
+        while self.flips < flips:
+            host = self.hosts[self.flips // 2 % len(self.hosts)]
+            host["active"] = not host["active"]
+            self.flips += 1
+
+    def churn(self) -> None:
+        """Flip the presence of a fraction of the hosts."""
+        for host in random.sample(self.hosts, int(len(self.hosts) * self.args.churn)):
+            host["active"] = not host["active"]
+
+    def expire_sessions(self) -> None:
+        """Drop sessions that have been idle for too long."""
+        now = time.monotonic()
+        for session_id, last_used in list(self.sessions.items()):
+            if now - last_used > self.args.session_timeout:
+                del self.sessions[session_id]
+
+    def get_value(self, xpath: str) -> Any:
+        """Return the value at the given XPath, or None for an unknown path."""
+        uptime = int(time.monotonic() - self.started)
+        self.bytes_received += random.randint(0, 5_000_000)
+        self.bytes_sent += random.randint(0, 500_000)
+
+        self.join()
+        self.flip()
+        if xpath == "Device/Hosts/Hosts":
+            self.churn()
+            return self.hosts
+        if xpath == "Device/Hosts/Hosts/*/PhysAddress":
+            return [host["physAddress"] for host in self.hosts]
+        if xpath == "Device/Hosts/Hosts/*/Active":
+            return [host["active"] for host in self.hosts]
+        if xpath == "Device/Hosts/HostNumberOfEntries":
+            return len(self.hosts)
+        if match := HOST_XPATH.fullmatch(xpath):
+            return self.by_address.get(match[1])
+
+        device_info = {
+            "MACAddress": "02:00:00:ff:ff:ff",
+            "SerialNumber": "FAKE0000001",
+            "Manufacturer": "Sagemcom",
+            "ModelName": "F@st 0000",
+            "ModelNumber": "0000",
+            "SoftwareVersion": "0.0.0",
+            "UpTime": uptime,
+            "ProcessStatus": {"CPUUsage": random.randint(0, 100)},
+            "MemoryStatus": {"Total": 512_000, "Free": random.randint(0, 512_000)},
+        }
+        values = {
+            "Device/DeviceInfo": {"DeviceInfo": device_info},
+            "Device/DeviceInfo/UpTime": uptime,
+            "Device/DeviceInfo/ProcessStatus/CPUUsage": device_info["ProcessStatus"][
+                "CPUUsage"
+            ],
+            "Device/DeviceInfo/MemoryStatus/Total": device_info["MemoryStatus"][
+                "Total"
+            ],
+            "Device/DeviceInfo/MemoryStatus/Free": device_info["MemoryStatus"]["Free"],
+            "Device/IP/Interfaces/Interface[Alias='IP_DATA']/Stats/BytesReceived": self.bytes_received,
+            "Device/IP/Interfaces/Interface[Alias='IP_DATA']/Stats/BytesSent": self.bytes_sent,
+            "Device/Ethernet/Interfaces": [
+                {
+                    "uid": index,
+                    "alias": f"ETH{index}",
+                    "stats": {
+                        "bytesReceived": self.bytes_received // (index + 1),
+                        "bytesSent": self.bytes_sent // (index + 1),
+                    },
+                }
+                for index in range(4)
+            ],
+        }
+
+        return values.get(xpath)
+
+
+def _action_reply(
+    action: dict[str, Any], parameters: dict[str, Any] | None, error: str
+) -> dict[str, Any]:
+    """Return the reply to a single action."""
+    return {
+        "id": action.get("id", 0),
+        "error": {"description": error},
+        "callbacks": [{"parameters": parameters or {}}],
+    }
+
+
+async def handle_request(request: web.Request) -> web.Response:
+    """Handle a JSON-req call."""
+    gateway: FakeGateway = request.app["gateway"]
+    args = gateway.args
+    gateway.requests += 1
+
+    if args.latency:
+        await asyncio.sleep(random.uniform(args.latency / 2, args.latency * 1.5))
+
+    if random.random() < args.error_rate:
+        return web.Response(status=500, text="Injected failure")
+
+    form = await request.post()
+    payload = json.loads(form["req"])["request"]
+    session_id = int(payload.get("session-id", 0))
+    gateway.expire_sessions()
+
+    actions = []
+    request_error = "XMO_REQUEST_NO_ERR"
+
+    for action in payload["actions"]:
+        method = action.get("method")
+
+        if method == "logIn":
+            if len(gateway.sessions) >= args.max_sessions:
+                actions.append(_action_reply(action, None, "XMO_MAX_SESSION_COUNT_ERR"))
+                request_error = "XMO_REQUEST_ACTION_ERR"
+                continue
+            gateway.logins += 1
+            new_session = next(gateway.session_ids)
+            gateway.sessions[new_session] = time.monotonic()
+            actions.append(
+                _action_reply(
+                    action,
+                    {"id": new_session, "nonce": str(random.randrange(1 << 31))},
+                    "XMO_NO_ERR",
+                )
+            )
+            continue
+
+        if session_id not in gateway.sessions:
+            return web.json_response(
+                {"reply": {"error": {"description": "XMO_INVALID_SESSION_ERR"}}}
+            )
+        gateway.sessions[session_id] = time.monotonic()
+
+        if method == "logOut":
+            gateway.sessions.pop(session_id, None)
+            actions.append(_action_reply(action, None, "XMO_NO_ERR"))
+        elif method == "getValue":
+            value = gateway.get_value(unquote(action["xpath"]))
+            if value is None:
+                actions.append(_action_reply(action, None, "XMO_UNKNOWN_PATH_ERR"))
+                request_error = "XMO_REQUEST_ACTION_ERR"
+            else:
+                actions.append(_action_reply(action, {"value": value}, "XMO_NO_ERR"))
+        elif method == "reboot":
+            gateway.sessions.clear()
+            actions.append(_action_reply(action, {"value": True}, "XMO_NO_ERR"))
+        else:
+            actions.append(_action_reply(action, None, "XMO_UNKNOWN_PATH_ERR"))
+            request_error = "XMO_REQUEST_ACTION_ERR"
+
+    return web.json_response(
+        {"reply": {"error": {"description": request_error}, "actions": actions}}
+    )
+
+
+async def handle_stats(request: web.Request) -> web.Response:
+    """Return the request and session counters, e.g. for benchmarks."""
+    gateway: FakeGateway = request.app["gateway"]
+    gateway.expire_sessions()
+
+    return web.json_response(
+        {
+            "requests": gateway.requests,
+            "logins": gateway.logins,
+            "sessions": len(gateway.sessions),
+        }
+    )
+
+
+def main() -> None:
+    """Run the fake gateway."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--hosts", type=int, default=250, help="number of hosts")
+    parser.add_argument(
+        "--active", type=float, default=0.5, help="fraction of active hosts"
+    )
+    parser.add_argument(
+        "--churn",
+        type=float,
+        default=0.01,
+        help="fraction of hosts that flip presence on every host list request",
+    )
+    parser.add_argument(
+        "--join-interval",
+        type=float,
+        default=0.0,
+        help="seconds between new hosts joining, 0 for none",
+    )
+    parser.add_argument(
+        "--flip-interval",
+        type=float,
+        default=0.0,
+        help="seconds between a known host leaving or rejoining, 0 for none",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mean response time in seconds"
+    )
+    parser.add_argument("--max-sessions", type=int, default=4)
+    parser.add_argument(
+        "--session-timeout", type=float, default=300, help="idle session lifetime"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="fraction of requests answered with an HTTP 500",
+    )
+    parser.add_argument("--seed", type=int, help="seed of the generated hosts")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    random.seed(args.seed)
+
+    app = web.Application()
+    app["gateway"] = FakeGateway(args)
+    app.router.add_post("/cgi/json-req", handle_request)
+    app.router.add_get("/stats", handle_stats)
+
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
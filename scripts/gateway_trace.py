@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Record the responses of a Sagemcom F@st gateway and replay them offline.
+
+`record` polls a real gateway and writes every value it returns, with its
+timestamp and response time, to a newline-delimited JSON file (gzipped when
+the name ends with .gz). `replay` feeds such a trace back through the
+SagemcomClient interface to the coordinator of the integration, optionally
+under cProfile or tracemalloc, so that real production traces can be profiled
+without access to the gateway.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from bisect import bisect_right
+import cProfile
+from collections import defaultdict
+from datetime import datetime, timezone
+import gzip
+import json
+import logging
+from pathlib import Path
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import IO, Any
+
+from aiohttp import ClientSession
+from sagemcom_api.client import SagemcomClient
+from sagemcom_api.enums import EncryptionMethod
+from sagemcom_api.exceptions import UnknownPathException
+
+TRACE_FORMAT = "sagemcom-trace"
+TRACE_VERSION = 1
+HOSTS_XPATH = "Device/Hosts/Hosts"
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    """Open a trace, compressed when its name ends with .gz."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def _key(xpath: str | None = None, xpaths: dict[str, str] | None = None) -> str:
+    """Return the key of a request, the same for both clients."""
+    return xpath if xpath is not None else json.dumps(xpaths, sort_keys=True)
+
+
+class RecordingClient(SagemcomClient):
+    """Sagemcom client writing every value it reads to a trace."""
+
+    def __init__(self, trace: IO[str], *args: Any, **kwargs: Any) -> None:
+        """Initialize the client, writing the trace header."""
+        super().__init__(*args, **kwargs)
+        self._trace = trace
+        self._started = time.monotonic()
+        self._write(
+            {
+                "format": TRACE_FORMAT,
+                "version": TRACE_VERSION,
+                "recorded": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+
+    def _write(self, record: dict[str, Any]) -> None:
+        """Append a record to the trace."""
+        self._trace.write(json.dumps(record, separators=(",", ":"), default=str))
+        self._trace.write("\n")
+
+    async def _record(self, request: dict[str, Any], coro) -> Any:
+        """Run a request and record its value or its unknown path error."""
+        started = time.monotonic()
+        record = {"t": round(started - self._started, 3), **request}
+        try:
+            value = await coro
+        except UnknownPathException:
+            record["error"] = "unknown_path"
+            raise
+        else:
+            record["value"] = value
+            return value
+        finally:
+            record["d"] = round(time.monotonic() - started, 3)
+            self._write(record)
+
+    async def get_value_by_xpath(self, xpath: str, options: dict | None = None):
+        """Retrieve and record the value of an XPath."""
+        return await self._record(
+            {"xpath": xpath}, super().get_value_by_xpath(xpath, options)
+        )
+
+    async def get_values_by_xpaths(self, xpaths, options: dict | None = None):
+        """Retrieve and record the values of several XPaths."""
+        return await self._record(
+            {"xpaths": xpaths}, super().get_values_by_xpaths(xpaths, options)
+        )
+
+
+class _Response:
+    """A recorded response."""
+
+    __slots__ = ("time", "duration", "value", "unknown_path")
+
+    def __init__(self, record: dict[str, Any]) -> None:
+        """Initialize the response from its record."""
+        self.time: float = record["t"]
+        self.duration: float = record.get("d", 0.0)
+        self.value = record.get("value")
+        self.unknown_path = record.get("error") == "unknown_path"
+
+
+class ReplayClient(SagemcomClient):
+    """Sagemcom client answering from a trace instead of a gateway.
+
+    With a speed of 0 each request gets the next recorded response for it,
+    without waiting. Otherwise the trace plays at that many times real time:
+    a request gets the last response recorded before the current trace time,
+    after its recorded response time.
+    """
+
+    def __init__(self, path: Path, speed: float = 0.0) -> None:
+        """Load the trace."""
+        super().__init__(
+            host="replay",
+            username="replay",
+            password="",
+            authentication_method=EncryptionMethod.MD5,
+        )
+        self.speed = speed
+        self.responses: dict[str, list[_Response]] = defaultdict(list)
+        self._times: dict[str, list[float]] = defaultdict(list)
+        self._next: dict[str, int] = defaultdict(int)
+        self._started: float | None = None
+
+        with _open(path, "r") as trace:
+            header = json.loads(trace.readline())
+            if header.get("format") != TRACE_FORMAT:
+                raise ValueError(f"{path} is not a gateway trace")
+            for line in trace:
+                record = json.loads(line)
+                key = _key(record.get("xpath"), record.get("xpaths"))
+                self.responses[key].append(_Response(record))
+                self._times[key].append(record["t"])
+
+    async def login(self):
+        """Start replaying, there is no session to open."""
+        if self._started is None:
+            self._started = time.monotonic()
+        return True
+
+    async def logout(self):
+        """Do nothing, there is no session to close."""
+        return True
+
+    async def _replay(self, key: str) -> Any:
+        """Return the recorded response to a request."""
+        if not (responses := self.responses.get(key)):
+            raise UnknownPathException(f"{key} not in the trace")
+
+        if not self.speed:
+            index = min(self._next[key], len(responses) - 1)
+            self._next[key] += 1
+            response = responses[index]
+        else:
+            await self.login()
+            now = (time.monotonic() - self._started) * self.speed
+            index = bisect_right(self._times[key], now) - 1
+            response = responses[max(0, index)]
+            await asyncio.sleep(response.duration / self.speed)
+
+        if response.unknown_path:
+            raise UnknownPathException(f"{key} unknown when recorded")
+        return response.value
+
+    async def get_value_by_xpath(self, xpath: str, options: dict | None = None):
+        """Return the recorded value of an XPath."""
+        return await self._replay(_key(xpath))
+
+    async def get_values_by_xpaths(self, xpaths, options: dict | None = None):
+        """Return the recorded values of several XPaths."""
+        return await self._replay(_key(xpaths=xpaths))
+
+
+async def async_record(args: argparse.Namespace) -> None:
+    """Poll a gateway and record its responses."""
+    async with ClientSession() as session:
+        with _open(args.output, "w") as trace:
+            client = RecordingClient(
+                trace,
+                host=args.host,
+                username=args.username,
+                password=args.password,
+                authentication_method=EncryptionMethod(args.encryption_method),
+                session=session,
+                ssl=args.ssl,
+            )
+            await client.login()
+            try:
+                await client.get_device_info()
+                for poll in range(args.polls):
+                    if poll:
+                        await asyncio.sleep(args.interval)
+                    hosts = await client.get_hosts()
+                    logging.info("Poll %s: %s hosts", poll + 1, len(hosts))
+            finally:
+                await client.logout()
+
+
+async def async_replay(args: argparse.Namespace) -> None:
+    """Run the coordinator of the integration on a trace."""
+    # pylint: disable=import-outside-toplevel
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.sagemcom_fast.coordinator import (
+        SagemcomDataUpdateCoordinator,
+    )
+
+    client = ReplayClient(args.trace, args.speed)
+    polls = [response.time for response in client.responses[HOSTS_XPATH]]
+    hass = HomeAssistant(args.config_dir)
+    coordinator = SagemcomDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name="replay",
+        client=client,
+        # A single login, so that the polls are not padded by its pause
+        keep_session=True,
+    )
+
+    def _update_entities() -> None:
+        """Stand in for the tracker entities, which read the hosts that changed."""
+        changes = coordinator.changes
+        for idx in coordinator.data:
+            if changes is None or idx in changes:
+                coordinator.data[idx].name  # pylint: disable=expression-not-assigned
+
+    coordinator.async_add_listener(_update_entities)
+
+    profiler = cProfile.Profile() if args.profile == "cprofile" else None
+    if args.profile == "tracemalloc":
+        tracemalloc.start(25)
+    started = time.monotonic()
+    try:
+        for poll_time in polls:
+            if args.speed:
+                await asyncio.sleep(
+                    max(0.0, started + poll_time / args.speed - time.monotonic())
+                )
+            if profiler:
+                profiler.enable()
+            await coordinator.async_refresh()
+            if profiler:
+                profiler.disable()
+    finally:
+        await client.close()
+        await hass.async_stop(force=True)
+
+    logging.info(
+        "Replayed %s polls of %s hosts in %.2fs",
+        len(polls),
+        len(coordinator.hosts),
+        time.monotonic() - started,
+    )
+    print(json.dumps(coordinator.metrics.as_dict(), indent=2))
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+    elif args.profile == "tracemalloc":
+        for stat in tracemalloc.take_snapshot().statistics("lineno")[: args.top]:
+            print(stat)
+
+
+def main() -> None:
+    """Record or replay a gateway trace."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="record the responses of a gateway")
+    record.add_argument("--host", required=True)
+    record.add_argument("--username", required=True)
+    record.add_argument("--password", default="")
+    record.add_argument(
+        "--encryption-method",
+        choices=[method.value for method in EncryptionMethod],
+        default=EncryptionMethod.MD5.value,
+    )
+    record.add_argument("--ssl", action="store_true")
+    record.add_argument("--polls", type=int, default=60, help="number of host polls")
+    record.add_argument(
+        "--interval", type=float, default=10, help="seconds between host polls"
+    )
+    record.add_argument("output", type=Path, help="trace file, .gz to compress")
+
+    replay = subparsers.add_parser("replay", help="run the coordinator on a trace")
+    replay.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="times real time, 0 to replay the polls back to back",
+    )
+    replay.add_argument("--profile", choices=["cprofile", "tracemalloc"])
+    replay.add_argument(
+        "--top", type=int, default=25, help="number of profile lines to print"
+    )
+    replay.add_argument(
+        "--config-dir", default=".", help="Home Assistant configuration directory"
+    )
+    replay.add_argument("trace", type=Path)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    asyncio.run(async_record(args) if args.command == "record" else async_replay(args))
+
+
+if __name__ == "__main__":
+    main()
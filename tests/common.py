@@ -0,0 +1,162 @@
+"""Helpers for the Sagemcom F@st tests."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from pathlib import Path
+import socket
+import statistics
+import sys
+import time
+from types import MappingProxyType
+from typing import Any
+
+from aiohttp import ClientSession
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+)
+from homeassistant.core import HomeAssistant
+
+from custom_components.sagemcom_fast import HomeAssistantSagemcomFastData
+from custom_components.sagemcom_fast.const import CONF_ENCRYPTION_METHOD, DOMAIN
+
+FAKE_GATEWAY = Path(__file__).parent.parent / "scripts" / "fake_gateway.py"
+
+# Arguments required by the pinned Home Assistant, absent from older releases
+_ENTRY_DEFAULTS = {
+    key: value
+    for key, value in {
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": (),
+    }.items()
+    if key in inspect.signature(ConfigEntry).parameters
+}
+
+
+def latency_summary(durations: list[float]) -> dict[str, float]:
+    """Return the rate and the p50/p99 latency in ms of timed cycles."""
+    return {
+        "polls_per_sec": len(durations) / sum(durations),
+        "p50_ms": statistics.median(durations) * 1000,
+        "p99_ms": statistics.quantiles(durations, n=100, method="inclusive")[98] * 1000,
+    }
+
+
+class FakeGateway:
+    """A fake gateway served by scripts/fake_gateway.py in a subprocess."""
+
+    def __init__(self, **options: Any) -> None:
+        """Initialize the gateway, with the options of its command line."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.host = f"127.0.0.1:{self.port}"
+        self.options = {"seed": 0, **options}
+        self._process: asyncio.subprocess.Process | None = None
+
+    async def async_start(self) -> None:
+        """Start the gateway and wait until it accepts connections."""
+        arguments = [str(FAKE_GATEWAY), "--port", str(self.port)]
+        for key, value in self.options.items():
+            arguments += [f"--{key.replace('_', '-')}", str(value)]
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            *arguments,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        async with asyncio.timeout(10):
+            while True:
+                try:
+                    _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                except OSError:
+                    assert self._process.returncode is None, "Fake gateway failed"
+                    await asyncio.sleep(0.05)
+                    continue
+                writer.close()
+                await writer.wait_closed()
+                return
+
+    async def async_stats(self) -> dict[str, int]:
+        """Return the request and session counters of the gateway."""
+        async with ClientSession() as session:
+            async with session.get(f"http://{self.host}/stats") as response:
+                return await response.json()
+
+    async def async_stop(self) -> None:
+        """Stop the gateway."""
+        if self._process and self._process.returncode is None:
+            self._process.terminate()
+            await self._process.wait()
+
+
+def create_entry(host: str, **options: Any) -> ConfigEntry:
+    """Return a config entry for a gateway, polled only when the test says so."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=host,
+        data={
+            CONF_HOST: host,
+            CONF_USERNAME: "admin",
+            CONF_PASSWORD: "",
+            CONF_ENCRYPTION_METHOD: "MD5",
+            CONF_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        source=SOURCE_USER,
+        unique_id=host,
+        options={CONF_SCAN_INTERVAL: 3600, **options},
+        **_ENTRY_DEFAULTS,
+    )
+
+
+async def async_setup_gateway(
+    hass: HomeAssistant, host: str, **options: Any
+) -> HomeAssistantSagemcomFastData:
+    """Set up a config entry for a gateway and return its data, once probed."""
+    entry = create_entry(host, **options)
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    data = hass.data[DOMAIN][entry.entry_id]
+    # The capabilities are probed in the background after the first refresh
+    while data.coordinator.probe_pending:
+        await asyncio.sleep(0.01)
+
+    return data
+
+
+async def async_time_polls(
+    hass: HomeAssistant, data: HomeAssistantSagemcomFastData, polls: int
+) -> list[float]:
+    """Poll the gateway and update the entities, returning how long each took."""
+    durations = []
+    for _ in range(polls):
+        started = time.perf_counter()
+        await data.coordinator.async_refresh()
+        await hass.async_block_till_done()
+        durations.append(time.perf_counter() - started)
+        assert data.coordinator.last_update_success
+
+    return durations
+
+
+async def async_wait_for_entities(
+    hass: HomeAssistant, domain: str, count: int, timeout: float = 30
+) -> None:
+    """Wait for entities added in the background, e.g. in chunks."""
+    deadline = time.monotonic() + timeout
+    while len(hass.states.async_entity_ids(domain)) < count:
+        assert time.monotonic() < deadline, "Entities not added in time"
+        await hass.async_block_till_done()
+        await asyncio.sleep(0.01)
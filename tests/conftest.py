@@ -0,0 +1,96 @@
+"""Fixtures for the Sagemcom F@st tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import pytest
+
+from .common import FakeGateway
+
+BENCHMARKS = pytest.StashKey[list[tuple[str, dict[str, Any]]]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options of the tests."""
+    parser.addoption(
+        "--update-import-baseline",
+        action="store_true",
+        help="record the modules the integration imports as baseline",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Collect the benchmark results of the session."""
+    config.stash[BENCHMARKS] = []
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """Print the benchmark results after the tests."""
+    if not (results := config.stash.get(BENCHMARKS, [])):
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, values in results:
+        terminalreporter.write_line(
+            f"{name}: "
+            + ", ".join(
+                f"{key} {value:.2f}" if isinstance(value, float) else f"{key} {value}"
+                for key, value in values.items()
+            )
+        )
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Callable[..., None]:
+    """Return how to report a benchmark result in the test summary."""
+
+    def record(name: str, **values: Any) -> None:
+        """Report the values measured by a benchmark."""
+        request.config.stash[BENCHMARKS].append((name, values))
+
+    return record
+
+
+@pytest.fixture
+async def fake_gateway() -> AsyncGenerator[Callable[..., Awaitable[FakeGateway]], None]:
+    """Return how to start fake gateways, stopped after the test.
+
+    Options are the command line options of scripts/fake_gateway.py.
+    """
+    gateways: list[FakeGateway] = []
+
+    async def async_start(**options: Any) -> FakeGateway:
+        """Start a fake gateway."""
+        gateways.append(gateway := FakeGateway(**options))
+        await gateway.async_start()
+        return gateway
+
+    yield async_start
+
+    for gateway in gateways:
+        await gateway.async_stop()
+
+
+@pytest.fixture
+async def hass(tmp_path: Path) -> AsyncGenerator[HomeAssistant, None]:
+    """Return a running Home Assistant with its base functionality loaded."""
+    hass = HomeAssistant(str(tmp_path))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await bootstrap.async_load_base_functionality(hass)
+    await async_setup_component(hass, "homeassistant", {})
+
+    yield hass
+
+    await hass.async_stop(force=True)
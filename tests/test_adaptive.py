@@ -0,0 +1,93 @@
+"""Tests of the adaptive scan interval."""
+
+from __future__ import annotations
+
+from custom_components.sagemcom_fast.adaptive import AdaptiveInterval
+from custom_components.sagemcom_fast.const import (
+    ADAPTIVE_ERROR_STREAK,
+    ADAPTIVE_MAX_FACTOR,
+    ADAPTIVE_MIN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+)
+
+HOSTS = 100
+
+
+def _interval() -> AdaptiveInterval:
+    """Return an adaptive interval around the default scan interval."""
+    return AdaptiveInterval(
+        DEFAULT_SCAN_INTERVAL,
+        ADAPTIVE_MIN_INTERVAL,
+        DEFAULT_SCAN_INTERVAL * ADAPTIVE_MAX_FACTOR,
+    )
+
+
+def _steady(interval: AdaptiveInterval, changed: int) -> None:
+    """Record a poll with some changed hosts."""
+    interval.record(0.1, changed, HOSTS)
+
+
+def test_single_failure_keeps_interval() -> None:
+    """Back off only after several failed polls in a row."""
+    interval = _interval()
+    _steady(interval, 1)
+    before = interval.interval
+
+    assert interval.record(None, None, HOSTS) == before
+    _steady(interval, 1)
+    before = interval.interval
+    for _ in range(ADAPTIVE_ERROR_STREAK - 1):
+        assert interval.record(None, None, HOSTS) == before
+
+    assert interval.record(None, None, HOSTS) == DEFAULT_SCAN_INTERVAL * 2
+    assert interval.record(None, None, HOSTS) == DEFAULT_SCAN_INTERVAL * 4
+    for _ in range(10):
+        interval.record(None, None, HOSTS)
+    assert interval.interval == DEFAULT_SCAN_INTERVAL * ADAPTIVE_MAX_FACTOR
+
+    # Recovers gradually once polls succeed again
+    _steady(interval, 1)
+    assert (
+        DEFAULT_SCAN_INTERVAL
+        < interval.interval
+        < (DEFAULT_SCAN_INTERVAL * ADAPTIVE_MAX_FACTOR)
+    )
+
+
+def test_speed_up_below_default() -> None:
+    """Poll faster than the default interval while hosts come and go."""
+    interval = _interval()
+    for _ in range(20):
+        _steady(interval, 20)
+
+    assert ADAPTIVE_MIN_INTERVAL < DEFAULT_SCAN_INTERVAL
+    assert ADAPTIVE_MIN_INTERVAL <= interval.interval < DEFAULT_SCAN_INTERVAL * 0.6
+    assert interval.reason.startswith("speeding up")
+
+
+def test_quiet_network_does_not_compound() -> None:
+    """Slow down toward twice the configured interval, never beyond."""
+    interval = _interval()
+    intervals = []
+    for _ in range(100):
+        _steady(interval, 0)
+        intervals.append(interval.interval)
+
+    assert intervals == sorted(intervals)
+    assert max(intervals) <= DEFAULT_SCAN_INTERVAL * 2
+    assert intervals[-1] > DEFAULT_SCAN_INTERVAL * 1.9
+
+    # Decays back toward the configured interval with moderate churn
+    for _ in range(20):
+        _steady(interval, 2)
+    assert abs(interval.interval - DEFAULT_SCAN_INTERVAL) < 0.1
+
+
+def test_slow_gateway_floor() -> None:
+    """Never poll more often than a few times the response time."""
+    interval = _interval()
+    for _ in range(20):
+        interval.record(4.0, 20, HOSTS)
+
+    assert interval.interval >= 16
+    assert interval.reason.startswith("backing off")
@@ -0,0 +1,126 @@
+"""End to end benchmark of the integration against the fake gateway."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+import pytest
+
+from custom_components.sagemcom_fast.const import (
+    CONF_FULL_SCAN_INTERVAL,
+    CONF_KEEP_SESSION,
+    DOMAIN,
+)
+
+from .common import (
+    async_setup_gateway,
+    async_time_polls,
+    async_wait_for_entities,
+    create_entry,
+    latency_summary,
+)
+
+TIMED_POLLS = 20
+STALL_INTERVAL = 0.005
+MAX_STALL = 0.05
+TRACED_POLLS = 5
+
+# Every poll reads all host details, or only presence between full scans
+TIERS = {
+    "full": {},
+    "presence": {CONF_SCAN_INTERVAL: 10, CONF_FULL_SCAN_INTERVAL: 3600},
+}
+
+
+@pytest.mark.parametrize("tier", TIERS)
+@pytest.mark.parametrize("hosts", [250, 1000])
+async def test_poll_benchmark(hass, fake_gateway, benchmark, hosts, tier) -> None:
+    """Poll a fake gateway with all entities set up, timing every cycle."""
+    gateway = await fake_gateway(hosts=hosts, churn=0.01)
+    data = await async_setup_gateway(
+        hass, gateway.host, **{CONF_KEEP_SESSION: True, **TIERS[tier]}
+    )
+    coordinator = data.coordinator
+    await async_wait_for_entities(hass, "device_tracker", len(coordinator.hosts))
+
+    durations = await async_time_polls(hass, data, TIMED_POLLS)
+
+    allocated = []
+    tracemalloc.start()
+    try:
+        for _ in range(TRACED_POLLS):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    # Hosts that joined meanwhile got their entity
+    await async_wait_for_entities(hass, "device_tracker", len(coordinator.hosts))
+    assert coordinator.last_update_success
+    # One login to read the gateway info at setup, then the kept session
+    assert (await gateway.async_stats())["logins"] == 2
+
+    benchmark(
+        f"poll {hosts} hosts, {tier}",
+        **latency_summary(durations),
+        peak_kib_per_poll=statistics.median(allocated) / 1024,
+    )
+
+
+@pytest.mark.parametrize("hosts", [100, 1000, 5000])
+async def test_setup_benchmark(hass, fake_gateway, benchmark, hosts) -> None:
+    """Time the setup of a large gateway and the event loop stalls it causes."""
+    gateway = await fake_gateway(hosts=hosts, churn=0)
+    entry = create_entry(gateway.host, **{CONF_KEEP_SESSION: True})
+    # When each timer ran and how late
+    stalls: list[tuple[float, float]] = []
+    handle: asyncio.TimerHandle | None = None
+
+    def measure_stall(scheduled: float) -> None:
+        """Record how late the event loop runs a timer, and schedule the next."""
+        nonlocal handle
+        now = time.perf_counter()
+        stalls.append((now, now - scheduled))
+        handle = hass.loop.call_later(
+            STALL_INTERVAL, measure_stall, time.perf_counter() + STALL_INTERVAL
+        )
+
+    # Collection pauses grow with the objects of the whole process, not with
+    # what the integration does in a single step
+    gc.disable()
+    measure_stall(time.perf_counter())
+    try:
+        started = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        set_up = time.perf_counter()
+        coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+        await async_wait_for_entities(
+            hass, "device_tracker", len(coordinator.hosts), timeout=120
+        )
+        entities = time.perf_counter() - started
+    finally:
+        handle.cancel()
+        gc.enable()
+
+    # The first refresh parses the whole host list in the client library at
+    # once, the entities are then added in the background
+    setup_stall = max(stall for at, stall in stalls if at <= set_up)
+    entities_stall = max((stall for at, stall in stalls if at > set_up), default=0.0)
+    benchmark(
+        f"setup {hosts} hosts",
+        setup_s=set_up - started,
+        entities_s=entities,
+        max_setup_stall_ms=setup_stall * 1000,
+        max_entities_stall_ms=entities_stall * 1000,
+    )
+    # Entities are added in small chunks, so adding them never blocks the
+    # loop for long, however many hosts there are
+    assert entities_stall < MAX_STALL
@@ -0,0 +1,68 @@
+"""Tests of the gateway capability probe."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+
+from custom_components.sagemcom_fast.capabilities import (
+    async_get_capability_store,
+    capabilities_key,
+)
+from custom_components.sagemcom_fast.const import (
+    DOMAIN,
+    GATEWAY_STATS_XPATHS,
+    PRESENCE_WATCH_XPATH,
+    PRESENCE_XPATHS,
+)
+
+from .common import async_setup_gateway
+
+
+async def test_probe_after_first_refresh(hass, fake_gateway, benchmark) -> None:
+    """Probe a new gateway model in a session of its own after the first refresh."""
+    gateway = await fake_gateway(hosts=10, churn=0)
+
+    started = time.perf_counter()
+    data = await async_setup_gateway(hass, gateway.host)
+    setup = time.perf_counter() - started
+
+    # One login each to read the gateway info, for the first refresh and the probe
+    assert (await gateway.async_stats())["logins"] == 3
+    capabilities = data.coordinator.capabilities
+    assert capabilities is not None
+    assert capabilities.supports(PRESENCE_WATCH_XPATH)
+    assert (
+        await async_get_capability_store(hass).async_get(capabilities_key(data.gateway))
+        == capabilities
+    )
+
+    benchmark("cold setup without a kept session", setup_s=setup)
+
+
+async def test_probe_slow_gateway(hass, fake_gateway) -> None:
+    """Set up a slow gateway in time, keeping what was probed before the timeout."""
+    gateway = await fake_gateway(hosts=10, churn=0, latency=2)
+
+    with patch(
+        "custom_components.sagemcom_fast.coordinator.CAPABILITY_PROBE_TIMEOUT", 10
+    ):
+        data = await async_setup_gateway(hass, gateway.host)
+
+    assert hass.config_entries.async_entries(DOMAIN)[0].state is ConfigEntryState.LOADED
+    assert data.coordinator.last_update_success
+    assert not data.coordinator.probe_pending
+
+    # Only a part of the XPaths was probed, and nothing was stored
+    probed = data.coordinator.capabilities.xpaths
+    assert (
+        0
+        < len(probed)
+        < len({*PRESENCE_XPATHS.values(), *GATEWAY_STATS_XPATHS.values()})
+    )
+    assert (
+        await async_get_capability_store(hass).async_get(capabilities_key(data.gateway))
+        is None
+    )
@@ -0,0 +1,114 @@
+"""Tests of the circuit breaker of the gateway requests."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from aiohttp import ClientError
+from sagemcom_api.exceptions import AuthenticationException, LoginRetryErrorException
+
+from custom_components.sagemcom_fast.circuit_breaker import CircuitBreaker, CircuitState
+from custom_components.sagemcom_fast.const import (
+    BREAKER_BASE_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_DELAY,
+)
+
+from .common import async_setup_gateway
+
+
+def _breaker() -> CircuitBreaker:
+    """Return a circuit breaker with the default thresholds."""
+    return CircuitBreaker(
+        BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_DELAY, BREAKER_MAX_DELAY
+    )
+
+
+def test_open_after_consecutive_failures() -> None:
+    """Open after the threshold of failures in a row, not before."""
+    breaker = _breaker()
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(0.0)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow(0.0)
+
+    # A success in between starts over
+    breaker.record_success()
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(0.0)
+    assert breaker.state is CircuitState.CLOSED
+
+    breaker.record_failure(0.0)
+    assert breaker.state is CircuitState.OPEN
+    assert BREAKER_BASE_DELAY / 2 <= breaker.retry_in(0.0) <= BREAKER_BASE_DELAY
+    assert not breaker.allow(1.0)
+
+
+def test_half_open_trial() -> None:
+    """Let a single trial through once the delay has passed."""
+    breaker = _breaker()
+    breaker.record_failure(0.0, trip=True)
+    assert breaker.state is CircuitState.OPEN
+
+    retry_at = breaker.retry_at
+    assert breaker.allow(retry_at)
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    # A failed trial opens again at once, for twice as long
+    breaker.record_failure(retry_at)
+    assert breaker.state is CircuitState.OPEN
+    assert BREAKER_BASE_DELAY <= breaker.retry_in(retry_at) <= BREAKER_BASE_DELAY * 2
+    assert breaker.trips == 2
+
+    # A successful trial closes the circuit and resets the delay
+    assert breaker.allow(breaker.retry_at)
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.as_dict(0.0) == {
+        "state": CircuitState.CLOSED,
+        "failures": 0,
+        "trips": 0,
+        "retry_in": 0.0,
+    }
+
+
+def test_delay_capped() -> None:
+    """Never wait longer than the maximum delay between trials."""
+    breaker = _breaker()
+    now = 0.0
+    for _ in range(20):
+        breaker.record_failure(now, trip=True)
+        assert breaker.retry_in(now) <= BREAKER_MAX_DELAY
+        now = breaker.retry_at
+        assert breaker.allow(now)
+
+    assert breaker.retry_in(now - BREAKER_MAX_DELAY / 2) > 0
+
+
+async def test_coordinator_counts_unreachable_only(hass, fake_gateway) -> None:
+    """Leave invalid credentials to reauthentication, open on connection errors."""
+    gateway = await fake_gateway(hosts=10, churn=0)
+    data = await async_setup_gateway(hass, gateway.host)
+    coordinator = data.coordinator
+
+    with patch.object(
+        coordinator.broker, "async_read", side_effect=AuthenticationException
+    ):
+        for _ in range(BREAKER_FAILURE_THRESHOLD + 1):
+            await coordinator.async_refresh()
+    assert coordinator.breaker.state is CircuitState.CLOSED
+    assert coordinator.breaker.failures == 0
+
+    with patch.object(coordinator.broker, "async_read", side_effect=ClientError):
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await coordinator.async_refresh()
+    assert coordinator.breaker.state is CircuitState.OPEN
+
+    # A lockout opens the circuit at once
+    coordinator.breaker.record_success()
+    with patch.object(
+        coordinator.broker, "async_read", side_effect=LoginRetryErrorException
+    ):
+        await coordinator.async_refresh()
+    assert coordinator.breaker.state is CircuitState.OPEN
+    assert not coordinator.last_update_success
@@ -0,0 +1,169 @@
+"""Tests of the config flow."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+)
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+from sagemcom_api.enums import EncryptionMethod
+from sagemcom_api.exceptions import (
+    AuthenticationException,
+    LoginRetryErrorException,
+    LoginTimeoutException,
+)
+
+from custom_components.sagemcom_fast.const import (
+    CONF_ENCRYPTION_METHOD,
+    DATA_ENCRYPTION_METHODS,
+    DOMAIN,
+)
+
+from .common import create_entry
+
+HOST = "192.168.1.1"
+
+USER_INPUT = {
+    CONF_HOST: HOST,
+    CONF_USERNAME: "admin",
+    CONF_PASSWORD: "secret",
+    CONF_SSL: False,
+    CONF_VERIFY_SSL: False,
+}
+
+
+class FakeClient:
+    """Client whose login succeeds or fails depending on its method."""
+
+    results: dict[EncryptionMethod, Exception | None] = {}
+    logins: list[EncryptionMethod] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, authentication_method: EncryptionMethod, **_: Any) -> None:
+        """Initialize the client with the method it logs in with."""
+        self.method = authentication_method
+
+    async def login(self) -> None:
+        """Log in, or raise the error of the method."""
+        cls = type(self)
+        cls.logins.append(self.method)
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            cls.in_flight -= 1
+        if error := cls.results.get(self.method, AuthenticationException()):
+            raise error
+
+    async def logout(self) -> None:
+        """Log out."""
+
+
+@pytest.fixture
+def client():
+    """Return the client class used by the config flow."""
+    FakeClient.results = {}
+    FakeClient.logins = []
+    FakeClient.max_in_flight = 0
+    with patch(
+        "custom_components.sagemcom_fast.config_flow.SagemcomClient", FakeClient
+    ):
+        yield FakeClient
+
+
+async def _async_user_flow(hass) -> dict[str, Any]:
+    """Run the user step with the credentials."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    with patch("custom_components.sagemcom_fast.async_setup_entry", return_value=True):
+        return await hass.config_entries.flow.async_configure(
+            result["flow_id"], dict(USER_INPUT)
+        )
+
+
+async def test_detect_one_method_at_a_time(hass, client) -> None:
+    """Try the methods one after the other until one works."""
+    client.results = {EncryptionMethod.SHA512: None}
+    result = await _async_user_flow(hass)
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_ENCRYPTION_METHOD] == EncryptionMethod.SHA512
+    assert client.logins[-1] == EncryptionMethod.SHA512
+    assert client.max_in_flight == 1
+
+
+async def test_detect_hinted_method_first(hass, client) -> None:
+    """Log in once with the method last detected for the host."""
+    hass.data[DATA_ENCRYPTION_METHODS] = {HOST: EncryptionMethod.SHA512}
+    client.results = {EncryptionMethod.SHA512: None}
+    result = await _async_user_flow(hass)
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert client.logins == [EncryptionMethod.SHA512]
+
+
+async def test_detect_lockout(hass, client) -> None:
+    """Stop at a lockout instead of trying the other methods."""
+    client.results = {
+        EncryptionMethod.MD5: LoginRetryErrorException(),
+        EncryptionMethod.SHA512: None,
+    }
+    result = await _async_user_flow(hass)
+
+    assert result["errors"] == {"base": "login_retry_error"}
+    assert client.logins == [EncryptionMethod.MD5]
+
+
+async def test_detect_keeps_hint_on_failure(hass, client) -> None:
+    """Keep the remembered method when the credentials are wrong."""
+    hass.data[DATA_ENCRYPTION_METHODS] = {HOST: EncryptionMethod.MD5}
+    client.results = {
+        method: (
+            LoginTimeoutException()
+            if method != EncryptionMethod.MD5
+            else AuthenticationException()
+        )
+        for method in EncryptionMethod
+    }
+    result = await _async_user_flow(hass)
+
+    assert result["errors"] == {"base": "invalid_auth"}
+    assert len(client.logins) == len(EncryptionMethod)
+    assert hass.data[DATA_ENCRYPTION_METHODS][HOST] == EncryptionMethod.MD5
+
+
+async def test_reconfigure(hass, client) -> None:
+    """Move a gateway to another host, logging in with its known method first."""
+    entry = create_entry(HOST)
+    hass.config_entries._entries[entry.entry_id] = entry  # noqa: SLF001
+    client.results = {EncryptionMethod(entry.data[CONF_ENCRYPTION_METHOD]): None}
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "reconfigure", "entry_id": entry.entry_id}
+    )
+    assert result["step_id"] == "reconfigure"
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {**USER_INPUT, CONF_HOST: "192.168.1.254"}
+        )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reconfigure_successful"
+    assert client.logins == [EncryptionMethod(entry.data[CONF_ENCRYPTION_METHOD])]
+    assert entry.unique_id == entry.title == entry.data[CONF_HOST] == "192.168.1.254"
+    assert entry.data[CONF_PASSWORD] == "secret"
+    reload.assert_called_once_with(entry.entry_id)
@@ -0,0 +1,56 @@
+"""Tests of the device tracker entities of the hosts."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.sagemcom_fast.const import CONF_KEEP_SESSION
+from custom_components.sagemcom_fast.device_tracker import SagemcomScannerEntity
+
+from .common import async_setup_gateway, async_time_polls
+
+POLLS = 10
+
+
+@pytest.fixture
+def written() -> Generator[list[str], None, None]:
+    """Return the hosts of the entities that write their state, in order."""
+    written: list[str] = []
+    write_ha_state = SagemcomScannerEntity.async_write_ha_state
+
+    def async_write_ha_state(entity: SagemcomScannerEntity) -> None:
+        """Record the write and write the state."""
+        written.append(entity.unique_id)
+        write_ha_state(entity)
+
+    with patch.object(
+        SagemcomScannerEntity, "async_write_ha_state", async_write_ha_state
+    ):
+        yield written
+
+
+async def test_unchanged_hosts_write_no_state(hass, fake_gateway, written) -> None:
+    """Write no state at all once the hosts are known, if none changed."""
+    gateway = await fake_gateway(hosts=250, churn=0)
+    data = await async_setup_gateway(hass, gateway.host, **{CONF_KEEP_SESSION: True})
+    assert len(written) == len(data.coordinator.hosts) > 0
+    written.clear()
+
+    await async_time_polls(hass, data, POLLS)
+
+    assert written == []
+
+
+async def test_changed_hosts_write_state(hass, fake_gateway, written) -> None:
+    """Write the state of the hosts that changed, and of those only."""
+    # One host joins or leaves with every poll
+    gateway = await fake_gateway(hosts=100, churn=0.01)
+    data = await async_setup_gateway(hass, gateway.host, **{CONF_KEEP_SESSION: True})
+    written.clear()
+
+    await async_time_polls(hass, data, POLLS)
+
+    assert len(written) == POLLS
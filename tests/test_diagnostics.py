@@ -0,0 +1,168 @@
+"""Tests of the diagnostics dump of the gateway tree."""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from typing import Any
+
+import pytest
+from sagemcom_api.exceptions import UnauthorizedException
+
+from custom_components.sagemcom_fast.const import DIAGNOSTICS_COMPRESS_SIZE
+from custom_components.sagemcom_fast.diagnostics import _async_dump_tree
+
+HOSTS = 5000
+
+
+def _tree(hosts: int) -> dict[str, Any]:
+    """Return a synthetic gateway tree, with the node names the client returns.
+
+    The hosts, the WiFi neighbors and the vendor logs are about the same size,
+    like the largest subtrees of a real gateway.
+    """
+    return {
+        "device_info": {"model_name": "F@st 5370e", "software_version": "1.0"},
+        "hosts": {
+            "hosts": [
+                {
+                    "uid": index,
+                    "phys_address": f"02:00:00:00:{index // 256:02x}:{index % 256:02x}",
+                    "ip_address": f"192.168.{index // 256}.{index % 256}",
+                    "host_name": f"host-{index}",
+                    "interface_type": "802.11",
+                    "active": index % 2 == 0,
+                }
+                for index in range(hosts)
+            ]
+        },
+        "wi_fi": {
+            "radios": [{"enable": True, "channel": 36}],
+            "neighboring_wi_fi_diagnostic": [
+                {
+                    "ssid": f"network-{index}",
+                    "bssid": f"04:00:00:00:{index // 256:02x}:{index % 256:02x}",
+                    "channel": 1 + index % 13,
+                    "signal_strength": -40 - index % 50,
+                    "security_mode_enabled": "WPA2-Personal",
+                }
+                for index in range(hosts)
+            ],
+        },
+        "dhc_pv4": {"server": {"enable": True}},
+        "x_sagemcom_vendor": {
+            "firmware_slots": [1, 2],
+            "logs": [
+                {"timestamp": 1_700_000_000 + index, "message": f"event {index} " * 4}
+                for index in range(hosts)
+            ],
+        },
+    }
+
+
+class FakeClient:
+    """Client reading the gateway tree from JSON, as parsed from a response."""
+
+    def __init__(self, tree: dict[str, Any], errors: dict[str, Exception]):
+        """Initialize the fake client with the responses for each xpath."""
+        self.responses = {"*": json.dumps({"device": tree})}
+        self.nodes = json.dumps({"device": {key: {} for key in tree}})
+        for key, subtree in tree.items():
+            name = {"wi_fi": "WiFi", "dhc_pv4": "DHCPv4"}.get(
+                key, key.title().replace("_", "")
+            )
+            self.responses[f"Device/{name}"] = json.dumps({key: subtree})
+        self.errors = errors
+        self.xpaths: list[str] = []
+
+    async def get_value_by_xpath(
+        self, xpath: str, options: dict[str, Any] | None = None
+    ) -> Any:
+        """Return the value at the xpath, only its direct nodes with a depth."""
+        self.xpaths.append(xpath)
+        if xpath in self.errors:
+            raise self.errors[xpath]
+        if xpath == "Device" and options == {"depth": 1}:
+            return json.loads(self.nodes)
+        if xpath not in self.responses:
+            raise KeyError(xpath)
+        return json.loads(self.responses[xpath])
+
+
+async def test_dump_includes_vendor_nodes() -> None:
+    """Add the nodes that are not listed, read one by one."""
+    client = FakeClient(_tree(10), {})
+    dump, summary = await _async_dump_tree(client, False)
+
+    assert client.xpaths[-2:] == ["Device", "Device/XSagemcomVendor"]
+    assert "*" not in client.xpaths
+    assert dump["Device/XSagemcomVendor"]["x_sagemcom_vendor"]["firmware_slots"] == [
+        1,
+        2,
+    ]
+    # Listed subtrees are not read nor dumped twice
+    assert client.xpaths.count("Device/WiFi") == 1
+    assert dump["Device/WiFi"]["wi_fi"]["radios"] == [{"enable": True, "channel": 36}]
+    assert "Device/WiFi" in dump
+    assert "Device/DhcPv4" not in client.xpaths
+    assert not summary["skipped"]
+
+
+async def test_dump_partial_failure() -> None:
+    """Record a failing subtree with its error and keep the others."""
+    client = FakeClient(_tree(10), {"Device/Hosts": TimeoutError()})
+    dump, _ = await _async_dump_tree(client, False)
+
+    assert dump["Device/Hosts"] == {"error": "TimeoutError()"}
+    assert "device_info" in dump["Device/DeviceInfo"]
+
+
+async def test_dump_unauthorized() -> None:
+    """Let an expired session reach the broker, which logs in again."""
+    client = FakeClient(_tree(10), {"Device/Hosts": UnauthorizedException()})
+
+    with pytest.raises(UnauthorizedException):
+        await _async_dump_tree(client, False)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+async def test_dump_compression(compress: bool) -> None:
+    """Compress large subtrees only when enabled in the options."""
+    client = FakeClient(_tree(HOSTS), {})
+    dump, summary = await _async_dump_tree(client, compress)
+
+    assert len(client.responses["Device/Hosts"]) > DIAGNOSTICS_COMPRESS_SIZE
+    assert ("zlib_base64" in dump["Device/Hosts"]) is compress
+    assert "hosts" not in dump["Device/DeviceInfo"]
+    assert summary["size"] < len(client.responses["*"]) or not compress
+
+
+async def test_dump_peak_memory(benchmark) -> None:
+    """Compare the peak memory with reading the whole tree at once."""
+    client = FakeClient(_tree(HOSTS), {})
+    peaks = {}
+
+    tracemalloc.start()
+    try:
+        json.dumps(await client.get_value_by_xpath("*"))
+        _, peaks["whole_tree"] = tracemalloc.get_traced_memory()
+        for compress in (False, True):
+            tracemalloc.reset_peak()
+            dump, _ = await _async_dump_tree(client, compress)
+            json.dumps(dump)
+            del dump
+            _, peaks["compressed" if compress else "subtrees"] = (
+                tracemalloc.get_traced_memory()
+            )
+    finally:
+        tracemalloc.stop()
+
+    benchmark(
+        f"diagnostics of {HOSTS} hosts",
+        **{f"{name}_kib": peak / 1024 for name, peak in peaks.items()},
+    )
+    # Uncompressed, the dump holds the same data as the whole tree but never
+    # twice, as each node is read once. Compressed, only one subtree is held
+    # as parsed from its response at a time.
+    assert peaks["subtrees"] < peaks["whole_tree"] * 1.01
+    assert peaks["compressed"] < peaks["whole_tree"] / 3
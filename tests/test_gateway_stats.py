@@ -0,0 +1,60 @@
+"""Tests of the gateway statistics."""
+
+from __future__ import annotations
+
+from custom_components.sagemcom_fast.gateway_stats import GatewayStats
+
+
+def _values(received: int, sent: int) -> dict[str, object]:
+    """Return the values read from the gateway, with its WAN counters."""
+    return {
+        "wan_bytes_received": received,
+        "wan_bytes_sent": sent,
+        "memory_total": "1000",
+        "memory_free": "250",
+        "interfaces": [
+            {"alias": "WAN", "stats": {"bytes_received": "10", "bytes_sent": "20"}},
+            {"alias": None},
+        ],
+    }
+
+
+def test_rates_from_counter_deltas() -> None:
+    """Derive the rates from the counters of two samples."""
+    stats = GatewayStats()
+    stats.update(_values(1000, 500), 100.0)
+
+    assert stats.rates == {"wan_download_rate": None, "wan_upload_rate": None}
+    assert stats.memory_usage == 75.0
+    assert stats.interfaces == {"WAN": {"bytes_received": 10, "bytes_sent": 20}}
+    assert "interfaces" not in stats.values
+
+    stats.update(_values(3000, 1500), 110.0)
+    assert stats.rates == {"wan_download_rate": 200.0, "wan_upload_rate": 100.0}
+
+
+def test_rate_across_counter_reset() -> None:
+    """Report no rate when a counter resets, then resume from the new value."""
+    stats = GatewayStats()
+    stats.update(_values(1_000_000, 500_000), 100.0)
+    stats.update(_values(2_000_000, 600_000), 110.0)
+    assert stats.rates["wan_download_rate"] == 100_000.0
+
+    # The gateway rebooted, its counters started over
+    stats.update(_values(5000, 700_000), 120.0)
+    assert stats.rates["wan_download_rate"] is None
+    assert stats.rates["wan_upload_rate"] == 10_000.0
+
+    stats.update(_values(15_000, 800_000), 130.0)
+    assert stats.rates["wan_download_rate"] == 1000.0
+
+
+def test_rate_without_counter() -> None:
+    """Report no rate when the gateway does not return a counter."""
+    stats = GatewayStats()
+    stats.update(_values(1000, 500), 100.0)
+    stats.update({"wan_bytes_received": "unknown"}, 110.0)
+
+    assert stats.rates == {"wan_download_rate": None, "wan_upload_rate": None}
+    assert stats.memory_usage is None
+    assert stats.interfaces == {}
@@ -0,0 +1,102 @@
+"""Tests of the connection history of the hosts."""
+
+from __future__ import annotations
+
+from homeassistant.exceptions import ServiceValidationError
+import pytest
+from sagemcom_api.models import Device
+
+from custom_components.sagemcom_fast.const import (
+    ATTR_MAC_ADDRESS,
+    DOMAIN,
+    SERVICE_GET_CONNECTION_HISTORY,
+)
+from custom_components.sagemcom_fast.history import ConnectionHistory
+from custom_components.sagemcom_fast.host_table import HostTable
+
+from .common import async_setup_gateway
+
+SIZE = 4
+HOST = "02:00:00:00:00:01"
+
+
+def _flip(table: HostTable, history: ConnectionHistory, times: int) -> None:
+    """Connect and disconnect the host in turn, one second apart from 1000."""
+    table.update([Device(phys_address=HOST, active=True)], 1000)
+    history.update(table, None, 1000)
+    for second in range(1001, 1001 + times):
+        active = {HOST} if second % 2 == 0 else set()
+        history.update(table, table.update_presence(active, second), second)
+
+
+def test_ring_buffer_wraparound() -> None:
+    """Keep the last events of a host oldest first, and count every connect."""
+    table = HostTable()
+    history = ConnectionHistory(SIZE)
+    _flip(table, history, 7)
+
+    events = history.events(HOST)
+    assert len(events) == SIZE
+    assert [event["connected"] for event in events] == [True, False, True, False]
+    assert events[0]["time"] == "1970-01-01T00:16:44+00:00"
+    assert events[-1]["time"] == "1970-01-01T00:16:47+00:00"
+
+    summary = history.summary(HOST)
+    assert summary["connect_count"] == 4
+    assert summary["first_seen"] == "1970-01-01T00:16:40+00:00"
+    assert summary["average_session"] == 1
+
+    # The stored form restores in the same order, also after wrapping around
+    restored = ConnectionHistory(SIZE)
+    restored.restore(history.as_dict())
+    assert restored.events(HOST) == events
+    assert restored.summary(HOST) == summary
+
+    smaller = ConnectionHistory(2)
+    smaller.restore(history.as_dict())
+    assert smaller.events(HOST) == events[-2:]
+
+
+def test_removed_host_forgotten() -> None:
+    """Drop the history of hosts removed from the table."""
+    table = HostTable(max_age=10)
+    history = ConnectionHistory(SIZE)
+    _flip(table, history, 1)
+    assert HOST in history
+
+    history.update(table, table.update_presence(set(), 1100), 1100)
+    assert HOST not in history
+    assert history.events(HOST) == []
+    assert history.summary(HOST) == {}
+
+
+async def test_history_service(hass, fake_gateway) -> None:
+    """Return the history of a host from the gateway that tracks it."""
+    gateway = await fake_gateway(hosts=10, active=1.0, churn=0)
+    data = await async_setup_gateway(hass, gateway.host)
+    idx = next(iter(data.coordinator.hosts))
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_CONNECTION_HISTORY,
+        {ATTR_MAC_ADDRESS: idx.lower()},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["mac_address"] == idx
+    assert (
+        response["config_entry_id"] == hass.config_entries.async_entries()[0].entry_id
+    )
+    assert response["connect_count"] == 1
+    assert [event["connected"] for event in response["events"]] == [True]
+    assert response["last_disconnected"] is None
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_CONNECTION_HISTORY,
+            {ATTR_MAC_ADDRESS: "02:ff:ff:ff:ff:ff"},
+            blocking=True,
+            return_response=True,
+        )
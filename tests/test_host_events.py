@@ -0,0 +1,91 @@
+"""Tests of the events fired when hosts join or leave."""
+
+from __future__ import annotations
+
+from homeassistant.core import Event, HomeAssistant, callback
+import pytest
+
+from custom_components.sagemcom_fast.const import (
+    EVENT_HOST_JOINED,
+    EVENT_HOST_LEFT,
+    EVENT_HOSTS_CHANGED,
+    HOST_EVENTS_BATCH_THRESHOLD,
+)
+
+from .common import async_setup_gateway
+
+
+def _listen(hass: HomeAssistant) -> dict[str, list[Event]]:
+    """Record the host events, by type."""
+    events: dict[str, list[Event]] = {
+        EVENT_HOST_JOINED: [],
+        EVENT_HOST_LEFT: [],
+        EVENT_HOSTS_CHANGED: [],
+    }
+
+    @callback
+    def async_record(event: Event) -> None:
+        """Record a host event."""
+        events[event.event_type].append(event)
+
+    for event_type in events:
+        hass.bus.async_listen(event_type, async_record)
+
+    return events
+
+
+async def test_host_events(hass, fake_gateway) -> None:
+    """Fire an event per host that joined or left, none on the first poll."""
+    gateway = await fake_gateway(hosts=10, active=1.0, churn=0.1)
+    events = _listen(hass)
+    data = await async_setup_gateway(hass, gateway.host)
+    entry_id = data.coordinator.entry_id
+    assert not any(events.values())
+
+    # Each full read flips the presence of one host
+    active = set(data.coordinator.hosts.active)
+    await data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    joined = data.coordinator.hosts.active - active
+    left = active - data.coordinator.hosts.active
+    assert len(joined) + len(left) == 1
+    assert {event.data["mac_address"] for event in events[EVENT_HOST_JOINED]} == joined
+    assert {event.data["mac_address"] for event in events[EVENT_HOST_LEFT]} == left
+    assert events[EVENT_HOSTS_CHANGED] == []
+
+    event = (events[EVENT_HOST_JOINED] + events[EVENT_HOST_LEFT])[0]
+    host = data.coordinator.hosts[event.data["mac_address"]]
+    assert event.data == {
+        "config_entry_id": entry_id,
+        "mac_address": host.id,
+        "ip_address": host.ip_address,
+        "interface_type": host.interface_type,
+    }
+
+
+@pytest.mark.parametrize("flips", [HOST_EVENTS_BATCH_THRESHOLD, 20])
+async def test_host_events_batched(hass, fake_gateway, flips) -> None:
+    """Fire a single event only when more hosts than the threshold changed."""
+    gateway = await fake_gateway(hosts=40, active=1.0, churn=flips / 40)
+    events = _listen(hass)
+    data = await async_setup_gateway(hass, gateway.host)
+
+    active = set(data.coordinator.hosts.active)
+    await data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    joined = data.coordinator.hosts.active - active
+    left = active - data.coordinator.hosts.active
+    assert len(joined) + len(left) == flips
+    if flips <= HOST_EVENTS_BATCH_THRESHOLD:
+        assert len(events[EVENT_HOST_JOINED]) + len(events[EVENT_HOST_LEFT]) == flips
+        assert events[EVENT_HOSTS_CHANGED] == []
+        return
+
+    assert events[EVENT_HOST_JOINED] == events[EVENT_HOST_LEFT] == []
+    assert len(events[EVENT_HOSTS_CHANGED]) == 1
+    batch = events[EVENT_HOSTS_CHANGED][0].data
+    assert batch["config_entry_id"] == data.coordinator.entry_id
+    assert {host["mac_address"] for host in batch["joined"]} == joined
+    assert {host["mac_address"] for host in batch["left"]} == left
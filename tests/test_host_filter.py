@@ -0,0 +1,93 @@
+"""Tests of the filter of the tracked hosts."""
+
+from __future__ import annotations
+
+from homeassistant.helpers import entity_registry as er
+from sagemcom_api.models import Device
+
+from custom_components.sagemcom_fast.const import (
+    CONF_HOST_ALLOWLIST,
+    CONF_KEEP_SESSION,
+    CONF_TRACK_WIRED_CLIENTS,
+    DOMAIN,
+)
+from custom_components.sagemcom_fast.host_table import HostFilter
+
+from .common import async_setup_gateway
+
+WIRELESS = Device(phys_address="02:00:00:00:00:01", interface_type="WiFi")
+WIRED = Device(phys_address="02:00:00:00:00:02", interface_type="Ethernet")
+UNKNOWN = Device(phys_address="02:00:00:00:00:03")
+
+
+def test_filter_wireless_only() -> None:
+    """Track only the hosts connected over WiFi."""
+    host_filter = HostFilter.from_allowlist(True, False, "")
+
+    assert host_filter(WIRELESS)
+    assert not host_filter(WIRED)
+    # A host without an interface type counts as wired
+    assert not host_filter(UNKNOWN)
+    assert not HostFilter(False, True)(WIRELESS)
+
+
+def test_filter_allowlist() -> None:
+    """Track only the listed MAC addresses and interface types."""
+    host_filter = HostFilter.from_allowlist(True, True, " 02:00:00:00:00:02 , wifi,")
+
+    assert host_filter.allowlist == frozenset({"02:00:00:00:00:02", "WIFI"})
+    assert host_filter(WIRELESS)
+    assert host_filter(WIRED)
+    assert not host_filter(UNKNOWN)
+
+    # The connection filter applies to the listed hosts as well
+    assert not HostFilter.from_allowlist(True, False, "02:00:00:00:00:02")(WIRED)
+    assert HostFilter.from_allowlist(True, True, "") == HostFilter()
+
+
+async def test_filter_removes_entities(hass, fake_gateway) -> None:
+    """Remove the entities of the hosts that are filtered out by new options."""
+    gateway = await fake_gateway(hosts=20, active=1.0, churn=0)
+    data = await async_setup_gateway(hass, gateway.host, **{CONF_KEEP_SESSION: True})
+    entry = hass.config_entries.async_entries(DOMAIN)[0]
+    entity_registry = er.async_get(hass)
+
+    def tracked() -> set[str]:
+        """Return the MAC addresses of the hosts with an entity."""
+        return {
+            registry_entry.unique_id
+            for registry_entry in er.async_entries_for_config_entry(
+                entity_registry, entry.entry_id
+            )
+            if registry_entry.domain == "device_tracker"
+        }
+
+    assert len(tracked()) == 20
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_TRACK_WIRED_CLIENTS: False}
+    )
+    await hass.async_block_till_done()
+
+    wireless = {
+        idx
+        for idx, host in data.coordinator.hosts.items()
+        if host.interface_type == "WiFi"
+    }
+    assert len(wireless) == 10
+    assert tracked() == wireless
+
+    # Hosts filtered out by the allowlist are not added back
+    allowed = sorted(wireless)[0]
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            **entry.options,
+            CONF_TRACK_WIRED_CLIENTS: True,
+            CONF_HOST_ALLOWLIST: allowed,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert tracked() == {allowed}
+    assert list(data.coordinator.hosts) == [allowed]
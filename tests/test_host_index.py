@@ -0,0 +1,151 @@
+"""Tests of the owners of the hosts of a mesh of gateways."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from custom_components.sagemcom_fast.const import CONF_MESH_EXTENDER
+from custom_components.sagemcom_fast.host_index import HostIndex
+from custom_components.sagemcom_fast.host_table import HostChanges
+
+from .common import async_setup_gateway
+
+HOST = "02:00:00:00:00:01"
+
+
+class _Gateway:
+    """A gateway of the mesh, handing released hosts over right away."""
+
+    def __init__(
+        self, index: HostIndex, entry_id: str, primary: bool, *hosts: str
+    ) -> None:
+        """Register the gateway with the hosts it knows."""
+        self.index = index
+        self.entry_id = entry_id
+        self.hosts = set(hosts)
+        self.released: list[set[str]] = []
+        self.claimed: list[set[str]] = []
+        self.unregister = index.async_register(
+            entry_id, primary, self.hosts, self._release, self.claimed.append
+        )
+
+    def _release(self, idxs: set[str]) -> None:
+        """Remove the hosts, then tell the index they are gone."""
+        self.released.append(idxs)
+        self.hosts.difference_update(idxs)
+        self.index.async_released(self.entry_id, idxs)
+
+    def drop(self, idx: str) -> None:
+        """Forget a host, e.g. once it was evicted."""
+        self.hosts.discard(idx)
+        self.index.async_update(self.entry_id, HostChanges(removed={idx}))
+
+    def add(self, idx: str) -> None:
+        """Learn a host, e.g. once it joined."""
+        self.hosts.add(idx)
+        self.index.async_update(self.entry_id, HostChanges(added={idx}))
+
+
+def test_owner_drops_host() -> None:
+    """Move a host to the extender once the primary gateway drops it."""
+    index = HostIndex()
+    primary = _Gateway(index, "primary", True, HOST)
+    extender = _Gateway(index, "extender", False, HOST)
+    assert index.owns("primary", HOST)
+    assert index.is_foreign("extender", HOST)
+    assert extender.claimed == []
+
+    primary.drop(HOST)
+    assert index.owns("extender", HOST)
+    assert extender.claimed == [{HOST}]
+    assert index.releasing("primary") == set()
+
+    # The host comes back to the primary gateway when it sees it again
+    primary.add(HOST)
+    assert extender.released == [{HOST}]
+    assert index.owns("primary", HOST)
+    assert primary.claimed == [{HOST}]
+
+
+def test_unregister_hands_hosts_over() -> None:
+    """Give the hosts of a removed entry to the gateways that still know them."""
+    index = HostIndex()
+    primary = _Gateway(index, "primary", True, HOST, "02:00:00:00:00:02")
+    extender = _Gateway(index, "extender", False, HOST)
+
+    primary.unregister()
+    assert index.owns("extender", HOST)
+    assert extender.claimed == [{HOST}]
+    # A host no other gateway knows has no owner left
+    assert not index.is_foreign("extender", "02:00:00:00:00:02")
+    assert index.as_dict("extender") == {
+        "primary": False,
+        "gateways": 1,
+        "owned_hosts": 1,
+        "hosts": 1,
+        "releasing": 0,
+    }
+
+
+def test_extender_before_primary() -> None:
+    """Release the hosts of an extender set up before the primary gateway."""
+    index = HostIndex()
+    released: list[set[str]] = []
+    claimed: list[set[str]] = []
+    index.async_register("extender", False, {HOST}, released.append, list.append)
+    assert index.owns("extender", HOST)
+
+    index.async_register("primary", True, {HOST}, list.append, claimed.append)
+    # Until the entity of the extender is gone, the host stays with it
+    assert released == [{HOST}]
+    assert index.owns("extender", HOST)
+    assert index.releasing("extender") == {HOST}
+    assert index.is_foreign("extender", HOST)
+    assert claimed == []
+
+    index.async_released("extender", {HOST})
+    assert index.owns("primary", HOST)
+    assert claimed == [{HOST}]
+    assert index.releasing("extender") == set()
+
+
+def test_two_primaries_same_host() -> None:
+    """Keep a host known to two primary gateways with the first one."""
+    index = HostIndex()
+    first = _Gateway(index, "first", True, HOST)
+    second = _Gateway(index, "second", True, HOST)
+    assert index.owns("first", HOST)
+    assert first.released == second.claimed == []
+
+    first.drop(HOST)
+    assert index.owns("second", HOST)
+    assert second.claimed == [{HOST}]
+
+    # Seeing the host again does not take it back from the other primary
+    first.add(HOST)
+    assert index.owns("second", HOST)
+    assert second.released == []
+    assert index.as_dict("first")["owned_hosts"] == 0
+
+
+async def test_extender_reads_own_hosts(hass, fake_gateway) -> None:
+    """Read only the hosts no primary gateway tracks on an extender."""
+    primary_gateway = await fake_gateway(hosts=10, active=1.0, churn=0)
+    extender_gateway = await fake_gateway(hosts=20, active=1.0, churn=0)
+    primary = await async_setup_gateway(hass, primary_gateway.host)
+    extender = await async_setup_gateway(
+        hass, extender_gateway.host, **{CONF_MESH_EXTENDER: True}
+    )
+
+    assert extender.coordinator.hosts.keys().isdisjoint(primary.coordinator.hosts)
+    assert len(extender.coordinator.hosts) == 10
+
+    client = extender.coordinator.client
+    with patch.object(client, "get_hosts", wraps=client.get_hosts) as get_hosts:
+        extender.coordinator.set_host_filter(extender.coordinator.host_filter)
+        await extender.coordinator.async_refresh()
+
+    assert extender.coordinator.last_update_success
+    get_hosts.assert_not_called()
+    assert extender.coordinator.metrics.as_dict()["phases"]["hosts"]["last_size"] == 10
+    assert len(extender.coordinator.hosts) == 10
@@ -0,0 +1,113 @@
+"""Tests of the host table with 10k synthetic MAC addresses."""
+
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+
+from sagemcom_api.models import Device
+
+from custom_components.sagemcom_fast.host_table import HostTable
+
+HOSTS = 10_000
+ACTIVE = 100
+
+
+def _hosts(count: int, start: int = 0) -> list[Device]:
+    """Return hosts with unique, randomized looking MAC addresses."""
+    return [
+        Device(
+            phys_address=f"02:{index >> 24 & 255:02x}:{index >> 16 & 255:02x}:"
+            f"{index >> 8 & 255:02x}:{index & 255:02x}:00",
+            ip_address="10.0.0.1",
+            active=True,
+            interface_type="WiFi",
+            host_name=f"host-{index}",
+        )
+        for index in range(start, start + count)
+    ]
+
+
+def _time_presence(table: HostTable, active: list[set[str]]) -> float:
+    """Return the best time in seconds to apply each set of active hosts."""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for ids in active:
+            table.update_presence(ids, 0)
+        best = min(best, time.perf_counter() - started)
+
+    return best
+
+
+def test_presence_cost_independent_of_known_hosts(benchmark) -> None:
+    """Mark hosts inactive in time proportional to the active hosts only."""
+    hosts = _hosts(HOSTS)
+    # The same hosts flip between the two sets
+    active = [
+        {host.id for host in hosts[:ACTIVE]},
+        {host.id for host in hosts[10 : ACTIVE + 10]},
+    ] * 50
+
+    small = HostTable()
+    small.update(hosts[: ACTIVE + 10], 0)
+    large = HostTable()
+    large.update(hosts, 0)
+
+    small_time = _time_presence(small, active)
+    large_time = _time_presence(large, active)
+
+    benchmark(
+        f"presence of {ACTIVE} active hosts",
+        known_110_us=small_time / len(active) * 1e6,
+        known_10k_us=large_time / len(active) * 1e6,
+    )
+    assert large_time < small_time * 5
+
+
+def test_update_throughput_and_memory(benchmark) -> None:
+    """Merge 10k hosts and report the time and memory it takes."""
+    hosts = _hosts(HOSTS)
+    table = HostTable()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        changes = table.update(hosts, 0)
+        table_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(changes.added) == HOSTS
+
+    started = time.perf_counter()
+    for now in range(1, 11):
+        assert not table.update(hosts, now)
+    update_time = (time.perf_counter() - started) / 10
+
+    benchmark(
+        f"update of {HOSTS} hosts",
+        updates_per_sec=1 / update_time,
+        bytes_per_host=table_bytes / HOSTS,
+    )
+    # Records have slots, the hosts themselves are not copied
+    assert table_bytes / HOSTS < 512
+
+
+def test_evict_randomized_macs() -> None:
+    """Keep the table bounded while MAC randomization adds new hosts."""
+    table = HostTable(max_age=3600, max_size=1_000)
+    rng = random.Random(0)
+
+    for now in range(0, 20 * 600, 600):
+        new_hosts = _hosts(500, start=rng.randrange(1 << 30))
+        changes = table.update(new_hosts, now)
+        assert len(table) <= 1_000
+        # Hosts that left are evicted, the active ones stay
+        assert {host.id for host in new_hosts} <= table.keys()
+        assert not changes.removed & table.keys()
+
+    # Once nobody is active anymore, all hosts expire after an hour
+    table.update_presence(set(), now)
+    table.evict(now + 3600 + 1)
+    assert len(table) == 0
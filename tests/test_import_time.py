@@ -0,0 +1,89 @@
+"""Regression test of the modules importing the integration loads.
+
+Home Assistant has its core and helpers loaded before it imports an
+integration, so only the modules the package adds on top of those count.
+Its own modules are compared with tests/fixtures/import_baseline.json,
+recorded again with `pytest tests/test_import_time.py --update-import-baseline`.
+Third party modules depend on the installed releases, they are only
+counted, like the import time is only reported. Run
+`python -X importtime -c "import custom_components.sagemcom_fast"` for a
+breakdown per module.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+PACKAGE = "custom_components.sagemcom_fast"
+BASELINE = Path(__file__).parent / "fixtures" / "import_baseline.json"
+RUNS = 7
+# Imported on setup only, not with the integration
+DEFERRED = ("host_index", "presence_watch", "services", "snapshot")
+
+# Loaded by Home Assistant before it sets up an integration
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+
+MEASURE = f"""
+import json, sys, time
+{"; ".join(f"import {module}" for module in PRELOADED)}
+before = set(sys.modules)
+started = time.perf_counter()
+import {PACKAGE}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def _measure() -> dict:
+    """Import the package in a fresh interpreter and return what it took."""
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_time(request: pytest.FixtureRequest, benchmark) -> None:
+    """Import none of the deferred modules and no new modules of the package."""
+    # The first import compiles the bytecode, leave it out
+    _measure()
+    runs = [_measure() for _ in range(RUNS)]
+    import_ms = statistics.median(run["ms"] for run in runs)
+    modules = runs[-1]["modules"]
+    own = [module for module in modules if module.startswith(PACKAGE)]
+
+    benchmark(
+        f"import {PACKAGE}",
+        ms=import_ms,
+        modules=len(modules),
+        own_modules=len(own),
+    )
+
+    assert not {f"{PACKAGE}.{module}" for module in DEFERRED} & set(own)
+
+    if request.config.getoption("update_import_baseline"):
+        BASELINE.parent.mkdir(exist_ok=True)
+        BASELINE.write_text(json.dumps({"modules": own}, indent=2) + "\n")
+        return
+
+    baseline = json.loads(BASELINE.read_text())
+    assert not set(own) - set(baseline["modules"]), "New modules imported"
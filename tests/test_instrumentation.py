@@ -0,0 +1,72 @@
+"""Tests of the request metrics shown in the diagnostics."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.sagemcom_fast.const import METRICS_BUCKETS
+from custom_components.sagemcom_fast.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.sagemcom_fast.instrumentation import RequestMetrics
+
+from .common import async_setup_gateway, async_time_polls
+
+POLLS = 3
+
+
+def test_phase_counters() -> None:
+    """Count the phases, their errors by class and the sizes they return."""
+    metrics = RequestMetrics(window=5)
+    for size in range(8):
+        with metrics.measure("hosts"):
+            pass
+        metrics.record_size("hosts", size)
+    with pytest.raises(TimeoutError), metrics.measure("poll"):
+        raise TimeoutError
+    metrics.record_retry()
+
+    hosts = metrics.as_dict()["phases"]["hosts"]
+    assert hosts["count"] == 8
+    # Only the last samples of the window are kept
+    assert sum(hosts["histogram_ms"].values()) == 5
+    assert hosts["histogram_ms"][f"<={METRICS_BUCKETS[0]}"] == 5
+    assert hosts["last_size"] == 7
+    assert hosts["max_size"] == 7
+    assert hosts["errors"] == {}
+    assert hosts["p50_ms"] <= hosts["p95_ms"] <= hosts["max_ms"]
+
+    assert metrics.errors == 1
+    assert metrics.as_dict()["retries"] == 1
+    assert metrics.as_dict()["phases"]["poll"]["errors"] == {"TimeoutError": 1}
+
+
+def test_histogram_buckets() -> None:
+    """Count each duration in the first bucket it fits in."""
+    stats = RequestMetrics().phase("poll")
+    stats.durations.extend([1, METRICS_BUCKETS[0], METRICS_BUCKETS[0] + 1, 10**6])
+
+    histogram = stats.histogram()
+    assert histogram[f"<={METRICS_BUCKETS[0]}"] == 2
+    assert histogram[f"<={METRICS_BUCKETS[1]}"] == 1
+    assert histogram[f">{METRICS_BUCKETS[-1]}"] == 1
+    assert stats.percentile(50) == METRICS_BUCKETS[0] + 1
+    assert RequestMetrics().phase("poll").percentile(50) is None
+
+
+async def test_diagnostics_counters(hass, fake_gateway) -> None:
+    """Show the counters of the polls in the diagnostics."""
+    gateway = await fake_gateway(hosts=20, active=1.0, churn=0)
+    data = await async_setup_gateway(hass, gateway.host)
+    await async_time_polls(hass, data, POLLS)
+
+    entry = hass.config_entries.async_entries()[0]
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    phases = diagnostics["request_metrics"]["phases"]
+
+    # The first refresh and the timed polls, each in its own session
+    assert phases["poll"]["count"] == POLLS + 1
+    assert phases["poll"]["errors"] == {}
+    assert phases["hosts"]["last_size"] == 20
+    assert phases["login"]["count"] == phases["logout"]["count"] >= POLLS + 1
+    assert diagnostics["request_metrics"]["retries"] == 0
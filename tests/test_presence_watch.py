@@ -0,0 +1,92 @@
+"""Tests of the presence watcher."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import time
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+
+from custom_components.sagemcom_fast.const import CONF_KEEP_SESSION, CONF_PRESENCE_WATCH
+from custom_components.sagemcom_fast.scheduler import async_get_scheduler
+
+from .common import async_setup_gateway
+
+JOIN_INTERVAL = 3
+FLIP_INTERVAL = 2
+
+
+async def test_presence_watch_new_host(hass, fake_gateway, benchmark) -> None:
+    """Refresh right away when a host joins, long before the next poll."""
+    gateway = await fake_gateway(hosts=20, churn=0, join_interval=JOIN_INTERVAL)
+    data = await async_setup_gateway(
+        hass,
+        gateway.host,
+        **{CONF_KEEP_SESSION: True, CONF_PRESENCE_WATCH: True},
+    )
+    known = len(data.coordinator.hosts)
+    stats = async_get_scheduler(hass).stats[gateway.host]
+    requests = stats.requests
+
+    started = time.monotonic()
+    async with asyncio.timeout(JOIN_INTERVAL * 3):
+        while len(data.coordinator.hosts) == known:
+            await asyncio.sleep(0.1)
+    elapsed = time.monotonic() - started
+
+    assert data.watcher.supported
+    assert data.watcher.changes >= 1
+    # Each check is one request, held in a slot like the polls
+    checks = stats.requests - requests
+    benchmark(
+        "presence watch",
+        seconds_to_new_host=elapsed,
+        requests_per_second=checks / elapsed,
+    )
+    assert checks <= elapsed / data.watcher.interval + 4
+
+
+async def test_presence_watch_rejoin(hass, fake_gateway, benchmark) -> None:
+    """Refresh presence only when a known host rejoins, and poll less often."""
+    gateway = await fake_gateway(
+        hosts=20, active=1.0, churn=0, flip_interval=FLIP_INTERVAL
+    )
+    data = await async_setup_gateway(
+        hass,
+        gateway.host,
+        **{
+            CONF_KEEP_SESSION: True,
+            CONF_PRESENCE_WATCH: True,
+            CONF_SCAN_INTERVAL: 10,
+        },
+    )
+    coordinator = data.coordinator
+    full_scans = coordinator.metrics.phase("hosts").count
+
+    async with asyncio.timeout(FLIP_INTERVAL * 3):
+        while not (
+            left := [host for host in coordinator.hosts.values() if not host.active]
+        ):
+            await asyncio.sleep(0.1)
+    host = left[0]
+    started = time.monotonic()
+    async with asyncio.timeout(FLIP_INTERVAL * 3):
+        while not host.active:
+            await asyncio.sleep(0.1)
+    elapsed = time.monotonic() - started
+
+    benchmark(
+        f"presence watch, a host flips every {FLIP_INTERVAL}s",
+        seconds_to_rejoin=elapsed,
+    )
+    assert elapsed < FLIP_INTERVAL + 2 * data.watcher.interval
+    assert data.watcher.changes >= 2
+    # Presence only, the host details are known
+    assert coordinator.metrics.phase("hosts").count == full_scans
+    assert coordinator.presence_watched
+    assert coordinator.update_interval == coordinator.full_scan_interval
+
+    data.watcher.set_enabled(False)
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=10)
@@ -0,0 +1,132 @@
+"""Tests of the poll scheduler shared by all gateways."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import random
+
+from custom_components.sagemcom_fast.const import CONF_KEEP_SESSION
+from custom_components.sagemcom_fast.scheduler import PollScheduler, async_get_scheduler
+
+from .common import async_setup_gateway
+
+GATEWAYS = 50
+MAX_CONCURRENT = 4
+INTERVAL = 10.0
+POLL_TIME = 0.5
+DURATION = 600.0
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock jumps to the next timer instead of waiting."""
+
+    def __init__(self) -> None:
+        """Initialize the loop at time 0."""
+        super().__init__()
+        self._now = 0.0
+
+    def time(self) -> float:
+        """Return the simulated time."""
+        return self._now
+
+    def _run_once(self) -> None:
+        """Skip ahead to the next timer when nothing is ready to run."""
+        if not self._ready and self._scheduled:
+            self._now = max(self._now, self._scheduled[0].when())
+        super()._run_once()
+
+
+def _simulate(staggered: bool, max_concurrent: int) -> tuple[PollScheduler, int]:
+    """Poll many gateways like their coordinators do, on a simulated clock.
+
+    Returns the scheduler and the highest number of polls in flight once the
+    offsets have been applied.
+    """
+    loop = VirtualClockLoop()
+    scheduler = PollScheduler(max_concurrent)
+    in_flight = max_in_flight = 0
+
+    async def async_poll_gateway(key: str) -> None:
+        """Poll right away, then every interval after the previous poll."""
+        nonlocal in_flight, max_in_flight
+        offset = scheduler.offset(key, INTERVAL) if staggered else 0.0
+        next_poll = 0.0
+        while next_poll < DURATION:
+            await asyncio.sleep(next_poll - loop.time())
+            async with scheduler.async_slot(key):
+                in_flight += 1
+                if loop.time() > 2 * INTERVAL + POLL_TIME:
+                    max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(POLL_TIME)
+                in_flight -= 1
+            next_poll = loop.time() + INTERVAL + offset
+            offset = 0.0
+
+    async def async_run() -> None:
+        """Poll all gateways."""
+        await asyncio.gather(
+            *(async_poll_gateway(f"gateway-{index}") for index in range(GATEWAYS))
+        )
+
+    try:
+        loop.run_until_complete(async_run())
+    finally:
+        loop.close()
+
+    return scheduler, max_in_flight
+
+
+def test_scheduler_simulated_clock(benchmark) -> None:
+    """Cap the polls in flight, and spread gateways set up together."""
+    random.seed(0)
+
+    for staggered in (False, True):
+        scheduler, max_in_flight = _simulate(staggered, MAX_CONCURRENT)
+        assert max_in_flight == MAX_CONCURRENT
+        assert len(scheduler.stats) == GATEWAYS
+        # Polls are not delayed by more than the offset and the time queued
+        assert all(
+            (DURATION - INTERVAL) / (INTERVAL + POLL_TIME + stats.max_queue_time)
+            <= stats.requests
+            <= DURATION / (INTERVAL + POLL_TIME) + 1
+            for stats in scheduler.stats.values()
+        )
+
+    # Without a cap, gateways set up together keep polling together
+    _, together = _simulate(False, GATEWAYS)
+    _, staggered = _simulate(True, GATEWAYS)
+    benchmark(
+        f"{GATEWAYS} gateways without cap",
+        max_in_flight_together=together,
+        max_in_flight_staggered=staggered,
+    )
+    assert together == GATEWAYS
+    assert staggered <= GATEWAYS // 5
+
+
+def test_offset_fixed_per_gateway() -> None:
+    """Give each gateway a single offset within the scan interval."""
+    scheduler = PollScheduler(MAX_CONCURRENT)
+    offsets = {scheduler.offset(f"gateway-{index}", 10) for index in range(10)}
+
+    assert len(offsets) == 10
+    assert all(0 <= offset <= 10 for offset in offsets)
+    assert scheduler.offset("gateway-0", 10) in offsets
+
+
+async def test_coordinator_offset_once(hass, fake_gateway) -> None:
+    """Refresh without delay, and offset only the poll after the first."""
+    gateway = await fake_gateway(hosts=10, churn=0)
+    data = await async_setup_gateway(hass, gateway.host, **{CONF_KEEP_SESSION: True})
+    coordinator = data.coordinator
+    offset = async_get_scheduler(hass).offsets[gateway.host]
+
+    assert coordinator.update_interval == timedelta(seconds=3600 + offset)
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=3600)
+
+    # Every request holds a slot, not only the polls and the capability probe
+    await data.coordinator.async_get_device_info()
+    stats = async_get_scheduler(hass).stats[gateway.host]
+    assert stats.requests == 4
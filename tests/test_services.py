@@ -0,0 +1,95 @@
+"""Tests of the services acting on several gateways."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from homeassistant.const import CONF_TIMEOUT
+from homeassistant.exceptions import ServiceValidationError
+import pytest
+
+from custom_components.sagemcom_fast.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    CONF_KEEP_SESSION,
+    DOMAIN,
+    SERVICE_REBOOT,
+    SERVICE_REFRESH,
+)
+
+from .common import async_setup_gateway
+
+
+async def _async_call(hass, service: str, **data) -> dict:
+    """Call a service of the integration and return its response."""
+    return await hass.services.async_call(
+        DOMAIN, service, data, blocking=True, return_response=True
+    )
+
+
+async def test_refresh(hass, fake_gateway) -> None:
+    """Refresh all gateways, reporting a gateway that timed out on its own.
+
+    Both fake gateways share a serial number, so the entities of the second
+    one are not added, its coordinator is refreshed all the same.
+    """
+    gateways = [await fake_gateway(hosts=hosts, active=1.0) for hosts in (10, 20)]
+    first, second = [
+        await async_setup_gateway(hass, gateway.host) for gateway in gateways
+    ]
+    first_id, second_id = first.coordinator.entry_id, second.coordinator.entry_id
+
+    response = await _async_call(hass, SERVICE_REFRESH)
+    assert response["succeeded"] == 2
+    assert response["failed"] == 0
+    assert response["results"][first_id]["host"] == gateways[0].host
+    assert response["results"][second_id]["hosts"] == 20
+    assert response["results"][second_id]["active_hosts"] == len(
+        second.coordinator.hosts.active
+    )
+
+    async def async_hang() -> None:
+        """Take longer than the timeout of the service."""
+        await asyncio.sleep(10)
+
+    with patch.object(first.coordinator, "async_refresh", side_effect=async_hang):
+        response = await _async_call(hass, SERVICE_REFRESH, **{CONF_TIMEOUT: 3})
+    assert response["succeeded"] == 1
+    assert response["results"][first_id] == {
+        "host": gateways[0].host,
+        "success": False,
+        "error": "Timed out after 3s",
+        "duration": pytest.approx(3, abs=0.5),
+    }
+    assert response["results"][second_id]["success"]
+
+    # Only the listed gateways
+    response = await _async_call(
+        hass, SERVICE_REFRESH, **{ATTR_CONFIG_ENTRY_ID: second_id}
+    )
+    assert list(response["results"]) == [second_id]
+
+    with pytest.raises(ServiceValidationError):
+        await _async_call(hass, SERVICE_REFRESH, **{ATTR_CONFIG_ENTRY_ID: "unknown"})
+
+
+async def test_reboot(hass, fake_gateway) -> None:
+    """Reboot a gateway, logging in again for the next poll."""
+    gateway = await fake_gateway(hosts=10, churn=0)
+    data = await async_setup_gateway(hass, gateway.host, **{CONF_KEEP_SESSION: True})
+    before = await gateway.async_stats()
+    assert before["sessions"] == 1
+
+    response = await _async_call(
+        hass, SERVICE_REBOOT, **{ATTR_CONFIG_ENTRY_ID: data.coordinator.entry_id}
+    )
+    assert response["succeeded"] == 1
+    assert response["results"][data.coordinator.entry_id]["success"]
+    # The gateway drops its sessions when it reboots
+    assert (await gateway.async_stats())["sessions"] == 0
+
+    await data.coordinator.async_refresh()
+    assert data.coordinator.last_update_success
+    after = await gateway.async_stats()
+    assert after["logins"] == before["logins"] + 1
+    assert data.coordinator.metrics.as_dict()["retries"] == 0
@@ -0,0 +1,54 @@
+"""Tests of the gateway session, kept or opened for every poll."""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+
+from custom_components.sagemcom_fast.const import CONF_KEEP_SESSION
+
+from .common import async_setup_gateway, async_time_polls, latency_summary
+
+POLLS = 3
+
+
+async def test_keep_session_latency(hass, fake_gateway, benchmark) -> None:
+    """Compare polls logging in every time with polls within a kept session."""
+    durations = {}
+    logins = {}
+    for keep_session in (False, True):
+        gateway = await fake_gateway(hosts=250, churn=0)
+        data = await async_setup_gateway(
+            hass, gateway.host, **{CONF_KEEP_SESSION: keep_session}
+        )
+        before = (await gateway.async_stats())["logins"]
+        durations[keep_session] = await async_time_polls(hass, data, POLLS)
+        logins[keep_session] = (await gateway.async_stats())["logins"] - before
+
+        benchmark(
+            f"poll 250 hosts, keep_session {keep_session}",
+            **latency_summary(durations[keep_session]),
+            logins=logins[keep_session],
+        )
+
+    assert logins == {False: POLLS, True: 0}
+    # A login is followed by a one second pause
+    assert (
+        statistics.median(durations[False]) - statistics.median(durations[True]) > 0.9
+    )
+
+
+async def test_kept_session_expired(hass, fake_gateway) -> None:
+    """Log in again once when the gateway expired the kept session."""
+    gateway = await fake_gateway(hosts=10, churn=0, session_timeout=2)
+    data = await async_setup_gateway(hass, gateway.host, **{CONF_KEEP_SESSION: True})
+    before = await gateway.async_stats()
+    assert before["sessions"] == 1
+
+    await asyncio.sleep(2.2)
+    await async_time_polls(hass, data, 2)
+
+    after = await gateway.async_stats()
+    assert after["logins"] == before["logins"] + 1
+    assert after["sessions"] == 1
+    assert data.coordinator.metrics.as_dict()["retries"] == 1
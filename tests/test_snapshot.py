@@ -0,0 +1,83 @@
+"""Tests of the warm start from the persisted host snapshot."""
+
+from __future__ import annotations
+
+import time
+
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    STATE_HOME,
+    STATE_NOT_HOME,
+    Platform,
+)
+from homeassistant.helpers.storage import Store
+
+from custom_components.sagemcom_fast.const import DOMAIN, STORAGE_VERSION
+from custom_components.sagemcom_fast.snapshot import HostSnapshot
+
+from .common import create_entry
+
+HOSTS = 50
+LATENCY = 0.5
+
+
+async def test_warm_start_setup_time(hass, fake_gateway, benchmark) -> None:
+    """Set up from the snapshot without waiting for a slow gateway."""
+    gateway = await fake_gateway(hosts=HOSTS, churn=0, latency=LATENCY)
+    entry = create_entry(gateway.host)
+
+    started = time.perf_counter()
+    await hass.config_entries.async_add(entry)
+    cold = time.perf_counter() - started
+    await hass.async_block_till_done()
+    entities = hass.states.async_entity_ids(Platform.DEVICE_TRACKER)
+    assert entities
+
+    # Writes the snapshot saved after the first refresh, then sets up again
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    started = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    warm = time.perf_counter() - started
+
+    # Entities exist before the gateway has answered, not home until it has
+    assert hass.states.async_entity_ids(Platform.DEVICE_TRACKER) == entities
+    assert hass.data[DOMAIN][entry.entry_id].coordinator.last_update_success
+    assert {hass.states.get(entity_id).state for entity_id in entities} == {
+        STATE_NOT_HOME
+    }
+
+    benchmark(
+        f"setup of {HOSTS} hosts, gateway latency {LATENCY}s",
+        cold_s=cold,
+        warm_s=warm,
+    )
+    assert warm < LATENCY < cold
+
+    await hass.data[DOMAIN][entry.entry_id].coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert STATE_HOME in {hass.states.get(entity_id).state for entity_id in entities}
+
+
+async def test_invalid_snapshot_cold_start(hass, fake_gateway) -> None:
+    """Discard a snapshot that does not match the models and start cold."""
+    gateway = await fake_gateway(hosts=10, active=1.0, churn=0)
+    entry = create_entry(gateway.host)
+    store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot")
+    await store.async_save(
+        {
+            "gateway": {"serial_number": "1234", "removed_field": True},
+            "hosts": [{"device": {"phys_address": "02:00:00:00:00:01"}}],
+        }
+    )
+    assert await HostSnapshot(hass, entry.entry_id).async_load() == (None, [])
+
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    assert coordinator.last_update_success
+    assert len(coordinator.hosts) == 10